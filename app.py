@@ -1,108 +1,111 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import joblib
 from datetime import datetime
 import re 
+import os
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from inferensi import muat_komponen_model, proyeksi_harga, ENGINE_XGBOOST, ENGINE_NUMPY, KM_PER_TAHUN_ASUMSI, TAHUN_PROYEKSI
+from prediksi_cache import PrediksiCache, hash_artifact
+from penyimpanan_data import cari_file_data
+from katalog_mobil import muat_atau_bangun_katalog
+from indeks_pembanding import muat_atau_bangun_indeks
+from depresiasi import hitung_depresiasi
+from tabel_inflasi import INFLASI_XLSX_FILE, muat_tabel_inflasi
+
 # --- 0. SET PAGE CONFIG ---
 st.set_page_config(page_title="Prediksi Harga Mobil", layout="wide", initial_sidebar_state="expanded")
 
 # --- 1. KONFIGURASI DAN DEFINISI GLOBAL ---
-MODEL_PATH = "venv\model\xgboost_mobil_model_v3.pkl"
-DATA_ASLI_PATH = "venv\data\data_mobil_fitur_depresiasi_inflasi.csv"
+MODEL_PATH = os.path.join("model", "xgboost_mobil_model_v3.pkl")
+DATA_ASLI_PATH = cari_file_data(os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")) # Pakai versi .parquet/.feather jika ada
 CURRENT_YEAR = datetime.now().year
 MAX_USIA_MOBIL_APP_FILTER = 40
 
 # --- 2. Fungsi Load Model dan Komponen ---
 @st.cache(allow_output_mutation=True, suppress_st_warning=True)
-def load_model_and_components(model_path):
+def load_model_and_components(model_path, model_hash=None, engine=ENGINE_XGBOOST): # model_hash ikut jadi kunci cache -> reload jika artifact berubah
     try:
-        model, scaler, trained_feature_columns = joblib.load(model_path) # Memuat 3 item
-        if not isinstance(trained_feature_columns, list):
-            trained_feature_columns = trained_feature_columns.tolist()
+        model, scaler, trained_feature_columns, feature_encoder = muat_komponen_model(model_path, engine) # Memuat 3 item + encoder
         print(f"[LOAD_INFO] Model, scaler, dan {len(trained_feature_columns)} kolom training (X.columns) berhasil dimuat.")
-        return model, scaler, trained_feature_columns
+        return model, scaler, trained_feature_columns, feature_encoder
     except FileNotFoundError:
         print(f"ERROR_LOAD: File model '{model_path}' tidak ditemukan.")
-        return None, None, None
+        return None, None, None, None
     except ValueError as ve: 
         print(f"ERROR_LOAD: Gagal unpack model dari '{model_path}'. Error: {ve}.")
-        return None, None, None
+        return None, None, None, None
     except Exception as e:
         print(f"ERROR_LOAD: Terjadi kesalahan umum saat memuat model: {e}")
-        return None, None, None
+        return None, None, None, None
+
+try:
+    MODEL_HASH = hash_artifact(MODEL_PATH)
+except OSError:
+    MODEL_HASH = None
+INFERENCE_ENGINE = st.sidebar.selectbox("Engine Inferensi", options=[ENGINE_XGBOOST, ENGINE_NUMPY],
+                                        help="'numpy' memakai evaluator tree numpy (latensi rendah untuk satu baris).")
+model, scaler, X_COLUMNS_TRAINED, FEATURE_ENCODER = load_model_and_components(MODEL_PATH, MODEL_HASH, INFERENCE_ENGINE)
+
+# --- 2b. Cache Prediksi (LRU + TTL, dikosongkan otomatis jika hash model berubah) ---
+@st.cache_resource
+def get_prediksi_cache():
+    return PrediksiCache()
 
-model, scaler, X_COLUMNS_TRAINED = load_model_and_components(MODEL_PATH)
+PREDIKSI_CACHE = get_prediksi_cache()
+PREDIKSI_CACHE.sinkronkan_model(f"{MODEL_HASH}:{INFERENCE_ENGINE}")
 
-# --- 3. Fungsi untuk Mendapatkan Opsi dari Data Asli ---
-@st.cache_data 
-def load_dropdown_options(data_path):
+# --- 3. Fungsi untuk Mendapatkan Opsi dari Katalog (Merek -> Model_Detail, Lokasi) ---
+@st.cache_resource
+def load_dropdown_options(data_path, mtime=None): # mtime ikut jadi kunci cache -> reload jika dataset berubah
     try:
-        df_ref = pd.read_csv(data_path)
-        known_merek = sorted(df_ref['Merek'].dropna().unique().tolist()) if 'Merek' in df_ref.columns else []
-        known_lokasi = sorted(df_ref['Lokasi'].dropna().unique().tolist()) if 'Lokasi' in df_ref.columns else []
-        print("[LOAD_INFO] Opsi dropdown Merek dan Lokasi dimuat dari data asli.")
-        return df_ref, known_merek, known_lokasi
+        katalog = muat_atau_bangun_katalog(data_path) # JSON kecil dari data_prepro.py; dataset hanya dibaca jika katalog belum ada
+        print("[LOAD_INFO] Opsi dropdown Merek, Model_Detail, dan Lokasi dimuat dari katalog.")
+        return katalog['model_per_merek'], list(katalog['model_per_merek']), katalog['lokasi']
     except FileNotFoundError:
         st.warning(f"File data asli '{data_path}' tidak ditemukan untuk opsi dropdown. Menggunakan daftar fallback.")
-        return pd.DataFrame(), ['Toyota', 'Honda', 'Lainnya'], ['Jakarta', 'Bandung', 'Lainnya'] # Fallback
+        return {}, ['Toyota', 'Honda', 'Lainnya'], ['Jakarta', 'Bandung', 'Lainnya'] # Fallback
     except Exception as e:
         st.warning(f"Error saat memuat opsi dari data asli: {e}. Menggunakan daftar fallback.")
-        return pd.DataFrame(), ['Toyota', 'Honda', 'Lainnya'], ['Jakarta', 'Bandung', 'Lainnya'] # Fallback
+        return {}, ['Toyota', 'Honda', 'Lainnya'], ['Jakarta', 'Bandung', 'Lainnya'] # Fallback
+
+MODEL_PER_MEREK, KNOWN_MEREK_FROM_DATA, KNOWN_LOKASI_FROM_DATA = load_dropdown_options(
+    DATA_ASLI_PATH, os.path.getmtime(DATA_ASLI_PATH) if os.path.exists(DATA_ASLI_PATH) else None)
+
+# --- 3b. Tabel Inflasi (cache .npz) untuk Analisis Depresiasi Riil ---
+@st.cache_resource
+def load_tabel_inflasi(xlsx_path, mtime=None): # mtime ikut jadi kunci cache -> reload jika file inflasi berubah
+    try:
+        return muat_tabel_inflasi(xlsx_path)
+    except Exception as e:
+        print(f"[LOAD_INFO] Tabel inflasi tidak tersedia ({e}). Analisis depresiasi riil dinonaktifkan.")
+        return None
+
+TABEL_INFLASI = load_tabel_inflasi(INFLASI_XLSX_FILE, os.path.getmtime(INFLASI_XLSX_FILE) if os.path.exists(INFLASI_XLSX_FILE) else None)
+
+# --- 3c. Indeks Listing Pembanding (memory-mapped, dibangun data_prepro.py) ---
+@st.cache_resource
+def load_indeks_pembanding(data_path, mtime=None): # mtime ikut jadi kunci cache -> reload jika dataset berubah
+    try:
+        return muat_atau_bangun_indeks(data_path)
+    except Exception as e:
+        print(f"[LOAD_INFO] Indeks pembanding tidak tersedia ({e}). Listing pembanding dinonaktifkan.")
+        return None
 
-data_asli_df, KNOWN_MEREK_FROM_DATA, KNOWN_LOKASI_FROM_DATA = load_dropdown_options(DATA_ASLI_PATH)
+INDEKS_PEMBANDING = load_indeks_pembanding(DATA_ASLI_PATH, os.path.getmtime(DATA_ASLI_PATH) if os.path.exists(DATA_ASLI_PATH) else None)
 
 
 # --- 4. Fungsi Preprocessing Input Pengguna ---
-def preprocess_user_input_dynamic(user_input_dict, all_trained_feature_names, scaler_obj):
+def preprocess_user_input_dynamic(user_input_dict, feature_encoder):
     print("\n--- [DEBUG] Memulai preprocess_user_input (scaler di-fit ke semua X) ---")
-    input_df = pd.DataFrame(0, index=[0], columns=all_trained_feature_names)
-    tahun_pembuatan_input = user_input_dict.get('Tahun_Input', CURRENT_YEAR)
-    usia_mobil_val = CURRENT_YEAR - tahun_pembuatan_input
-    
-    if 'Tahun' in all_trained_feature_names: input_df.loc[0, 'Tahun'] = tahun_pembuatan_input
-    if 'UsiaMobil' in all_trained_feature_names: input_df.loc[0, 'UsiaMobil'] = max(0, usia_mobil_val)
-    if 'Kilometer' in all_trained_feature_names: input_df.loc[0, 'Kilometer'] = user_input_dict.get('Kilometer_Input', 0)
-    # One-Hot Encoding
-    merek_input_val = user_input_dict.get('Merek_Input')
-    if merek_input_val and merek_input_val != "Pilih Merek":
-        merek_col_name = f"Merek_{merek_input_val}" 
-        if merek_col_name in input_df.columns: input_df.loc[0, merek_col_name] = 1
-    
-    lokasi_input_val = user_input_dict.get('Lokasi_Input')
-    if lokasi_input_val and lokasi_input_val != "Pilih Lokasi":
-        lokasi_col_name_cleaned = str(lokasi_input_val)
-        lokasi_col_name = f"Lokasi_{lokasi_col_name_cleaned}"
-        if lokasi_col_name in input_df.columns: input_df.loc[0, lokasi_col_name] = 1
-            
-    model_detail_input_val = user_input_dict.get('Model_Detail_Input')
-    if model_detail_input_val:
-        model_detail_cleaned_for_col = re.sub(r'[^-a-zA-Z0-9_]', '', str(model_detail_input_val).lower().replace(' ', '_')).strip('_')
-        model_detail_col_name = f"Model_Detail_{model_detail_cleaned_for_col}"
-        if model_detail_col_name in input_df.columns: input_df.loc[0, model_detail_col_name] = 1
-    
-    owner_input_val = user_input_dict.get('Owner_Input')
-    if owner_input_val and owner_input_val != "Pilih Jumlah Pemilik":
-        owner_col_name_cleaned = str(owner_input_val).split(' ')[0] 
-        owner_col_name = f"owner_{owner_col_name_cleaned}"
-        if owner_col_name in input_df.columns: input_df.loc[0, owner_col_name] = 1
-    if scaler_obj:
-        try:
-            input_df_ordered = input_df[all_trained_feature_names]
-            scaled_values = scaler_obj.transform(input_df_ordered)
-            input_df_scaled = pd.DataFrame(scaled_values, columns=all_trained_feature_names, index=input_df_ordered.index)
-            return input_df_scaled
-        except ValueError as ve_scaler:
-            raise # Timbulkan kembali error untuk ditangkap di blok pemanggil
-    else:
-        return input_df[all_trained_feature_names]
+    # Encoder memetakan input langsung ke posisi kolom, tanpa membangun DataFrame selebar X_COLUMNS_TRAINED
+    return feature_encoder.encode_row(user_input_dict).reshape(1, -1)
 
 
 # --- 5. UI STREAMLIT ---
-if not model or not scaler or not X_COLUMNS_TRAINED:
+if not model or not scaler or not X_COLUMNS_TRAINED or FEATURE_ENCODER is None:
     st.error("Gagal memuat komponen model (model, scaler, atau daftar kolom training). Aplikasi tidak dapat berjalan. Periksa file .pkl dan path-nya, pastikan berisi 3 item.")
     st.stop()
 
@@ -114,13 +117,15 @@ with col1:
     input_tahun_ui = st.number_input("Tahun Mobil", min_value=1980, max_value=CURRENT_YEAR + 1, step=1, value=2018)
     input_km_driven_ui = st.number_input("Kilometer Tempuh", min_value=0, step=1000, value=50000, format="%d")
     input_harga_beli_dulu_ui = st.number_input("Harga Baru Mobil Dulu (Rp)", min_value=0, step=1000000, value=0, format="%d", help="Opsional, untuk analisis depresiasi.")
+    input_tahun_proyeksi_ui = st.slider("Proyeksi Harga (Tahun ke Depan)", min_value=1, max_value=30, value=TAHUN_PROYEKSI)
+    input_km_per_tahun_ui = st.number_input("Asumsi Kilometer per Tahun", min_value=0, step=1000, value=KM_PER_TAHUN_ASUMSI, format="%d", help="Untuk proyeksi kilometer pada kurva harga.")
 
 with col2:
     input_merek_ui = st.selectbox("Merek Mobil", options=["Pilih Merek"] + KNOWN_MEREK_FROM_DATA)
     
     filtered_models_ui_options = ["Ketik Manual Model Detail"]
-    if input_merek_ui != "Pilih Merek" and not data_asli_df.empty and 'Model_Detail' in data_asli_df.columns:
-        models_for_brand = sorted(data_asli_df[data_asli_df['Merek'] == input_merek_ui]['Model_Detail'].dropna().unique().tolist())
+    if input_merek_ui != "Pilih Merek":
+        models_for_brand = MODEL_PER_MEREK.get(input_merek_ui, []) # Sudah terurut di katalog
         if models_for_brand:
             filtered_models_ui_options = ["Pilih Model"] + models_for_brand
     
@@ -161,49 +166,65 @@ if st.button("🔍 Prediksi Harga", type="primary", use_container_width=True):
                 print("Input ke Preprocess:", user_data_for_preprocessing_dict)
                 print("Kolom yang Diharapkan Model (X_COLUMNS_TRAINED):", X_COLUMNS_TRAINED[:7], f"... (total {len(X_COLUMNS_TRAINED)})")
                 
-                processed_df_for_predict = preprocess_user_input_dynamic(
-                    user_data_for_preprocessing_dict, 
-                    X_COLUMNS_TRAINED, 
-                    scaler
-                )
-                
-                print("DataFrame Setelah Preprocessing (Siap untuk Prediksi - KONSOL SERVER):")
-                print(processed_df_for_predict.loc[0, processed_df_for_predict.loc[0] != 0].to_dict())
-                print("--- AKHIR DEBUGGING PREPROCESSING (KONSOL SERVER) ---")
+                cache_key = PREDIKSI_CACHE.buat_kunci(user_data_for_preprocessing_dict, FEATURE_ENCODER)
+                predicted_price_rp = PREDIKSI_CACHE.get(cache_key)
+                if predicted_price_rp is not None:
+                    print(f"[CACHE] Hit untuk kunci {cache_key}.")
+                else:
+                    processed_row_for_predict = preprocess_user_input_dynamic(
+                        user_data_for_preprocessing_dict, 
+                        FEATURE_ENCODER
+                    )
+                    
+                    print("Fitur Setelah Preprocessing (Siap untuk Prediksi - KONSOL SERVER):")
+                    print({X_COLUMNS_TRAINED[i]: processed_row_for_predict[0, i] for i in np.flatnonzero(processed_row_for_predict[0])})
+                    print("--- AKHIR DEBUGGING PREPROCESSING (KONSOL SERVER) ---")
 
-                prediction_log = model.predict(processed_df_for_predict)
-                predicted_price_rp = np.expm1(prediction_log[0])
+                    prediction_log = model.predict(processed_row_for_predict)
+                    predicted_price_rp = np.expm1(prediction_log[0])
+                    PREDIKSI_CACHE.put(cache_key, predicted_price_rp)
 
             st.subheader("💰 Estimasi Harga Bekas Saat Ini (dari Model AI)")
             st.markdown(f"<h2 style='text-align: center; color: #28a745;'>Rp {predicted_price_rp:,.0f}</h2>", unsafe_allow_html=True)
             st.caption("Estimasi ini berdasarkan analisis data pasar dan model machine learning.")
             st.markdown("---")
 
+            if INDEKS_PEMBANDING is not None:
+                st.subheader("🔎 Listing Pembanding dari Data Pasar")
+                pembanding = INDEKS_PEMBANDING.cari(input_merek_ui, input_model_detail_ui, input_tahun_ui, input_km_driven_ui, input_lokasi_ui)
+                if pembanding:
+                    df_pembanding = pd.DataFrame(pembanding).drop(columns=['Baris'])
+                    st.dataframe(df_pembanding.style.format({'Harga': 'Rp {:,.0f}', 'Kilometer': '{:,.0f}', 'Jarak': '{:.2f}'}), use_container_width=True)
+                    st.caption(f"Median harga {len(pembanding)} listing terdekat (Tahun, Kilometer, Lokasi): Rp {df_pembanding['Harga'].median():,.0f}.")
+                else:
+                    st.caption("Belum ada listing dengan Merek dan Model Detail yang sama di dataset.")
+                st.markdown("---")
+
+            st.subheader("📈 Proyeksi Harga ke Depan")
+            kurva_harga = proyeksi_harga(model, FEATURE_ENCODER, user_data_for_preprocessing_dict, # Semua titik dalam satu model.predict
+                                         np.arange(input_tahun_proyeksi_ui + 1), km_per_tahun=input_km_per_tahun_ui)
+            st.line_chart(kurva_harga.set_index('TahunProyeksi')['Harga_Prediksi'])
+            harga_akhir_rp = kurva_harga['Harga_Prediksi'].iloc[-1]
+            st.caption(f"Perkiraan {input_tahun_proyeksi_ui} tahun lagi ({CURRENT_YEAR + input_tahun_proyeksi_ui}, "
+                       f"{kurva_harga['Kilometer'].iloc[-1]:,.0f} km): Rp {harga_akhir_rp:,.0f} "
+                       f"({(harga_akhir_rp / kurva_harga['Harga_Prediksi'].iloc[0] - 1) * 100:.1f}% dari harga model saat ini). "
+                       "Dalam nilai uang saat ini, berdasarkan harga pasar mobil yang kini seusia.")
+            with st.expander("Tabel proyeksi"):
+                st.dataframe(kurva_harga, use_container_width=True)
+            st.markdown("---")
+
             if input_harga_beli_dulu_ui > 0:
                 st.subheader("📉 Analisis Depresiasi Nominal (Berdasarkan Input Anda)")
                 harga_beli_dulu_rp_val = float(input_harga_beli_dulu_ui)
-                total_dep_rp = 0.0; avg_dep_per_year_rp = 0.0; perc_dep_total = 0.0; avg_perc_dep_per_year = 0.0
-                catatan_depresiasi = ""
+                metrik_dep = {kolom: float(nilai[0]) for kolom, nilai in hitung_depresiasi(
+                    [predicted_price_rp], [harga_beli_dulu_rp_val], [input_tahun_ui], TABEL_INFLASI, CURRENT_YEAR).items()}
+                total_dep_rp = metrik_dep['DepresiasiNominal_Total']; perc_dep_total = metrik_dep['DepresiasiNominal_Persen']
+                avg_dep_per_year_rp = metrik_dep['DepresiasiNominal_PerThn']; avg_perc_dep_per_year = metrik_dep['DepresiasiNominal_PersenPerThn']
                 if usia_mobil_input_val == 0:
-                    total_dep_rp = max(0, harga_beli_dulu_rp_val - predicted_price_rp)
-                    avg_dep_per_year_rp = total_dep_rp 
-                    if harga_beli_dulu_rp_val > 0: perc_dep_total = (total_dep_rp / harga_beli_dulu_rp_val) * 100
-                    avg_perc_dep_per_year = perc_dep_total
                     catatan_depresiasi = "Depresiasi awal tahun pertama." if total_dep_rp > 0 else "Harga prediksi sama/lebih tinggi dari harga beli (mobil baru)."
                 elif predicted_price_rp >= harga_beli_dulu_rp_val:
-                     catatan_depresiasi = f"Harga prediksi (Rp {predicted_price_rp:,.0f}) lebih tinggi atau sama dengan harga beli (Rp {harga_beli_dulu_rp_val:,.0f})."
-                     total_dep_rp = harga_beli_dulu_rp_val - predicted_price_rp
-                     if usia_mobil_input_val > 0: avg_dep_per_year_rp = total_dep_rp / usia_mobil_input_val
-                     if harga_beli_dulu_rp_val > 0:
-                        perc_dep_total = (total_dep_rp / harga_beli_dulu_rp_val) * 100
-                        if usia_mobil_input_val > 0: avg_perc_dep_per_year = perc_dep_total / usia_mobil_input_val
-                else: 
-                    total_dep_rp = harga_beli_dulu_rp_val - predicted_price_rp
-                    if usia_mobil_input_val > 0:
-                        avg_dep_per_year_rp = total_dep_rp / usia_mobil_input_val
-                        if harga_beli_dulu_rp_val > 0:
-                            perc_dep_total = (total_dep_rp / harga_beli_dulu_rp_val) * 100
-                            avg_perc_dep_per_year = perc_dep_total / usia_mobil_input_val
+                    catatan_depresiasi = f"Harga prediksi (Rp {predicted_price_rp:,.0f}) lebih tinggi atau sama dengan harga beli (Rp {harga_beli_dulu_rp_val:,.0f})."
+                else:
                     catatan_depresiasi = f"Perhitungan depresiasi nominal selama {usia_mobil_input_val} tahun."
 
                 col_dep1, col_dep2, col_dep3 = st.columns(3)
@@ -213,6 +234,18 @@ if st.button("🔍 Prediksi Harga", type="primary", use_container_width=True):
                     if usia_mobil_input_val > 0 and total_dep_rp != 0 :
                         st.metric(label="Rata-rata Depresiasi/Tahun", value=f"Rp {avg_dep_per_year_rp:,.0f}", delta=f"{avg_perc_dep_per_year:.1f}%/thn" if harga_beli_dulu_rp_val > 0 else None, delta_color="inverse" if avg_dep_per_year_rp > 0 and predicted_price_rp < harga_beli_dulu_rp_val else ("normal" if avg_dep_per_year_rp < 0 else "off"))
                 st.caption(catatan_depresiasi)
+
+                if TABEL_INFLASI is not None and usia_mobil_input_val > 0:
+                    st.subheader("📉 Analisis Depresiasi Riil (Disesuaikan Inflasi)")
+                    faktor_inflasi = metrik_dep['FaktorInflasi_Kumulatif']
+                    harga_beli_nilai_kini_rp = metrik_dep['HargaBeli_NilaiKini']
+                    total_dep_riil_rp = metrik_dep['DepresiasiRiil_Total']; perc_dep_riil_total = metrik_dep['DepresiasiRiil_Persen']
+                    col_riil1, col_riil2, col_riil3 = st.columns(3)
+                    with col_riil1: st.metric(label=f"Harga Beli dalam Nilai Uang {CURRENT_YEAR}", value=f"Rp {harga_beli_nilai_kini_rp:,.0f}")
+                    with col_riil2: st.metric(label="Total Depresiasi Riil", value=f"Rp {total_dep_riil_rp:,.0f}", delta=f"{perc_dep_riil_total:.1f}%", delta_color="inverse" if total_dep_riil_rp > 0 else "normal")
+                    with col_riil3: st.metric(label="Rata-rata Depresiasi Riil/Tahun", value=f"Rp {metrik_dep['DepresiasiRiil_PerThn']:,.0f}", delta=f"{metrik_dep['DepresiasiRiil_PersenPerThn']:.1f}%/thn", delta_color="inverse" if total_dep_riil_rp > 0 else "normal")
+                    st.caption(f"Inflasi kumulatif {input_tahun_ui}–{CURRENT_YEAR - 1}: {(faktor_inflasi - 1) * 100:.1f}% "
+                               f"(data inflasi {TABEL_INFLASI.tahun_min}–{TABEL_INFLASI.tahun_max}).")
             else:
                 st.info("Masukkan 'Harga Baru Mobil Dulu' di sidebar untuk melihat analisis depresiasi.")
         
@@ -222,3 +255,7 @@ if st.button("🔍 Prediksi Harga", type="primary", use_container_width=True):
         except Exception as e:
             st.error(f"Terjadi kesalahan umum: {e}")
             st.exception(e)
+
+# --- 6. STATISTIK CACHE (sidebar, setelah prediksi agar counter terbaru) ---
+with st.sidebar.expander("Statistik Cache Prediksi"):
+    st.json(PREDIKSI_CACHE.statistik())
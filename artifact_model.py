@@ -0,0 +1,167 @@
+# artifact_model.py
+
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+
+# --- KONFIGURASI FORMAT ARTIFACT ---
+VERSI_FORMAT_ARTIFACT = 1
+NAMA_FILE_BOOSTER = "booster.ubj"
+NAMA_FILE_CENTER = "scaler_center.npy"
+NAMA_FILE_SCALE = "scaler_scale.npy"
+NAMA_FILE_MASK_MISSING = "kolom_missing_jika_nol.npy"
+NAMA_FILE_KOLOM = "kolom_training.json"
+NAMA_FILE_KATEGORI = "kategori.json"
+NAMA_FILE_MANIFEST = "manifest.json"
+
+
+def _sha256_file(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            sha.update(blok)
+    return sha.hexdigest()
+
+
+def _hapus_file_opsional_lama(artifact_dir):
+    """Menghapus file opsional dari artifact sebelumnya agar tidak terbawa ke model baru di direktori yang sama."""
+    from tree_numpy import NAMA_FILE_TABEL_NODE, NAMA_FILE_META_TREE
+    for nama in [NAMA_FILE_MASK_MISSING, NAMA_FILE_KATEGORI, NAMA_FILE_META_TREE] + list(NAMA_FILE_TABEL_NODE.values()):
+        path = os.path.join(artifact_dir, nama)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def simpan_artifact(model, scaler, kolom_training, artifact_dir, kategori=None):
+    """Menyimpan model dalam format fast-start: booster UBJSON, parameter scaler .npy, kolom JSON, dan manifest.
+
+    kategori (opsional): kamus {kolom: [nilai kategori urut kode]} untuk model kategorikal native.
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    _hapus_file_opsional_lama(artifact_dir)
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    booster.save_model(os.path.join(artifact_dir, NAMA_FILE_BOOSTER))
+    np.save(os.path.join(artifact_dir, NAMA_FILE_CENTER), np.ascontiguousarray(scaler.center_, dtype=np.float64))
+    np.save(os.path.join(artifact_dir, NAMA_FILE_SCALE), np.ascontiguousarray(scaler.scale_, dtype=np.float64))
+    files_opsional = []
+    if getattr(scaler, 'kolom_missing_jika_nol', None) is not None:
+        np.save(os.path.join(artifact_dir, NAMA_FILE_MASK_MISSING), np.asarray(scaler.kolom_missing_jika_nol, dtype=bool))
+        files_opsional.append(NAMA_FILE_MASK_MISSING)
+    if kategori is not None:
+        with open(os.path.join(artifact_dir, NAMA_FILE_KATEGORI), 'w', encoding='utf-8') as f:
+            json.dump(kategori, f, ensure_ascii=False)
+        files_opsional.append(NAMA_FILE_KATEGORI)
+    with open(os.path.join(artifact_dir, NAMA_FILE_KOLOM), 'w', encoding='utf-8') as f:
+        json.dump(list(kolom_training), f, ensure_ascii=False)
+
+    # Tabel node untuk evaluator numpy (tree_numpy.py); dilewati jika objektif model tidak didukung
+    files_tree = []
+    try:
+        from tree_numpy import NumpyTreeEnsemble
+        files_tree = NumpyTreeEnsemble.dari_booster(booster).simpan(artifact_dir)
+    except ValueError as e:
+        print(f"[WARNING] Tabel node evaluator numpy tidak diekspor: {e}")
+
+    import xgboost
+    manifest = {
+        'versi_format': VERSI_FORMAT_ARTIFACT,
+        'dibuat': datetime.now().isoformat(timespec='seconds'),
+        'xgboost_version': xgboost.__version__,
+        'jumlah_fitur': len(kolom_training),
+        'files': {
+            nama: _sha256_file(os.path.join(artifact_dir, nama))
+            for nama in [NAMA_FILE_BOOSTER, NAMA_FILE_CENTER, NAMA_FILE_SCALE, NAMA_FILE_KOLOM] + files_opsional + files_tree
+        },
+    }
+    with open(os.path.join(artifact_dir, NAMA_FILE_MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class ParameterScaler:
+    """Pengganti RobustScaler saat serving: hanya center_/scale_ (memory-mapped) dan transform.
+
+    kolom_missing_jika_nol (mask bool, opsional) dipakai model yang dilatih dengan input sparse:
+    nilai 0 di kolom tersebut tidak tersimpan di CSR sehingga XGBoost melihatnya sebagai missing (NaN).
+    """
+
+    def __init__(self, center, scale, kolom_missing_jika_nol=None):
+        self.center_ = center
+        self.scale_ = scale
+        self.kolom_missing_jika_nol = kolom_missing_jika_nol
+
+    def transform(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        hasil = (X - self.center_) / self.scale_
+        if self.kolom_missing_jika_nol is not None:
+            hasil[(X == 0) & self.kolom_missing_jika_nol] = np.nan
+        return hasil
+
+
+class BoosterRegressor:
+    """Pembungkus xgboost.Booster yang dimuat malas (saat predict pertama) dengan API predict(X) seperti XGBRegressor."""
+
+    def __init__(self, booster_path):
+        self.booster_path = booster_path
+        self._booster = None
+
+    @property
+    def booster(self):
+        if self._booster is None:
+            import xgboost
+            self._booster = xgboost.Booster()
+            self._booster.load_model(self.booster_path)
+        return self._booster
+
+    def predict(self, X):
+        return self.booster.inplace_predict(np.asarray(X, dtype=np.float64))
+
+
+def muat_artifact(artifact_dir, verifikasi_hash=True):
+    """Membuka artifact fast-start. Mengembalikan (model, scaler, kolom_training, kategori, manifest)."""
+    with open(os.path.join(artifact_dir, NAMA_FILE_MANIFEST), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('versi_format') != VERSI_FORMAT_ARTIFACT:
+        raise ValueError(f"Versi format artifact {manifest.get('versi_format')} tidak didukung (harus {VERSI_FORMAT_ARTIFACT}).")
+    if verifikasi_hash:
+        for nama, sha_manifest in manifest['files'].items():
+            if _sha256_file(os.path.join(artifact_dir, nama)) != sha_manifest:
+                raise ValueError(f"Hash file '{nama}' di '{artifact_dir}' tidak cocok dengan manifest.")
+
+    with open(os.path.join(artifact_dir, NAMA_FILE_KOLOM), encoding='utf-8') as f:
+        kolom_training = json.load(f)
+    path_mask = os.path.join(artifact_dir, NAMA_FILE_MASK_MISSING)
+    scaler = ParameterScaler(
+        np.load(os.path.join(artifact_dir, NAMA_FILE_CENTER), mmap_mode='r'),
+        np.load(os.path.join(artifact_dir, NAMA_FILE_SCALE), mmap_mode='r'),
+        np.load(path_mask) if os.path.exists(path_mask) else None,
+    )
+    kategori = None
+    if os.path.exists(os.path.join(artifact_dir, NAMA_FILE_KATEGORI)):
+        with open(os.path.join(artifact_dir, NAMA_FILE_KATEGORI), encoding='utf-8') as f:
+            kategori = json.load(f)
+    model = BoosterRegressor(os.path.join(artifact_dir, NAMA_FILE_BOOSTER))
+    return model, scaler, kolom_training, kategori, manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Konversi model .pkl (joblib tuple) menjadi artifact fast-start.")
+    parser.add_argument('pkl_path', help="Path model joblib, mis. model/xgboost_mobil_model_v3.pkl")
+    parser.add_argument('artifact_dir', help="Direktori output artifact, mis. model/xgboost_mobil_model_v3")
+    args = parser.parse_args()
+
+    import joblib
+    komponen = joblib.load(args.pkl_path)
+    model, scaler, kolom_training = komponen[:3]
+    if not isinstance(kolom_training, list):
+        kolom_training = kolom_training.tolist()
+    manifest = simpan_artifact(model, scaler, kolom_training, args.artifact_dir, komponen[3] if len(komponen) > 3 else None)
+    print(f"[INFO] Artifact fast-start ({manifest['jumlah_fitur']} fitur) disimpan ke '{args.artifact_dir}'.")
+
+
+if __name__ == '__main__':
+    main()
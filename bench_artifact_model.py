@@ -0,0 +1,61 @@
+# bench_artifact_model.py
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# --- KONFIGURASI BENCHMARK ---
+PKL_PATH = os.path.join("model", "xgboost_mobil_model_v3.pkl")
+ARTIFACT_DIR = os.path.join("model", "xgboost_mobil_model_v3")
+JUMLAH_ULANGAN = 5
+
+# Dijalankan di proses baru agar import dan unpickle diukur dari kondisi cold start
+SKRIP_ANAK = r'''
+import json, resource, sys, time
+t0 = time.perf_counter()
+from inferensi import muat_komponen_model
+model, scaler, kolom, encoder = muat_komponen_model(sys.argv[1], sys.argv[2])
+t_load = time.perf_counter() - t0
+row = encoder.encode_row({'Tahun_Input': 2018, 'Kilometer_Input': 50000, 'Merek_Input': 'Toyota',
+                          'Model_Detail_Input': 'Avanza G', 'Lokasi_Input': 'DKI Jakarta'}).reshape(1, -1)
+harga = float(model.predict(row)[0])
+t_total = time.perf_counter() - t0
+print(json.dumps({'load_s': t_load, 'load_dan_prediksi_pertama_s': t_total, 'prediksi_log': harga,
+                  'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0}))
+'''
+
+
+def ukur(model_path, engine, ulangan):
+    hasil = []
+    for _ in range(ulangan):
+        out = subprocess.run([sys.executable, '-c', SKRIP_ANAK, model_path, engine], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        hasil.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return hasil
+
+
+def median(nilai):
+    nilai = sorted(nilai)
+    return nilai[len(nilai) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan cold start & RSS: joblib .pkl vs artifact fast-start (engine xgboost/numpy).")
+    parser.add_argument('--pkl', default=PKL_PATH)
+    parser.add_argument('--artifact', default=ARTIFACT_DIR)
+    parser.add_argument('--ulangan', type=int, default=JUMLAH_ULANGAN)
+    args = parser.parse_args()
+
+    print(f"{'Format':<18}{'Load (s)':>12}{'Load+Pred (s)':>16}{'Max RSS (MB)':>15}{'Pred log':>14}")
+    for nama, path, engine in (('pickle', args.pkl, 'xgboost'), ('artifact', args.artifact, 'xgboost'),
+                               ('artifact+numpy', args.artifact, 'numpy')):
+        hasil = ukur(path, engine, args.ulangan)
+        print(f"{nama:<18}{median([h['load_s'] for h in hasil]):>12.3f}"
+              f"{median([h['load_dan_prediksi_pertama_s'] for h in hasil]):>16.3f}"
+              f"{median([h['max_rss_mb'] for h in hasil]):>15.1f}{hasil[0]['prediksi_log']:>14.6f}")
+
+
+if __name__ == '__main__':
+    main()
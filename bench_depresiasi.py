@@ -0,0 +1,142 @@
+# bench_depresiasi.py
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from depresiasi import (CURRENT_YEAR, KOLOM_DEPRESIASI, KOLOM_DEPRESIASI_NOMINAL, KOLOM_DEPRESIASI_RIIL,
+                        MAX_RASIO_ESTAWAL_VS_HARGADEFLASI, RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI,
+                        fitur_depresiasi_riil, hitung_depresiasi)
+from tabel_inflasi import INFLASI_XLSX_FILE, muat_tabel_inflasi
+
+# --- KONFIGURASI BENCHMARK ---
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+JUMLAH_BARIS = 200_000
+RTOL = 1e-9
+
+
+# --- 1. REFERENSI SKALAR (LOGIKA LAMA, PER BARIS) ---
+def nominal_skalar(harga_beli, harga_prediksi, usia):
+    """Cabang depresiasi nominal app.py sebelum memakai depresiasi.py."""
+    total = rata2 = persen = rata2_persen = 0.0
+    if usia == 0:
+        total = max(0, harga_beli - harga_prediksi)
+        rata2 = total
+        persen = total / harga_beli * 100
+        rata2_persen = persen
+    else:
+        total = harga_beli - harga_prediksi
+        rata2 = total / usia
+        persen = total / harga_beli * 100
+        rata2_persen = persen / usia
+    return total, persen, rata2, rata2_persen
+
+
+def riil_skalar(harga_beli, harga_prediksi, tahun, usia, tabel_inflasi):
+    """Blok depresiasi riil app.py (hanya usia > 0)."""
+    faktor = float(tabel_inflasi.faktor_kumulatif(tahun, CURRENT_YEAR))
+    harga_beli_kini = harga_beli * faktor
+    total = harga_beli_kini - harga_prediksi
+    persen = total / harga_beli_kini * 100
+    return faktor, harga_beli_kini, total, persen, total / usia, persen / usia
+
+
+def fitur_skalar(harga, usia, inflasi):
+    """Fitur depresiasi riil satu baris seperti skrip data_prepro.py awal (usia 0 dibagi Inflasi, NaN -> 0)."""
+    if usia > 0:
+        deflasi = harga / (1 + inflasi)
+        faktor = max((1 - RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI) ** usia, 1e-9)
+        awal = max(min(deflasi / faktor, deflasi * MAX_RASIO_ESTAWAL_VS_HARGADEFLASI), deflasi)
+        awal_kini = awal * (1 + inflasi)
+        dep_riil = max(0, (awal - deflasi) / usia)
+        persen = min(max(dep_riil / awal * 100, 0), 100) if awal > 1e-9 else 0.0
+        hasil = (deflasi, awal, awal_kini, dep_riil, persen, max(0, (awal_kini - harga) / usia))
+    elif usia == 0:
+        deflasi = harga / inflasi if inflasi != 0 else math.copysign(math.inf, harga)
+        hasil = (deflasi, deflasi, deflasi * inflasi, 0.0, 0.0, 0.0)
+    else:
+        return (0.0,) * len(KOLOM_DEPRESIASI)
+    return tuple(0.0 if math.isnan(nilai) else nilai for nilai in hasil)
+
+
+# --- 2. PARITY ---
+def cocok(nama, acuan, hasil):
+    acuan, hasil = np.asarray(acuan, dtype=np.float64), np.asarray(hasil, dtype=np.float64)
+    sama = np.isclose(acuan, hasil, rtol=RTOL, atol=0, equal_nan=True)
+    print(f"[{'INFO' if sama.all() else 'ERROR'}] {nama}: {int((~sama).sum())} beda dari {len(sama)}")
+    return bool(sama.all())
+
+
+def data_sintetis(jumlah_baris, seed=42):
+    rng = np.random.default_rng(seed)
+    tahun = rng.integers(CURRENT_YEAR - 30, CURRENT_YEAR + 1, jumlah_baris)
+    harga_prediksi = rng.uniform(5e7, 5e8, jumlah_baris)
+    harga_beli = rng.uniform(5e7, 6e8, jumlah_baris)
+    inflasi = rng.uniform(0.01, 0.12, jumlah_baris)
+    inflasi[rng.random(jumlah_baris) < 0.01] = np.nan   # Tahun tanpa data inflasi
+    return tahun, harga_prediksi, harga_beli, inflasi
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parity & waktu depresiasi.py (vektor) vs logika skalar lama app.py/data_prepro.py.")
+    parser.add_argument('--data-path', default=DATA_PATH, help="Dataset hasil data_prepro.py (kolom fitur depresiasi sebagai acuan).")
+    parser.add_argument('--inflasi', default=INFLASI_XLSX_FILE)
+    parser.add_argument('--baris', type=int, default=JUMLAH_BARIS)
+    args = parser.parse_args()
+
+    tabel_inflasi = muat_tabel_inflasi(args.inflasi)
+    tahun, harga_prediksi, harga_beli, inflasi = data_sintetis(args.baris)
+    usia = CURRENT_YEAR - tahun
+    semua_cocok = True
+
+    # Metrik dari harga beli (app.py / skor_batch.py)
+    waktu_mulai = time.perf_counter()
+    skalar_nominal = [nominal_skalar(b, p, u) for b, p, u in zip(harga_beli.tolist(), harga_prediksi.tolist(), usia.tolist())]
+    skalar_riil = [riil_skalar(b, p, t, u, tabel_inflasi) if u > 0 else (np.nan,) * len(KOLOM_DEPRESIASI_RIIL)
+                   for b, p, t, u in zip(harga_beli.tolist(), harga_prediksi.tolist(), tahun.tolist(), usia.tolist())]
+    waktu_skalar = time.perf_counter() - waktu_mulai
+    waktu_mulai = time.perf_counter()
+    vektor = hitung_depresiasi(harga_prediksi, harga_beli, tahun, tabel_inflasi)
+    waktu_vektor = time.perf_counter() - waktu_mulai
+    for i, kolom in enumerate(KOLOM_DEPRESIASI_NOMINAL):
+        semua_cocok &= cocok(kolom, [baris[i] for baris in skalar_nominal], vektor[kolom])
+    for i, kolom in enumerate(KOLOM_DEPRESIASI_RIIL):
+        semua_cocok &= cocok(kolom, [baris[i] for baris in skalar_riil], vektor[kolom])
+    print(f"[INFO] hitung_depresiasi {args.baris} baris: skalar {waktu_skalar:.3f} s, vektor {waktu_vektor:.4f} s "
+          f"({waktu_skalar / waktu_vektor:.0f}x)")
+
+    # Fitur dataset (data_prepro.py)
+    harga = harga_prediksi
+    usia_fitur = usia.astype(np.float64)
+    waktu_mulai = time.perf_counter()
+    skalar_fitur = [fitur_skalar(h, u, f) for h, u, f in zip(harga.tolist(), usia_fitur.tolist(), inflasi.tolist())]
+    waktu_skalar = time.perf_counter() - waktu_mulai
+    waktu_mulai = time.perf_counter()
+    vektor = fitur_depresiasi_riil(harga, usia_fitur, inflasi)
+    waktu_vektor = time.perf_counter() - waktu_mulai
+    for i, kolom in enumerate(KOLOM_DEPRESIASI):
+        semua_cocok &= cocok(kolom, [baris[i] for baris in skalar_fitur], vektor[kolom])
+    print(f"[INFO] fitur_depresiasi_riil {args.baris} baris: skalar {waktu_skalar:.3f} s, vektor {waktu_vektor:.4f} s "
+          f"({waktu_skalar / waktu_vektor:.0f}x)")
+
+    # Kolom fitur yang tersimpan di dataset (dibuat skrip lama) harus terbentuk ulang dari Harga/UsiaMobil/Inflasi
+    if os.path.exists(args.data_path):
+        df = pd.read_csv(args.data_path, usecols=['Harga', 'UsiaMobil', 'Inflasi'] + KOLOM_DEPRESIASI)
+        vektor = fitur_depresiasi_riil(df['Harga'], df['UsiaMobil'], df['Inflasi'])
+        for kolom in KOLOM_DEPRESIASI:
+            semua_cocok &= cocok(f"{args.data_path}: {kolom}", df[kolom], vektor[kolom])
+    else:
+        print(f"[WARNING] Dataset '{args.data_path}' tidak ada; parity terhadap dataset dilewati.")
+
+    if not semua_cocok:
+        sys.exit(1)
+    print("[INFO] Semua metrik depresiasi vektor cocok dengan logika skalar.")
+
+
+if __name__ == '__main__':
+    main()
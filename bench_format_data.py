@@ -0,0 +1,67 @@
+# bench_format_data.py
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from penyimpanan_data import KOLOM_DROPDOWN, baca_tabel, ganti_format, tulis_tabel
+
+# --- KONFIGURASI BENCHMARK ---
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+JUMLAH_BARIS = 1_000_000
+
+
+def buat_data_besar(data_path, jumlah_baris, seed=42):
+    """Sampel ulang data asli sampai jumlah_baris dengan jitter kolom float (nilai unik seperti data nyata)."""
+    df = pd.read_csv(data_path)
+    rng = np.random.default_rng(seed)
+    df = df.iloc[rng.integers(0, len(df), jumlah_baris)].reset_index(drop=True)
+    for kolom in df.select_dtypes('float').columns:
+        df[kolom] = df[kolom] * rng.uniform(0.9, 1.1, len(df))
+    return df
+
+
+def ukur(fungsi, ulang):
+    waktu_terbaik, hasil = float('inf'), None
+    for _ in range(ulang):
+        waktu_mulai = time.perf_counter()
+        hasil = fungsi()
+        waktu_terbaik = min(waktu_terbaik, time.perf_counter() - waktu_mulai)
+    return waktu_terbaik, hasil
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan CSV vs Parquet vs Feather: ukuran file, waktu tulis/baca, baca kolom terpilih.")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--baris', type=int, default=JUMLAH_BARIS)
+    parser.add_argument('--ulang', type=int, default=3, help="Jumlah pengulangan baca; diambil waktu terbaik.")
+    args = parser.parse_args()
+
+    df = buat_data_besar(args.data_path, args.baris)
+    print(f"[INFO] Data sintetis: {len(df)} baris x {len(df.columns)} kolom")
+
+    hasil = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for format_data in ('csv', 'parquet', 'feather'):
+            path = ganti_format(os.path.join(tmp, "data.csv"), format_data)
+            waktu_tulis, _ = ukur(lambda: tulis_tabel(df, path), 1)
+            waktu_baca, df_baca = ukur(lambda: baca_tabel(path), args.ulang)
+            waktu_dropdown, df_dropdown = ukur(lambda: baca_tabel(path, kolom=KOLOM_DROPDOWN), args.ulang)
+            hasil[format_data] = (os.path.getsize(path) / 1e6, waktu_tulis, waktu_baca, waktu_dropdown,
+                                  df_baca.memory_usage(deep=True).sum() / 1e6, df_dropdown.memory_usage(deep=True).sum() / 1e6)
+            # Bit-identik dengan data asli? (category hanya beda dtype; parser float CSV bisa meleset 1 ulp)
+            sama = df_baca.astype({k: object for k in KOLOM_DROPDOWN}).equals(df.astype({k: object for k in KOLOM_DROPDOWN}))
+            print(f"[INFO] {format_data}: round-trip bit-identik {sama}")
+
+    print(f"\n{'Format':<10}{'Ukuran (MB)':>13}{'Tulis (s)':>11}{'Baca (s)':>10}{'Baca 3 kolom (s)':>18}"
+          f"{'Memori (MB)':>13}{'Memori 3 kolom (MB)':>21}")
+    for format_data, (ukuran, tulis, baca, dropdown, memori, memori_dropdown) in hasil.items():
+        print(f"{format_data:<10}{ukuran:>13.1f}{tulis:>11.2f}{baca:>10.2f}{dropdown:>18.3f}{memori:>13.1f}{memori_dropdown:>21.1f}")
+
+
+if __name__ == '__main__':
+    main()
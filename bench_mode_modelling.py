@@ -0,0 +1,91 @@
+# bench_mode_modelling.py
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- KONFIGURASI BENCHMARK ---
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+FAKTOR_REPLIKASI = 20          # Data asli direplikasi sebanyak ini untuk meniru korpus yang tumbuh
+
+
+def buat_data_sintetis(data_path, faktor, output_path, seed=42):
+    """Mereplikasi data asli; setiap replikasi menambah varian Model_Detail baru dan jitter Harga/Kilometer."""
+    df = pd.read_csv(data_path)
+    rng = np.random.default_rng(seed)
+    bagian = []
+    for i in range(faktor):
+        salinan = df.copy()
+        if i > 0:
+            salinan['Model_Detail'] = salinan['Model_Detail'].astype(str) + f" v{i}"
+        salinan['Harga'] = salinan['Harga'] * rng.uniform(0.9, 1.1, len(salinan))
+        salinan['Kilometer'] = (salinan['Kilometer'] * rng.uniform(0.8, 1.2, len(salinan))).round()
+        bagian.append(salinan)
+    pd.concat(bagian, ignore_index=True).to_csv(output_path, index=False)
+
+
+MODE_TRAINING = {'dense': [], 'sparse': ['--sparse'], 'categorical': ['--categorical']}
+
+
+def jalankan_modelling(data_path, output_dir, mode):
+    perintah = [sys.executable, 'modelling.py', '--data-path', data_path, '--output-dir', output_dir] + MODE_TRAINING[mode]
+    env = dict(os.environ, MPLBACKEND='Agg')
+    out = subprocess.run(perintah, capture_output=True, text=True, check=True, env=env,
+                         cwd=os.path.dirname(os.path.abspath(__file__))).stdout
+    waktu = float(re.search(r"Waktu training: ([\d.]+)", out).group(1))
+    rss = re.search(r"Peak RSS: ([\d.]+)", out)
+    mape = float(re.search(r"MAPE: ([\d.]+)", out).group(1))
+    return waktu, float(rss.group(1)) if rss else float('nan'), mape
+
+
+def ukur_inferensi(output_dir, data_path, jumlah_baris=1000, ulangan=200):
+    """Ukuran booster (MB) dan latensi per baris (us): satu baris via encode_row dan batch via encode_batch."""
+    from inferensi import muat_komponen_model
+    artifact_dir = os.path.join(output_dir, 'xgboost_mobil_model_v3')
+    ukuran_mb = os.path.getsize(os.path.join(artifact_dir, 'booster.ubj')) / (1024 * 1024)
+    model, _, _, encoder = muat_komponen_model(artifact_dir)
+    df = pd.read_csv(data_path, usecols=['Merek', 'Model_Detail', 'Tahun', 'Kilometer', 'Lokasi'], nrows=jumlah_baris)
+    r = df.iloc[0]
+    baris = encoder.encode_row({'Tahun_Input': r['Tahun'], 'Kilometer_Input': r['Kilometer'], 'Merek_Input': r['Merek'],
+                                'Model_Detail_Input': r['Model_Detail'], 'Lokasi_Input': r['Lokasi']}).reshape(1, -1)
+    model.predict(baris)  # pemanasan
+    t0 = time.perf_counter()
+    for _ in range(ulangan):
+        model.predict(baris)
+    us_satu = (time.perf_counter() - t0) / ulangan * 1e6
+    X = encoder.scale_matrix(encoder.encode_batch(df))
+    t0 = time.perf_counter()
+    model.predict(X)
+    us_batch = (time.perf_counter() - t0) / len(X) * 1e6
+    return ukuran_mb, us_satu, us_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan mode training modelling.py: dense (one-hot), --sparse, dan --categorical.")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--replikasi', type=int, default=FAKTOR_REPLIKASI)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_sintetis = os.path.join(tmp, 'data_sintetis.csv')
+        buat_data_sintetis(args.data_path, args.replikasi, data_sintetis)
+        df = pd.read_csv(data_sintetis, usecols=['Merek', 'Model_Detail', 'Lokasi'])
+        print(f"[INFO] Data sintetis: {len(df)} baris, {df['Model_Detail'].nunique()} varian Model_Detail.")
+
+        print(f"\n{'Mode':<13}{'Training (s)':>14}{'Peak RSS (MB)':>16}{'MAPE (%)':>10}"
+              f"{'Model (MB)':>12}{'1 baris (us)':>14}{'Batch (us/baris)':>18}")
+        for mode in MODE_TRAINING:
+            waktu, rss, mape = jalankan_modelling(data_sintetis, tmp, mode)
+            ukuran_mb, us_satu, us_batch = ukur_inferensi(tmp, data_sintetis)
+            print(f"{mode:<13}{waktu:>14.2f}{rss:>16.1f}{mape:>10.2f}{ukuran_mb:>12.2f}{us_satu:>14.1f}{us_batch:>18.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# bench_parser.py
+
+import argparse
+import glob
+import logging
+import os
+import tempfile
+import time
+
+import mobil_scraper
+from page_store import PenyimpanHalaman
+from stub_server_scraper import DATA_PATH, generate_halaman
+
+# Kerangka halaman: halaman asli Mobil123 jauh lebih besar dari kartu listing saja (head, script, navigasi, footer)
+KEPALA_HALAMAN = ("<html><head><title>Mobil Bekas Dijual</title>"
+                  + "".join(f'<link rel="stylesheet" href="/css/{i}.css"><script src="/js/{i}.js"></script>' for i in range(20))
+                  + "<script>window.__STATE__ = {" + ",".join(f'"k{i}": "{"x" * 40}"' for i in range(300)) + "};</script>"
+                  + "</head><body><nav>" + "".join(f'<a href="/kategori/{i}">Kategori {i}</a>' for i in range(150)) + "</nav>")
+KAKI_HALAMAN = "<footer>" + "".join(f'<div class="footer__link"><a href="/info/{i}">Info {i}</a></div>' for i in range(200)) + "</footer>"
+
+
+def muat_korpus(halaman_dir, jumlah_halaman, data_path):
+    """Daftar (url, html). Jika halaman_dir kosong, halaman sintetis dibuat dari dataset + kerangka halaman."""
+    if halaman_dir:
+        paths = sorted(glob.glob(os.path.join(halaman_dir, "*.html")))[:jumlah_halaman]
+        korpus = []
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                korpus.append((path, f.read()))
+        return korpus
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_halaman(data_path, tmp, jumlah_halaman)
+        korpus = []
+        for nomor in range(1, jumlah_halaman + 1):
+            with open(os.path.join(tmp, f"halaman_{nomor}.html"), encoding='utf-8') as f:
+                isi = f.read().replace("<html><body>", KEPALA_HALAMAN).replace("</body></html>", KAKI_HALAMAN + "</body></html>")
+            korpus.append((f"halaman_{nomor}", isi))
+    return korpus
+
+
+def ukur_skala_worker(korpus, daftar_worker, backend):
+    """Throughput tahap parse mode pipeline (process pool membaca arsip gzip) per jumlah worker."""
+    with tempfile.TemporaryDirectory() as tmp:
+        arsip = PenyimpanHalaman(tmp)
+        paths = [arsip.simpan(nomor, url, isi) for nomor, (url, isi) in enumerate(korpus, 1)]
+        urls = [url for url, _ in korpus]
+        print(f"\n[INFO] Tahap parse pipeline ({backend}), {os.cpu_count()} core")
+        print(f"{'Worker':<16}{'Waktu (s)':>12}{'Halaman/detik':>16}{'Speedup':>10}")
+        waktu_satu = None
+        for n in daftar_worker:
+            with mobil_scraper.buat_pool_parse(n) as pool:
+                waktu_mulai = time.perf_counter()
+                list(pool.map(mobil_scraper._parse_file_halaman, paths, urls, [backend] * len(paths),
+                              chunksize=max(1, len(paths) // (4 * n))))
+                waktu = time.perf_counter() - waktu_mulai
+            waktu_satu = waktu_satu or waktu
+            print(f"{n:<16}{waktu:>12.2f}{len(paths) / waktu:>16.1f}{waktu_satu / waktu:>9.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan throughput backend parser HTML mobil_scraper (halaman/detik).")
+    parser.add_argument('--halaman-dir', default=None, help="Folder halaman HTML tersimpan; default halaman sintetis.")
+    parser.add_argument('--halaman', type=int, default=200)
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--ulang', type=int, default=3, help="Jumlah pengulangan; diambil waktu terbaik.")
+    parser.add_argument('--workers', default=None, help="Mis. 1,2,4: ukur juga skala tahap parse process pool.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    korpus = muat_korpus(args.halaman_dir, args.halaman, args.data_path)
+    ukuran_kb = sum(len(isi) for _, isi in korpus) / len(korpus) / 1024
+    acuan = [mobil_scraper.parse_halaman(isi, url, 'html.parser') for url, isi in korpus]
+    tersedia = mobil_scraper.backend_tersedia()
+
+    print(f"\n[INFO] {len(korpus)} halaman, rata-rata {ukuran_kb:.1f} KB, {sum(map(len, acuan))} listing")
+    print(f"{'Backend':<16}{'Waktu (s)':>12}{'Halaman/detik':>16}{'Speedup':>10}{'Identik':>10}")
+    waktu_acuan = None
+    for nama in mobil_scraper.BACKEND_PARSER:
+        if nama not in tersedia:
+            print(f"{nama:<16}{'(tidak terpasang)':>40}")
+            continue
+        waktu_terbaik, hasil = float('inf'), None
+        for _ in range(args.ulang):
+            waktu_mulai = time.perf_counter()
+            hasil = [mobil_scraper.parse_halaman(isi, url, nama) for url, isi in korpus]
+            waktu_terbaik = min(waktu_terbaik, time.perf_counter() - waktu_mulai)
+        waktu_acuan = waktu_acuan or waktu_terbaik
+        print(f"{nama:<16}{waktu_terbaik:>12.2f}{len(korpus) / waktu_terbaik:>16.1f}"
+              f"{waktu_acuan / waktu_terbaik:>9.1f}x{str(hasil == acuan):>10}")
+
+    if args.workers:
+        ukur_skala_worker(korpus, [int(n) for n in args.workers.split(',')], mobil_scraper.PARSER_BACKEND)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# bench_pembanding.py
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from indeks_pembanding import (KOLOM_INDEKS, PENALTI_LOKASI_LAIN, PENALTI_WILAYAH_SAMA, SKALA_KM_PER_TAHUN,
+                               IndeksPembanding, kumpulkan_indeks, simpan_indeks, wilayah_lokasi)
+from inferensi import bersihkan_model_detail
+
+# --- KONFIGURASI BENCHMARK ---
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+JUMLAH_BARIS = 2_000_000
+JUMLAH_QUERY = 500
+K = 5
+
+
+def buat_korpus(data_path, jumlah_baris, seed=42):
+    """Sampel ulang data asli dengan Tahun/Kilometer/Harga di-jitter (partisi besar seperti korpus produksi)."""
+    df = pd.read_csv(data_path, usecols=KOLOM_INDEKS)
+    rng = np.random.default_rng(seed)
+    df = df.iloc[rng.integers(0, len(df), jumlah_baris)].reset_index(drop=True)
+    df['Tahun'] = df['Tahun'] + rng.integers(-3, 4, len(df))
+    df['Kilometer'] = (df['Kilometer'] * rng.uniform(0.5, 1.5, len(df))).round(-2)
+    df['Harga'] = (df['Harga'] * rng.uniform(0.9, 1.1, len(df))).round(-3)
+    return df
+
+
+def cari_pandas(df, merek, model_detail, tahun, kilometer, lokasi, k=K):
+    """Cara lama: filter DataFrame per request lalu nsmallest jarak (Model_Detail persis, atau Model_Bersih sebagai alias)."""
+    kandidat = df[(df['Merek'] == merek) & (df['Model_Detail'] == model_detail)]
+    if kandidat.empty:
+        kandidat = df[(df['Merek'] == merek) & (df['Model_Bersih'] == bersihkan_model_detail(model_detail))]
+    penalti = np.where(kandidat['Lokasi'] == lokasi, 0.0,
+                       np.where(kandidat['Wilayah'] == wilayah_lokasi(lokasi), PENALTI_WILAYAH_SAMA, PENALTI_LOKASI_LAIN))
+    jarak = (kandidat['Tahun'] - tahun).abs() + (kandidat['Kilometer'] - kilometer).abs() / SKALA_KM_PER_TAHUN + penalti
+    return np.sort(jarak.nsmallest(k).to_numpy())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indeks pembanding (memory-mapped) vs filter pandas per request.")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--baris', type=int, default=JUMLAH_BARIS)
+    parser.add_argument('--query', type=int, default=JUMLAH_QUERY)
+    args = parser.parse_args()
+
+    df = buat_korpus(args.data_path, args.baris)
+    with tempfile.TemporaryDirectory() as tmp:
+        waktu_mulai = time.perf_counter()
+        manifest = simpan_indeks(kumpulkan_indeks(df), tmp)
+        waktu_bangun = time.perf_counter() - waktu_mulai
+        waktu_mulai = time.perf_counter()
+        indeks = IndeksPembanding.muat(tmp)
+        waktu_muat = (time.perf_counter() - waktu_mulai) * 1000
+        ukuran_partisi = [akhir - awal for per_merek in manifest['partisi'].values() for awal, akhir in per_merek.values()]
+        print(f"[INFO] {len(df)} baris, {len(ukuran_partisi)} partisi (maks {max(ukuran_partisi)} baris). "
+              f"Bangun {waktu_bangun:.2f} s, muat {waktu_muat:.2f} ms.")
+
+        df['Model_Bersih'] = df['Model_Detail'].astype(str).map(bersihkan_model_detail)
+        df['Wilayah'] = df['Lokasi'].map(wilayah_lokasi)
+        rng = np.random.default_rng(7)
+        contoh = df.iloc[rng.integers(0, len(df), args.query)]
+        latensi_indeks, latensi_pandas, beda = [], [], 0
+        for r in contoh.itertuples():
+            tahun, kilometer = r.Tahun + int(rng.integers(-2, 3)), r.Kilometer * rng.uniform(0.8, 1.2)
+            t0 = time.perf_counter()
+            hasil = indeks.cari(r.Merek, r.Model_Detail, tahun, kilometer, r.Lokasi, K)
+            latensi_indeks.append((time.perf_counter() - t0) * 1000)
+            t0 = time.perf_counter()
+            acuan = cari_pandas(df, r.Merek, r.Model_Detail, tahun, kilometer, r.Lokasi, K)
+            latensi_pandas.append((time.perf_counter() - t0) * 1000)
+            beda += not np.allclose([h['Jarak'] for h in hasil], acuan, rtol=1e-12)
+            beda += any(h['Model_Detail'] != r.Model_Detail for h in hasil)
+            # Teks bebas (huruf kecil) lewat alias ternormalisasi: gabungan semua varian asli yang cocok
+            hasil = indeks.cari(r.Merek, r.Model_Detail.lower(), tahun, kilometer, r.Lokasi, K)
+            acuan = cari_pandas(df, r.Merek, r.Model_Detail.lower(), tahun, kilometer, r.Lokasi, K)
+            beda += not np.allclose([h['Jarak'] for h in hasil], acuan, rtol=1e-12)
+        # Nomor baris mengarah ke baris dataset yang sama
+        h = indeks.cari(contoh.iloc[0]['Merek'], contoh.iloc[0]['Model_Detail'], 2018, 50000, 'DKI Jakarta', 1)[0]
+        beda += df.loc[h['Baris'], ['Tahun', 'Kilometer', 'Harga']].tolist() != [h['Tahun'], h['Kilometer'], h['Harga']]
+
+    print(f"\n{'Cara':<10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for nama, latensi in (('indeks', latensi_indeks), ('pandas', latensi_pandas)):
+        print(f"{nama:<10}{np.percentile(latensi, 50):>10.3f}{np.percentile(latensi, 99):>10.3f}")
+    print(f"[{'INFO' if beda == 0 else 'ERROR'}] {beda} dari {args.query} query berbeda dengan filter pandas.")
+    if beda:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# bench_prepro.py
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# --- KONFIGURASI BENCHMARK ---
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+INFLASI_PATH = os.path.join("data", "inflasi indonesia.xlsx")
+JUMLAH_BARIS = 2_000_000
+KOLOM_SCRAPE = ['Judul', 'Merek', 'Model_Detail', 'Harga', 'Tahun', 'Kilometer', 'Lokasi']
+
+
+def buat_scrape_sintetis(data_path, jumlah_baris, output_path, seed=42):
+    """CSV mirip hasil mobil_scraper.py: sampel ulang data asli, Harga/Kilometer di-jitter, +2% baris duplikat."""
+    df = pd.read_csv(data_path, usecols=KOLOM_SCRAPE)
+    rng = np.random.default_rng(seed)
+    df = df.iloc[rng.integers(0, len(df), jumlah_baris)].reset_index(drop=True)
+    df['Harga'] = (df['Harga'] * rng.uniform(0.9, 1.1, len(df))).round(-3)
+    df['Kilometer'] = (df['Kilometer'] * rng.uniform(0.8, 1.2, len(df))).round().astype(np.int64)
+    # Listing yang terambil ulang di halaman lain (duplikat lintas chunk)
+    df = pd.concat([df, df.sample(frac=0.02, random_state=seed)], ignore_index=True)
+    df.to_csv(output_path, index=False)
+
+
+def tulis_awalan(input_csv, output_path, fraksi):
+    """Salin header + fraksi pertama baris input_csv (keadaan crawl sebelum listing baru di-append)."""
+    with open(input_csv, 'rb') as f:
+        baris = f.readlines()
+    with open(output_path, 'wb') as f:
+        f.writelines(baris[:1 + int((len(baris) - 1) * fraksi)])
+
+
+def jalankan(argumen):
+    """Menjalankan data_prepro.py di proses terpisah. Mengembalikan (waktu detik, peak RSS MB atau None)."""
+    waktu_mulai = time.perf_counter()
+    proses = subprocess.Popen([sys.executable, 'data_prepro.py'] + argumen, stdout=subprocess.DEVNULL)
+    if hasattr(os, 'wait4'):
+        _, status, rusage = os.wait4(proses.pid, 0)
+        proses.returncode = os.waitstatus_to_exitcode(status)
+        rss = rusage.ru_maxrss / 1024.0
+    else:  # Windows
+        proses.wait()
+        rss = None
+    if proses.returncode != 0:
+        raise RuntimeError(f"data_prepro.py gagal: {argumen}")
+    return time.perf_counter() - waktu_mulai, rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan data_prepro.py mode penuh vs --chunk vs --inkremental: waktu dan peak RSS.")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--inflasi', default=INFLASI_PATH)
+    parser.add_argument('--baris', type=int, default=JUMLAH_BARIS)
+    parser.add_argument('--chunk', type=int, default=200000)
+    parser.add_argument('--tahun-sekarang', type=int, default=2025)
+    parser.add_argument('--persen-baru', type=float, default=1.0,
+                        help="Mode --inkremental: cache dibangun dari input tanpa PERSEN_BARU%% baris terakhir, lalu run ulang dengan input lengkap.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_csv = os.path.join(tmp, "scrape.csv")
+        buat_scrape_sintetis(args.data_path, args.baris, input_csv)
+        print(f"[INFO] Input sintetis: {args.baris} baris, {os.path.getsize(input_csv) / 1e6:.1f} MB")
+        umum = ['--input', input_csv, '--inflasi', args.inflasi, '--tahun-sekarang', str(args.tahun_sekarang)]
+        hasil = {}
+        for nama, tambahan in (('penuh', []), (f'chunk {args.chunk}', ['--chunk', str(args.chunk)])):
+            output = os.path.join(tmp, f"output_{len(hasil)}.csv")
+            hasil[nama] = jalankan(umum + ['--output', output] + tambahan) + (output,)
+
+        # Inkremental: bangun cache dari crawl lama, lalu run ulang setelah listing baru di-append
+        input_lama = os.path.join(tmp, "scrape_lama.csv")
+        tulis_awalan(input_csv, input_lama, 1 - args.persen_baru / 100)
+        inkremental = ['--inkremental', os.path.join(tmp, "cache_tahap")]
+        output = os.path.join(tmp, "output_inkremental.csv")
+        umum_lama = ['--input', input_lama] + umum[2:]
+        hasil['ink. cache kosong'] = jalankan(umum_lama + ['--output', output] + inkremental) + (None,)
+        hasil[f'ink. +{args.persen_baru:g}% baru'] = jalankan(umum + ['--output', output] + inkremental) + (output,)
+
+        print(f"\n{'Mode':<20}{'Waktu (s)':>12}{'Peak RSS (MB)':>16}")
+        for nama, (waktu, rss, _) in hasil.items():
+            print(f"{nama:<20}{waktu:>12.2f}{rss if rss is not None else float('nan'):>16.1f}")
+        outputs = [output for _, _, output in hasil.values() if output]
+        with open(outputs[0], 'rb') as f:
+            acuan = f.read()
+        for output in outputs[1:]:
+            with open(output, 'rb') as f:
+                print(f"[INFO] Output {os.path.basename(output)} identik dengan mode penuh: {f.read() == acuan}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# bench_proyeksi.py
+
+import argparse
+import os
+
+import numpy as np
+
+from bench_tree_numpy import ukur_latensi_ms
+from inferensi import ENGINE_NUMPY, ENGINE_XGBOOST, KM_PER_TAHUN_ASUMSI, muat_komponen_model, proyeksi_harga
+
+# --- KONFIGURASI BENCHMARK ---
+MODEL_PATH = os.path.join("model", "xgboost_mobil_model_v3.pkl")
+JUMLAH_TITIK = [11, 51, 101]
+CONTOH_MOBIL = {'Tahun_Input': 2018, 'Kilometer_Input': 50000, 'Merek_Input': 'Toyota', 'Model_Detail_Input': 'Avanza G',
+                'Lokasi_Input': 'DKI Jakarta', 'Owner_Input': 'First'}
+
+
+def kurva_per_tahun(model, encoder, user_input_dict, tahun_ke_depan, km_per_tahun=KM_PER_TAHUN_ASUMSI):
+    """Cara lama: satu encode_row + satu model.predict per titik kurva."""
+    hasil = []
+    for n in tahun_ke_depan:
+        varian = dict(user_input_dict, Tahun_Input=user_input_dict['Tahun_Input'] - n,
+                      Kilometer_Input=user_input_dict['Kilometer_Input'] + n * km_per_tahun)
+        hasil.append(np.expm1(model.predict(encoder.encode_row(varian).reshape(1, -1))[0]))
+    return np.array(hasil)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark proyeksi_harga (satu predict) vs predict per titik kurva.")
+    parser.add_argument('--model-path', default=MODEL_PATH)
+    parser.add_argument('--engine', choices=[ENGINE_XGBOOST, ENGINE_NUMPY], default=ENGINE_XGBOOST)
+    args = parser.parse_args()
+
+    model, _, _, encoder = muat_komponen_model(args.model_path, args.engine)
+    print(f"\n{'Titik':>8}{'Per titik (ms)':>16}{'Kurva (ms)':>12}{'Speedup':>10}{'Cocok':>8}")
+    for jumlah_titik in JUMLAH_TITIK:
+        tahun_ke_depan = np.arange(jumlah_titik)
+        kurva = proyeksi_harga(model, encoder, CONTOH_MOBIL, tahun_ke_depan)['Harga_Prediksi'].to_numpy()
+        cocok = np.allclose(kurva, kurva_per_tahun(model, encoder, CONTOH_MOBIL, tahun_ke_depan), rtol=1e-6)
+        ms_lama = ukur_latensi_ms(lambda _: kurva_per_tahun(model, encoder, CONTOH_MOBIL, tahun_ke_depan), None)
+        ms_kurva = ukur_latensi_ms(lambda _: proyeksi_harga(model, encoder, CONTOH_MOBIL, tahun_ke_depan), None)
+        print(f"{jumlah_titik:>8}{ms_lama:>16.2f}{ms_kurva:>12.2f}{ms_lama / ms_kurva:>9.1f}x{str(cocok):>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# bench_scraper.py
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+import mobil_scraper
+from stub_server_scraper import DATA_PATH, generate_halaman, jalankan_stub_di_thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan scraper berurutan vs async vs pipeline terhadap stub server lokal (offline).")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--halaman', type=int, default=40)
+    parser.add_argument('--delay-ms', type=float, default=200.0, help="Latensi buatan stub per request.")
+    parser.add_argument('--rasio-429', type=float, default=0.0, help="Porsi request 429 (scraper berurutan tidak punya retry).")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=50.0)
+    parser.add_argument('--parse-workers', type=int, default=mobil_scraper.PARSE_WORKERS)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_halaman(args.data_path, tmp, args.halaman)
+        server, base_url = jalankan_stub_di_thread(tmp, delay_ms=args.delay_ms, rasio_429=args.rasio_429)
+        hasil = {}
+        try:
+            for nama in ('berurutan', 'async', 'pipeline'):
+                output = os.path.join(tmp, f"hasil_{nama}.csv")
+                waktu_mulai = time.perf_counter()
+                if nama == 'berurutan':
+                    mobil_scraper.main_scraper(base_url, args.halaman + 5, output, request_delay=0, resume=False)
+                elif nama == 'async':
+                    mobil_scraper.main_scraper_async(base_url, args.halaman + 5, output, args.concurrency, args.rate, resume=False)
+                else:
+                    mobil_scraper.main_scraper_pipeline(base_url, args.halaman + 5, output, os.path.join(tmp, "arsip"),
+                                                        args.concurrency, args.rate, args.parse_workers, resume=False)
+                hasil[nama] = (time.perf_counter() - waktu_mulai, pd.read_csv(output))
+        finally:
+            server.shutdown()
+
+    print(f"\n[INFO] {args.halaman} halaman, latensi stub {args.delay_ms} ms, rasio 429 {args.rasio_429}")
+    print(f"{'Mode':<12}{'Waktu (s)':>12}{'Listing':>10}{'Halaman/detik':>16}")
+    for nama, (waktu, df) in hasil.items():
+        print(f"{nama:<12}{waktu:>12.2f}{len(df):>10}{args.halaman / waktu:>16.1f}")
+    # Mode async/pipeline menulis halaman sesuai urutan selesai, jadi dibandingkan setelah diurutkan
+    urut = lambda df: df.sort_values(list(df.columns)).reset_index(drop=True)
+    for nama in ('async', 'pipeline'):
+        sama = urut(hasil['berurutan'][1]).equals(urut(hasil[nama][1]))
+        print(f"[INFO] {nama}: hasil identik {sama} | Speedup: {hasil['berurutan'][0] / hasil[nama][0]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# bench_tree_numpy.py
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from inferensi import muat_komponen_model
+from tree_numpy import NumpyTreeEnsemble, periksa_kesesuaian
+
+# --- KONFIGURASI BENCHMARK ---
+MODEL_PATH = os.path.join("model", "xgboost_mobil_model_v3.pkl")
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+UKURAN_BATCH = [1, 100, 100000]
+
+
+def ukur_latensi_ms(fungsi_predict, X, min_durasi=1.0, min_ulangan=3):
+    """Median latensi (ms) satu panggilan predict, diulang sampai min_durasi detik."""
+    fungsi_predict(X)  # pemanasan
+    latensi = []
+    waktu_mulai = time.perf_counter()
+    while len(latensi) < min_ulangan or time.perf_counter() - waktu_mulai < min_durasi:
+        t0 = time.perf_counter()
+        fungsi_predict(X)
+        latensi.append((time.perf_counter() - t0) * 1000.0)
+    return float(np.median(latensi))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark evaluator tree numpy vs XGBRegressor.predict.")
+    parser.add_argument('--model-path', default=MODEL_PATH)
+    parser.add_argument('--data-path', default=DATA_PATH)
+    args = parser.parse_args()
+
+    model, scaler, kolom, encoder = muat_komponen_model(args.model_path)
+    numpy_model = NumpyTreeEnsemble.dari_booster(model.booster if hasattr(model, 'booster_path') else model)
+
+    df = pd.read_csv(args.data_path, usecols=['Merek', 'Model_Detail', 'Tahun', 'Kilometer', 'Lokasi'])
+    X_data = encoder.scale_matrix(encoder.encode_batch(df))
+    cocok, selisih_maks = periksa_kesesuaian(numpy_model, model, X_data)
+    print(f"[INFO] Kesesuaian dengan XGBoost pada {len(X_data)} baris data: cocok={cocok}, selisih maks (log)={selisih_maks:.3e}")
+
+    rng = np.random.default_rng(42)
+    print(f"\n{'Baris':>8}{'XGBoost (ms)':>16}{'Numpy (ms)':>14}{'Speedup':>10}")
+    for n_baris in UKURAN_BATCH:
+        X = X_data[rng.integers(0, len(X_data), size=n_baris)]
+        ms_xgb = ukur_latensi_ms(model.predict, X)
+        ms_numpy = ukur_latensi_ms(numpy_model.predict, X)
+        print(f"{n_baris:>8}{ms_xgb:>16.3f}{ms_numpy:>14.3f}{ms_xgb / ms_numpy:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
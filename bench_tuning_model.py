@@ -0,0 +1,48 @@
+# bench_tuning_model.py
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from tuning_model import buat_kandidat, cari_hyperparameter
+
+# --- KONFIGURASI BENCHMARK ---
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+JUMLAH_KANDIDAT = 8
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan tuning berurutan (1 proses, semua thread) vs process pool.")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--kandidat', type=int, default=JUMLAH_KANDIDAT)
+    parser.add_argument('--k-fold', type=int, default=3)
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.data_path)
+    q1, q3 = df['Harga'].quantile([0.25, 0.75])
+    df = df[df['Harga'].between(q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))]  # filter outlier seperti modelling.py
+    # Matriks one-hot seperti modelling.py mode dense (scaling tidak mengubah split tree)
+    X = pd.get_dummies(df.drop(columns=[k for k in df.columns if k not in ('Merek', 'Model_Detail', 'Lokasi', 'Tahun', 'Kilometer', 'UsiaMobil', 'Inflasi')]),
+                       columns=['Merek', 'Model_Detail', 'Lokasi'], drop_first=True).to_numpy(dtype=np.float32)
+    y = np.log1p(df['Harga'].to_numpy(dtype=np.float64))
+    kandidat = buat_kandidat(mode='random', n_iter=args.kandidat)
+    jumlah_core = os.cpu_count() or 1
+    print(f"[INFO] {X.shape[0]} baris x {X.shape[1]} fitur, {len(kandidat)} kandidat, {args.k_fold} fold, {jumlah_core} core.")
+
+    hasil = {}
+    for nama, n_jobs, thread in (('berurutan', 1, jumlah_core), ('paralel', jumlah_core, 1)):
+        waktu_mulai = time.perf_counter()
+        leaderboard = cari_hyperparameter(X, y, kandidat, k_fold=args.k_fold, n_jobs=n_jobs, thread_per_trial=thread)
+        hasil[nama] = (time.perf_counter() - waktu_mulai, leaderboard.iloc[0]['mape_mean'])
+
+    print(f"\n{'Mode':<12}{'Waktu (s)':>12}{'MAPE CV terbaik (%)':>22}")
+    for nama, (waktu, mape) in hasil.items():
+        print(f"{nama:<12}{waktu:>12.2f}{mape:>22.2f}")
+    print(f"[INFO] Speedup paralel: {hasil['berurutan'][0] / hasil['paralel'][0]:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# cache_tahap.py
+
+import hashlib
+import os
+import pickle
+
+# --- KONFIGURASI CACHE TAHAP ---
+CACHE_TAHAP_DIR = os.path.join("data", "cache_tahap")
+SUFFIX_ENTRI = ".pkl"
+FOLDER_PEMAKAI = "_pemakai"   # {cache_dir}/_pemakai/{hash pemakai}.txt: entri yang dipakai run terakhir tiap input
+
+
+def kunci_konten(*bagian):
+    """SHA-256 (hex) dari gabungan bagian: bytes apa adanya, nilai lain lewat repr(). Panjang tiap bagian
+    ikut di-hash agar ('ab', 'c') dan ('a', 'bc') tidak menghasilkan kunci yang sama."""
+    h = hashlib.sha256()
+    for nilai in bagian:
+        data = nilai if isinstance(nilai, bytes) else repr(nilai).encode('utf-8')
+        h.update(len(data).to_bytes(8, 'little'))
+        h.update(data)
+    return h.hexdigest()
+
+
+class CacheTahap:
+    """Cache hasil tahap pipeline yang dialamatkan oleh konten: {cache_dir}/{tahap}/{kunci}.pkl.
+
+    Kunci dibuat pemanggil dari hash input dan parameter tahap (kunci_konten), sehingga entri tidak
+    pernah perlu diinvalidasi: input atau parameter yang berubah menghasilkan kunci baru. Satu cache_dir
+    bisa dipakai banyak input; pemakai (mis. path input) menandai entri milik run ini sehingga
+    hapus_tidak_terpakai() hanya membuang entri lama milik pemakai yang sama.
+    """
+
+    def __init__(self, cache_dir=CACHE_TAHAP_DIR, pemakai=None):
+        self.cache_dir = cache_dir
+        self.pemakai = pemakai
+        self.terpakai = set()
+        self.statistik = {}  # tahap -> [hit, miss]
+
+    def _path(self, tahap, kunci):
+        return os.path.join(self.cache_dir, tahap, kunci + SUFFIX_ENTRI)
+
+    def tandai_terpakai(self, tahap, kunci):
+        """Pertahankan entri saat hapus_tidak_terpakai, walau tidak dibaca pada run ini."""
+        self.terpakai.add(self._path(tahap, kunci))
+
+    def ambil_atau_hitung(self, tahap, kunci, hitung):
+        """Hasil tersimpan untuk (tahap, kunci); jika belum ada (atau rusak), hitung() lalu simpan."""
+        path = self._path(tahap, kunci)
+        self.terpakai.add(path)
+        statistik = self.statistik.setdefault(tahap, [0, 0])
+        if os.path.exists(path):
+            try:
+                with open(path, 'rb') as f:
+                    hasil = pickle.load(f)
+                statistik[0] += 1
+                return hasil
+            except (OSError, EOFError, pickle.UnpicklingError) as e:
+                print(f"[WARNING] Entri cache {path} tidak terbaca ({e}), dihitung ulang.")
+        hasil = hitung()
+        statistik[1] += 1
+        self._simpan(path, hasil)
+        return hasil
+
+    def _simpan(self, path, hasil):
+        path_tmp = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path_tmp, 'wb') as f:
+                pickle.dump(hasil, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(path_tmp, path)
+        except OSError as e:  # mis. disk penuh: hasil tetap dipakai, run berikutnya menghitung ulang
+            print(f"[WARNING] Gagal menyimpan entri cache {path}: {e}")
+
+    def _path_pemakai(self, pemakai):
+        return os.path.join(self.cache_dir, FOLDER_PEMAKAI, kunci_konten(pemakai) + ".txt")
+
+    def _baca_daftar(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return {os.path.join(self.cache_dir, baris) for baris in f.read().splitlines() if baris}
+        except OSError:
+            return set()
+
+    def hapus_tidak_terpakai(self):
+        """Hapus entri yang dipakai pemakai ini pada run sebelumnya tetapi tidak sejak objek ini dibuat, kecuali
+        masih tercatat dipakai pemakai lain. Entri pemakai lain tidak disentuh. Lalu catat entri run ini.
+
+        Mengembalikan jumlah file yang dihapus (0 tanpa pemakai).
+        """
+        if self.pemakai is None:
+            return 0
+        path_daftar = self._path_pemakai(self.pemakai)
+        folder_pemakai = os.path.dirname(path_daftar)
+        lama = self._baca_daftar(path_daftar) - self.terpakai
+        if lama and os.path.isdir(folder_pemakai):
+            for nama in os.listdir(folder_pemakai):
+                path = os.path.join(folder_pemakai, nama)
+                if path != path_daftar:
+                    lama -= self._baca_daftar(path)
+        jumlah = 0
+        for path in lama:
+            try:
+                os.remove(path)
+                jumlah += 1
+            except FileNotFoundError:
+                pass
+
+        try:
+            os.makedirs(folder_pemakai, exist_ok=True)
+            with open(path_daftar + ".tmp", 'w', encoding='utf-8') as f:
+                f.write("".join(os.path.relpath(path, self.cache_dir) + "\n" for path in sorted(self.terpakai)))
+            os.replace(path_daftar + ".tmp", path_daftar)
+        except OSError as e:
+            print(f"[WARNING] Gagal mencatat entri cache pemakai di {path_daftar}: {e}")
+        return jumlah
+
+    def ringkasan(self):
+        return ", ".join(f"{tahap} {hit} hit/{miss} miss" for tahap, (hit, miss) in self.statistik.items())
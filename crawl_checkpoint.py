@@ -0,0 +1,116 @@
+# crawl_checkpoint.py
+
+import json
+import logging
+import os
+
+import pandas as pd
+
+# --- KONFIGURASI CHECKPOINT ---
+FLUSH_SETIAP_N_HALAMAN = 1      # Baris ditulis ke disk setiap N halaman selesai
+MAX_BUFFER_BARIS = 2000         # Batas baris di memori; buffer penuh dipaksa flush
+SUFFIX_CHECKPOINT = ".checkpoint.json"
+
+
+def _ke_rentang(nomor_halaman):
+    """{1,2,3,5} -> [[1,3],[5,5]] agar checkpoint tetap kecil untuk ribuan halaman."""
+    rentang = []
+    for nomor in sorted(nomor_halaman):
+        if rentang and nomor == rentang[-1][1] + 1:
+            rentang[-1][1] = nomor
+        else:
+            rentang.append([nomor, nomor])
+    return rentang
+
+
+def _dari_rentang(rentang):
+    return {nomor for awal, akhir in rentang for nomor in range(awal, akhir + 1)}
+
+
+class CrawlCheckpoint:
+    """Penulis CSV append-only + checkpoint halaman selesai untuk crawl yang bisa dilanjutkan.
+
+    Baris per halaman ditampung di buffer terbatas lalu di-append ke output_csv. Setelah setiap
+    flush, checkpoint JSON (ditulis atomik) mencatat halaman yang barisnya sudah di disk dan offset
+    byte CSV. Saat resume, CSV dipotong ke offset tersebut sehingga baris dari halaman yang belum
+    tercatat di checkpoint (crash di tengah flush) tidak terduplikasi.
+    """
+
+    def __init__(self, output_csv, kolom, resume=True, flush_setiap_n_halaman=FLUSH_SETIAP_N_HALAMAN,
+                 max_buffer_baris=MAX_BUFFER_BARIS):
+        self.output_csv = output_csv
+        self.path_checkpoint = output_csv + SUFFIX_CHECKPOINT
+        self.kolom = list(kolom)
+        self.flush_setiap_n_halaman = max(1, flush_setiap_n_halaman)
+        self.max_buffer_baris = max_buffer_baris
+        self.halaman_selesai = set()
+        self.halaman_akhir = None
+        self.selesai = False
+        self.jumlah_baris = 0
+        self.buffer = []
+        self.halaman_buffer = set()
+
+        if resume and os.path.exists(self.path_checkpoint) and os.path.exists(output_csv):
+            with open(self.path_checkpoint, encoding='utf-8') as f:
+                state = json.load(f)
+            self.halaman_selesai = _dari_rentang(state['halaman_selesai'])
+            self.halaman_akhir = state.get('halaman_akhir')
+            self.selesai = state.get('selesai', False)
+            self.jumlah_baris = state['jumlah_baris']
+            with open(output_csv, 'r+b') as f:
+                f.truncate(state['offset_byte'])
+            logging.info(f"Resume crawl: {len(self.halaman_selesai)} halaman dan {self.jumlah_baris} baris "
+                         f"sudah tersimpan di {output_csv}.")
+        else:
+            with open(output_csv, 'wb') as f:
+                f.write((','.join(self.kolom) + '\n').encode('utf-8'))
+            self._simpan_checkpoint()
+
+    def sudah_selesai(self, nomor):
+        return nomor in self.halaman_selesai or nomor in self.halaman_buffer
+
+    def halaman_tersisa(self, max_halaman):
+        """Nomor halaman yang belum selesai, tidak melewati halaman akhir yang sudah diketahui."""
+        batas = min(max_halaman, self.halaman_akhir - 1) if self.halaman_akhir else max_halaman
+        return [nomor for nomor in range(1, batas + 1) if not self.sudah_selesai(nomor)]
+
+    def tandai_halaman_akhir(self, nomor):
+        """Pagination berakhir sebelum halaman `nomor` (mis. halaman kosong); resume tidak melewatinya."""
+        self.halaman_akhir = min(self.halaman_akhir or nomor, nomor)
+
+    def tambah_halaman(self, nomor, records):
+        """Mencatat hasil satu halaman yang selesai (records boleh kosong)."""
+        self.buffer.extend(records)
+        self.halaman_buffer.add(nomor)
+        if len(self.halaman_buffer) >= self.flush_setiap_n_halaman or len(self.buffer) >= self.max_buffer_baris:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            data = pd.DataFrame(self.buffer).reindex(columns=self.kolom).to_csv(index=False, header=False)
+            with open(self.output_csv, 'ab') as f:
+                f.write(data.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+            self.jumlah_baris += len(self.buffer)
+        self.halaman_selesai |= self.halaman_buffer
+        self.buffer, self.halaman_buffer = [], set()
+        self._simpan_checkpoint()
+
+    def tutup(self, selesai=True):
+        """Flush sisa buffer; selesai=True menandai crawl lengkap di checkpoint."""
+        self.selesai = selesai
+        self.flush()
+
+    def _simpan_checkpoint(self):
+        state = {
+            'halaman_selesai': _ke_rentang(self.halaman_selesai),
+            'halaman_akhir': self.halaman_akhir,
+            'selesai': self.selesai,
+            'jumlah_baris': self.jumlah_baris,
+            'offset_byte': os.path.getsize(self.output_csv),
+        }
+        path_tmp = self.path_checkpoint + ".tmp"
+        with open(path_tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(path_tmp, self.path_checkpoint)
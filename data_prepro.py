@@ -1,331 +1,411 @@
-# data_processing_final.py
+# data_prepro.py
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import io
+import itertools
+import os
+import sys
 from datetime import datetime
-from sklearn.preprocessing import StandardScaler
-import re
-import openpyxl
 
-print("--- [INFO] Memulai Skrip Pengolahan Data Mobil ---")
+import numpy as np
+import pandas as pd
+
+from cache_tahap import CACHE_TAHAP_DIR, CacheTahap, kunci_konten
+from depresiasi import (KOLOM_DEPRESIASI, MAX_RASIO_ESTAWAL_VS_HARGADEFLASI, RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI,
+                        fitur_depresiasi_riil)
+from indeks_pembanding import kumpulkan_indeks, path_indeks, simpan_indeks
+from katalog_mobil import kumpulkan_katalog, path_katalog, simpan_katalog
+from penyimpanan_data import baca_tabel, format_dari_path, tulis_tabel
+from tabel_inflasi import INFLASI_XLSX_FILE, muat_tabel_inflasi
 
 # --- 1. KONFIGURASI ---
-INPUT_CSV_FILE = 'data\hasil_scrape_mobil123.csv'
+INPUT_CSV_FILE = os.path.join("data", "hasil_scrape_mobil123.csv")
+OUTPUT_CSV_FILE = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
 CURRENT_YEAR = datetime.now().year
 
+HARGA_MIN = 1000000
+HARGA_MAKS = 10000000000
+UKURAN_CHUNK = 200000              # Mode --chunk: baris input per chunk
+UKURAN_PARTISI = 25000             # Mode --inkremental: baris input per partisi (unit cache)
+VERSI_TAHAP = 1                    # Naikkan jika logika pembersihan/fitur berubah agar cache tahap lama tidak dipakai
+TIPE_KOLOM_NUMERIK = {'Harga': 'float64', 'Tahun': 'int64', 'Kilometer': 'int64'}
 
-# --- 2. MUAT DATA ---
-print(f"--- [INFO] Memuat data dari: {INPUT_CSV_FILE} ---")
-try:
-    df = pd.read_csv(INPUT_CSV_FILE)
-    print(f"[INFO] Data berhasil dimuat. Baris awal: {len(df)}, Kolom awal: {len(df.columns)}")
-except FileNotFoundError:
-    print(f"[ERROR] File '{INPUT_CSV_FILE}' tidak ditemukan.")
-    exit()
-except Exception as e:
-    print(f"[ERROR] Gagal memuat CSV: {e}")
-    exit()
-
-print(df.head())
-
-print(df.info())
-
-# --- 4. PEMBERSIHAN DATA DAN TRANSFORMASI AWAL ---
-print("\n--- [INFO] Memulai Pembersihan Data Inti ---")
-
-rows_before_dropna_critical = len(df)
-df.dropna(inplace=True)
-if len(df) == 0:
-    print("[ERROR] Tidak ada data tersisa setelah dropna krusial. Program berhenti.")
-    exit()
-#b.Penghapusan data anomali
-df = df[(df['Harga'] >= 1000000) & (df['Harga'] <= 10000000000)]
-
-
-print(df['Tahun'].unique())
-print(df['Tahun'].dtype)
-print(CURRENT_YEAR)
-
-
-# c. Buat Fitur 'UsiaMobil'
-if 'Tahun' in df.columns:
-    df['UsiaMobil'] = CURRENT_YEAR - df['Tahun']
-    # Validasi UsiaMobil agar tidak negatif (ini sebaiknya tetap ada)
-    df = df[df['UsiaMobil'] >= 0] # Filter usia negatif
-
-    print(f"[INFO] Fitur 'UsiaMobil' dibuat. Rentang: {df['UsiaMobil'].min() if not df.empty else 'N/A'} - {df['UsiaMobil'].max() if not df.empty else 'N/A'} tahun.")
-else:
-    print("[ERROR] Kolom 'Tahun' tidak valid untuk membuat 'UsiaMobil'. Program berhenti.")
-    exit()
-
-if len(df) == 0: # Cek ini setelah filter usia negatif
-    print("[ERROR] Tidak ada data tersisa setelah filter UsiaMobil negatif. Program berhenti.")
-    exit()
-
-# e. Hapus Duplikasi
-rows_before_dedup = len(df)
-df.drop_duplicates(inplace=True)
-print(f"[INFO] Menghapus {rows_before_dedup - len(df)} baris duplikat.")
-
-print(df.head())
-
-# --- 6. VISUALISASI DATA (Fokus Depresiasi) ---
-print("\n--- [INFO] Memulai Visualisasi Data (Tutup plot untuk melanjutkan) ---")
-plt.style.use('seaborn-v0_8-whitegrid')
-
-# a. Distribusi Harga
-plt.figure(figsize=(10, 6)); sns.histplot(df['Harga'], kde=True, bins=50, color='skyblue');
-plt.title('Distribusi Harga Mobil Final', fontsize=15); plt.xlabel('Harga (Rp)', fontsize=12); plt.ylabel('Frekuensi', fontsize=12);
-plt.ticklabel_format(style='plain', axis='x'); plt.tight_layout(); plt.show()
-
-# b. Distribusi UsiaMobil
-plt.figure(figsize=(10, 6)); sns.histplot(df['UsiaMobil'], kde=False, bins=min(30, df['UsiaMobil'].nunique()), color='salmon');
-plt.title('Distribusi Usia Mobil Final', fontsize=15); plt.xlabel('Usia Mobil (Tahun)', fontsize=12); plt.ylabel('Frekuensi', fontsize=12);
-plt.tight_layout(); plt.show()
-
-# c. Pola Depresiasi (Harga vs UsiaMobil)
-plt.figure(figsize=(12, 7)); sns.scatterplot(data=df, x='UsiaMobil', y='Harga', alpha=0.4, color='green', edgecolor=None, s=30);
-plt.title('Harga vs. Usia Mobil (Pola Depresiasi)', fontsize=15); plt.xlabel('Usia Mobil (Tahun)', fontsize=12); plt.ylabel('Harga (Rp)', fontsize=12);
-plt.ticklabel_format(style='plain', axis='y'); plt.grid(True, linestyle='--', alpha=0.7); plt.tight_layout(); plt.show()
-
-
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-# Gaya plot
-plt.style.use('seaborn-v0_8-whitegrid')
-sns.set_palette('viridis')
-
-# 1. Distribusi Harga Mobil Bekas
-plt.figure(figsize=(8, 5))
-sns.histplot(df['Harga'], bins=30, kde=True, color='green')
-plt.title("Distribusi Harga Mobil Bekas")
-plt.xlabel("Harga (Rp)")
-plt.ylabel("Frekuensi")
-plt.show()
-
-# 2. Harga vs Usia Mobil (Scatter Plot)
-plt.figure(figsize=(10, 6))
-sns.scatterplot(x='UsiaMobil', y='Harga', data=df, alpha=0.7, color='darkgreen')
-sns.regplot(x='UsiaMobil', y='Harga', data=df, scatter=False, color='red', ci=None)
-plt.title("Harga vs Usia Mobil")
-plt.xlabel("Usia Mobil (Tahun)")
-plt.ylabel("Harga (Rp)")
-plt.show()
-
-# 3. Boxplot Harga Berdasarkan Merek
-plt.figure(figsize=(12, 6))
-sns.boxplot(x='Merek', y='Harga', data=df, palette='Set3')
-plt.title("Distribusi Harga Berdasarkan Merek")
-plt.xticks(rotation=45)
-plt.xlabel("Merek")
-plt.ylabel("Harga (Rp)")
-plt.show()
-
-# Membaca data inflasi
-df_inflasi = pd.read_excel('inflasi indonesia.xlsx')
-
-# Gabungkan kedua data berdasarkan kolom 'Tahun'
-df= pd.merge(df, df_inflasi[['Tahun', 'Inflasi']], on='Tahun', how='left')
-df.head()
-
-# --- 6. MEMBUAT FITUR DEPRESIASI EKSPLISIT (DENGAN INFLASI DARI KOLOM 'Inflasi') ---
-print("\n--- [INFO] Membuat Fitur Depresiasi Eksplisit dengan Inflasi dari Kolom 'Inflasi' ---")
-
-RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI = 0.10
-
-if 'Harga' in df.columns and 'UsiaMobil' in df.columns and \
-   'Tahun' in df.columns and 'Inflasi' in df.columns:
-
-    # Konversi nilai inflasi ke desimal
-    df['Inflasi'] = df['Inflasi'] / 100
-
-    df_dep_calc = df[df['UsiaMobil'] > 0].copy()
-    df_dep_new = df[df['UsiaMobil'] == 0].copy()
-
-    if not df_dep_calc.empty:
-        # 1. Hitung Harga Sekarang yang Dideflasi ke Nilai Uang Tahun Pembuatan
-        df_dep_calc['HargaSekarang_DeflasiKeThnBuat'] = df_dep_calc['Harga'] / (1 + df_dep_calc['Inflasi'])
-
-        # 2. Estimasi Harga Awal Mobil (Harga Baru) pada Tahun Pembuatannya
-        faktor_dep_riil_kumulatif = (1 - RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI) ** df_dep_calc['UsiaMobil']
-        faktor_dep_riil_kumulatif = np.where(faktor_dep_riil_kumulatif < 1e-9, 1e-9, faktor_dep_riil_kumulatif)
-
-        df_dep_calc['EstimasiHargaAwal_PadaThnBuat'] = df_dep_calc['HargaSekarang_DeflasiKeThnBuat'] / faktor_dep_riil_kumulatif
-
-        MAX_RASIO_ESTAWAL_VS_HARGADEFLASI = 7
-        df_dep_calc['EstimasiHargaAwal_PadaThnBuat'] = np.minimum(
-            df_dep_calc['EstimasiHargaAwal_PadaThnBuat'],
-            df_dep_calc['HargaSekarang_DeflasiKeThnBuat'] * MAX_RASIO_ESTAWAL_VS_HARGADEFLASI
-        )
-        df_dep_calc['EstimasiHargaAwal_PadaThnBuat'] = np.maximum(
-            df_dep_calc['EstimasiHargaAwal_PadaThnBuat'],
-            df_dep_calc['HargaSekarang_DeflasiKeThnBuat']
-        )
-
-        # 3. Estimasi Harga Awal dalam Nilai Uang SAAT INI
-        df_dep_calc['EstimasiHargaAwal_NilaiSaatIni'] = df_dep_calc['EstimasiHargaAwal_PadaThnBuat'] * (1 + df_dep_calc['Inflasi'])
-
-        # 4. Hitung Depresiasi Riil per Tahun (Absolut, dalam nilai uang tahun pembuatan)
-        df_dep_calc['DepresiasiRiilAbsolut_PerThn_PadaThnBuat'] = (
-            df_dep_calc['EstimasiHargaAwal_PadaThnBuat'] - df_dep_calc['HargaSekarang_DeflasiKeThnBuat']
-        ) / df_dep_calc['UsiaMobil']
-        df_dep_calc['DepresiasiRiilAbsolut_PerThn_PadaThnBuat'] = np.maximum(0, df_dep_calc['DepresiasiRiilAbsolut_PerThn_PadaThnBuat'])
-
-        # 5. Hitung Depresiasi Riil Normal (Persentase Depresiasi Tahunan Aktual)
-        df_dep_calc['DepresiasiRiilNormal_PersenPerThn'] = np.where(
-            df_dep_calc['EstimasiHargaAwal_PadaThnBuat'] > 1e-9,
-            (df_dep_calc['DepresiasiRiilAbsolut_PerThn_PadaThnBuat'] / df_dep_calc['EstimasiHargaAwal_PadaThnBuat']) * 100,
-            0
-        )
-        df_dep_calc['DepresiasiRiilNormal_PersenPerThn'] = np.clip(df_dep_calc['DepresiasiRiilNormal_PersenPerThn'], 0, 100)
-
-        # 6. Depresiasi Absolut per Tahun dalam Nilai Uang SAAT INI
-        df_dep_calc['DepresiasiAbsolut_PerThn_NilaiSaatIni'] = (
-            df_dep_calc['EstimasiHargaAwal_NilaiSaatIni'] - df_dep_calc['Harga']
-        ) / df_dep_calc['UsiaMobil']
-        df_dep_calc['DepresiasiAbsolut_PerThn_NilaiSaatIni'] = np.maximum(0, df_dep_calc['DepresiasiAbsolut_PerThn_NilaiSaatIni'])
-
-        print("[INFO] Fitur depresiasi riil (disesuaikan inflasi dari kolom 'Inflasi') dihitung untuk mobil usia > 0.")
-    else:
-        print("[INFO] Tidak ada mobil dengan UsiaMobil > 0 untuk dihitung fitur depresiasi eksplisit.")
-
-
-
-    if not df_dep_new.empty:
-        harga_mobil_baru = df_dep_new['Harga']
-        inflasi_mobil_baru = df_dep_new['Inflasi'] # Mengambil dari kolom 'Inflasi'
-
-        df_dep_new['HargaSekarang_DeflasiKeThnBuat'] = harga_mobil_baru / inflasi_mobil_baru
-        df_dep_new['EstimasiHargaAwal_PadaThnBuat'] = harga_mobil_baru / inflasi_mobil_baru # Harga baru pada tahun itu
-        df_dep_new['EstimasiHargaAwal_NilaiSaatIni'] = (harga_mobil_baru / inflasi_mobil_baru) * inflasi_mobil_baru # Seharusnya sama dengan harga_mobil_baru
-
-        df_dep_new['DepresiasiRiilAbsolut_PerThn_PadaThnBuat'] = 0.0
-        df_dep_new['DepresiasiRiilNormal_PersenPerThn'] = 0.0
-        df_dep_new['DepresiasiAbsolut_PerThn_NilaiSaatIni'] = 0.0
-        print("[INFO] Fitur depresiasi riil di-set 0 untuk mobil UsiaMobil == 0.")
-
-    kolom_depresiasi_final = [
-        'HargaSekarang_DeflasiKeThnBuat', 
-        'EstimasiHargaAwal_PadaThnBuat',   
-        'EstimasiHargaAwal_NilaiSaatIni',
-        'DepresiasiRiilAbsolut_PerThn_PadaThnBuat', 
-        'DepresiasiRiilNormal_PersenPerThn',
-        'DepresiasiAbsolut_PerThn_NilaiSaatIni'
-    ]
-
-    df_temp_concat = pd.concat([df_dep_calc, df_dep_new], ignore_index=False)
-
-    for col in kolom_depresiasi_final:
-        if col in df_temp_concat.columns:
-            df[col] = df_temp_concat[col]
-            df[col].fillna(0, inplace=True)
-        else:
-            # Jika kolom tidak ada di salah satu (misal df_dep_calc kosong), buat kolomnya
-            df[col] = 0.0
-
-    print("[INFO] Fitur depresiasi riil (disesuaikan inflasi) telah ditambahkan/diperbarui di DataFrame utama.")
-
-    cols_to_print_dep = ['Harga', 'Tahun', 'UsiaMobil', 'Inflasi'] + \
-                        [c for c in ['EstimasiHargaAwal_NilaiSaatIni', 'DepresiasiAbsolut_PerThn_NilaiSaatIni', 'DepresiasiRiilNormal_PersenPerThn'] if c in df.columns]
-    if cols_to_print_dep:
-        print(df[cols_to_print_dep].head())
-else:
-    print("[WARNING] Kolom krusial ('Harga', 'UsiaMobil', 'Tahun', atau 'Inflasi') tidak lengkap. Fitur depresiasi dengan inflasi tidak bisa dibuat.")
-# --- 7. TAMPILKAN CONTOH DATA & STATISTIK (Setelah Fitur Depresiasi Inflasi) ---
-print("\n--- [INFO] Contoh Data dengan Fitur Depresiasi (Disesuaikan Inflasi) ---")
-kolom_tampilan_dep_inflasi = [
-    'Merek', 'Model_Detail', 'Harga', 'Tahun', 'Kilometer', 'UsiaMobil', 'Lokasi',
-    'FaktorInflasiKumulatif', # Tampilkan juga ini untuk cek
+KOLOM_PLOT_DEPRESIASI = [
     'EstimasiHargaAwal_NilaiSaatIni',
     'DepresiasiAbsolut_PerThn_NilaiSaatIni',
     'DepresiasiRiilNormal_PersenPerThn'
 ]
-kolom_tersedia_tampil_dep_inflasi = [col for col in kolom_tampilan_dep_inflasi if col in df.columns]
-
-if not df.empty and kolom_tersedia_tampil_dep_inflasi:
-    jumlah_baris_tampil = 10
-    print(f"\nMenampilkan {jumlah_baris_tampil} baris pertama dengan kolom terpilih (disesuaikan inflasi):")
-    try:
-        pd.set_option('display.max_columns', None); pd.set_option('display.width', 1200); pd.set_option('display.colheader_justify', 'left')
-        print(df[kolom_tersedia_tampil_dep_inflasi].head(jumlah_baris_tampil).to_string(index=True))
-    except Exception as e:
-        print(f"[WARNING] Gagal menampilkan tabel dengan format to_string: {e}")
-        print(df[kolom_tersedia_tampil_dep_inflasi].head(jumlah_baris_tampil))
-
-    print("\n--- [INFO] Statistik Deskriptif untuk Fitur Depresiasi (Disesuaikan Inflasi) ---")
-    # Kolom depresiasi yang relevan untuk deskripsi (pilih yang paling informatif)
-    desc_cols_dep_final = [
-        'EstimasiHargaAwal_NilaiSaatIni',
-        'DepresiasiAbsolut_PerThn_NilaiSaatIni',
-        'DepresiasiRiilNormal_PersenPerThn'
-    ]
-    desc_cols_dep_final_existing = [col for col in desc_cols_dep_final if col in df.columns]
-    if desc_cols_dep_final_existing:
-        print(df[desc_cols_dep_final_existing].describe())
-    else:
-        print("[INFO] Tidak ada kolom fitur depresiasi (disesuaikan inflasi) untuk statistik deskriptif.")
-else:
-    print("[INFO] DataFrame kosong atau kolom yang diminta tidak tersedia untuk ditampilkan (setelah fitur depresiasi inflasi).")
-
-
-# --- 8. SIMPAN CSV DENGAN FITUR DEPRESIASI (SEBELUM ENCODING/SCALING) ---
-OUTPUT_CSV_INTERMEDIATE_WITH_INFLATION = 'data_mobil_fitur_depresiasi_inflasi.csv'
-print(f"\n--- [INFO] Menyimpan DataFrame dengan Fitur Depresiasi (Disesuaikan Inflasi) ke '{OUTPUT_CSV_INTERMEDIATE_WITH_INFLATION}' ---")
-if not df.empty:
-    try:
-        df.to_csv(OUTPUT_CSV_INTERMEDIATE_WITH_INFLATION, index=False, encoding='utf-8')
-        print(f"[INFO] DataFrame berhasil disimpan.")
-    except Exception as e:
-        print(f"[ERROR] Gagal menyimpan DataFrame ke '{OUTPUT_CSV_INTERMEDIATE_WITH_INFLATION}': {e}")
-else:
-    print("[WARNING] DataFrame kosong, tidak ada yang disimpan pada tahap ini.")
 
 
-# --- 9. VISUALISASI FITUR DEPRESIASI EKSPLISIT (Disesuaikan Inflasi) ---
-print("\n--- [INFO] Memulai Visualisasi Fitur Depresiasi (Disesuaikan Inflasi) ---")
-plt.style.use('seaborn-v0_8-whitegrid')
+# --- 2. MUAT DATA ---
+def muat_data(input_csv=INPUT_CSV_FILE):
+    """Membaca hasil scraping (CSV, atau Parquet/Feather)."""
+    df = baca_tabel(input_csv)
+    print(f"[INFO] Data dimuat dari {input_csv}. Baris awal: {len(df)}, Kolom awal: {len(df.columns)}")
+    return df
+
+
+def muat_inflasi(inflasi_xlsx=INFLASI_XLSX_FILE):
+    """TabelInflasi dari cache; Excel (openpyxl) hanya dibaca jika file sumber berubah."""
+    return muat_tabel_inflasi(inflasi_xlsx)
+
+
+# --- 3. PEMBERSIHAN DATA DAN TRANSFORMASI AWAL ---
+def _bersihkan_baris(df, current_year):
+    """dropna, tipe kolom numerik, filter harga anomali dan usia negatif, fitur UsiaMobil (tanpa hapus duplikat)."""
+    if 'Tahun' not in df.columns:
+        raise ValueError("Kolom 'Tahun' tidak valid untuk membuat 'UsiaMobil'.")
+    df = df.dropna()
+    # Tipe tetap per kolom, agar hasil (dan hash baris di mode chunk) tidak bergantung ada/tidaknya NaN di input
+    df = df.astype({kolom: tipe for kolom, tipe in TIPE_KOLOM_NUMERIK.items() if kolom in df.columns})
+    usia = current_year - df['Tahun']
+    mask = (df['Harga'] >= HARGA_MIN) & (df['Harga'] <= HARGA_MAKS) & (usia >= 0)
+    df = df[mask].copy()
+    df['UsiaMobil'] = usia[mask]
+    return df
+
+
+def bersihkan_data(df, current_year=CURRENT_YEAR):
+    """dropna, filter harga anomali, fitur UsiaMobil (usia negatif dibuang), hapus duplikat."""
+    jumlah_awal = len(df)
+    df = _bersihkan_baris(df, current_year)
+    if len(df) == 0:
+        raise ValueError(f"Tidak ada data tersisa dari {jumlah_awal} baris setelah dropna, filter Harga, dan filter UsiaMobil negatif.")
+    print(f"[INFO] Fitur 'UsiaMobil' dibuat. Rentang: {df['UsiaMobil'].min()} - {df['UsiaMobil'].max()} tahun.")
+
+    jumlah_sebelum = len(df)
+    df = df.drop_duplicates()
+    print(f"[INFO] Menghapus {jumlah_sebelum - len(df)} baris duplikat. Sisa {len(df)} baris.")
+    return df
+
+
+def gabung_inflasi(df, tabel_inflasi):
+    """Menambahkan kolom Inflasi (persen) tahun pembuatan: lookup array per Tahun, setara merge kiri pada Tahun."""
+    df['Inflasi'] = tabel_inflasi.lookup(df['Tahun'].to_numpy())
+    return df
+
+
+# --- 4. FITUR DEPRESIASI EKSPLISIT (DENGAN INFLASI DARI KOLOM 'Inflasi') ---
+def tambah_fitur_depresiasi(df):
+    """Menambahkan KOLOM_DEPRESIASI langsung ke df (tanpa salinan); Inflasi dikonversi dari persen ke desimal.
+
+    Perhitungan vektor ada di depresiasi.fitur_depresiasi_riil (dipakai bersama app.py dan skor_batch.py).
+    """
+    if not {'Harga', 'UsiaMobil', 'Tahun', 'Inflasi'}.issubset(df.columns):
+        print("[WARNING] Kolom krusial ('Harga', 'UsiaMobil', 'Tahun', atau 'Inflasi') tidak lengkap. "
+              "Fitur depresiasi dengan inflasi tidak bisa dibuat.")
+        return df
 
-# Kolom-kolom fitur depresiasi yang akan divisualisasikan
-dep_feature_cols_to_plot = [
-    'EstimasiHargaAwal_NilaiSaatIni',
-    'DepresiasiAbsolut_PerThn_NilaiSaatIni',
-    'DepresiasiRiilNormal_PersenPerThn'
-]
-existing_dep_features_to_plot = [col for col in dep_feature_cols_to_plot if col in df.columns]
-
-if not existing_dep_features_to_plot:
-    print("[INFO] Tidak ada fitur depresiasi (disesuaikan inflasi) untuk divisualisasikan.")
-else:
-    for feature_to_plot in existing_dep_features_to_plot:
-        plt.figure(figsize=(10, 6))
-        # Hilangkan outlier ekstrim untuk plot distribusi agar lebih informatif
+    # Konversi nilai inflasi ke desimal
+    df['Inflasi'] = df['Inflasi'] / 100
+    usia = df['UsiaMobil'].to_numpy(dtype=np.float64)
+    fitur = fitur_depresiasi_riil(df['Harga'].to_numpy(dtype=np.float64), usia, df['Inflasi'].to_numpy(dtype=np.float64),
+                                  RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI, MAX_RASIO_ESTAWAL_VS_HARGADEFLASI)
+    for col, nilai in fitur.items():
+        df[col] = nilai
+    print(f"[INFO] Fitur depresiasi riil (disesuaikan inflasi): {int((usia > 0).sum())} mobil usia > 0, "
+          f"{int((usia == 0).sum())} mobil usia 0 (depresiasi 0).")
+    return df
+
+
+def tampilkan_ringkasan(df):
+    """Contoh data dan statistik deskriptif fitur depresiasi (mode --verbose)."""
+    kolom_tampil = ['Merek', 'Model_Detail', 'Harga', 'Tahun', 'Kilometer', 'UsiaMobil', 'Lokasi'] + KOLOM_PLOT_DEPRESIASI
+    kolom_tampil = [col for col in kolom_tampil if col in df.columns]
+    with pd.option_context('display.max_columns', None, 'display.width', 1200, 'display.colheader_justify', 'left'):
+        print("\n--- [INFO] Contoh Data dengan Fitur Depresiasi (Disesuaikan Inflasi) ---")
+        print(df[kolom_tampil].head(10).to_string(index=True))
+        df.info()
+        kolom_statistik = [col for col in KOLOM_PLOT_DEPRESIASI if col in df.columns]
+        if kolom_statistik:
+            print("\n--- [INFO] Statistik Deskriptif untuk Fitur Depresiasi (Disesuaikan Inflasi) ---")
+            print(df[kolom_statistik].describe())
+
+
+# --- 5. LAPORAN VISUALISASI (OPSIONAL) ---
+def buat_laporan(df, laporan_dir):
+    """Menyimpan plot distribusi & depresiasi sebagai PNG di laporan_dir (backend Agg, tanpa jendela).
+
+    Mengembalikan daftar path file yang dibuat.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    os.makedirs(laporan_dir, exist_ok=True)
+    plt.style.use('seaborn-v0_8-whitegrid')
+    files = []
+
+    def simpan(nama):
+        path = os.path.join(laporan_dir, f"{len(files) + 1:02d}_{nama}.png")
+        plt.tight_layout()
+        plt.savefig(path, dpi=100)
+        plt.close()
+        files.append(path)
+
+    # a. Distribusi Harga
+    plt.figure(figsize=(10, 6)); sns.histplot(df['Harga'], kde=True, bins=50, color='skyblue')
+    plt.title('Distribusi Harga Mobil Final', fontsize=15); plt.xlabel('Harga (Rp)', fontsize=12); plt.ylabel('Frekuensi', fontsize=12)
+    plt.ticklabel_format(style='plain', axis='x'); simpan('distribusi_harga')
+
+    # b. Distribusi UsiaMobil
+    plt.figure(figsize=(10, 6)); sns.histplot(df['UsiaMobil'], kde=False, bins=min(30, df['UsiaMobil'].nunique()), color='salmon')
+    plt.title('Distribusi Usia Mobil Final', fontsize=15); plt.xlabel('Usia Mobil (Tahun)', fontsize=12); plt.ylabel('Frekuensi', fontsize=12)
+    simpan('distribusi_usia')
+
+    # c. Pola Depresiasi (Harga vs UsiaMobil) dengan garis tren
+    plt.figure(figsize=(12, 7)); sns.scatterplot(data=df, x='UsiaMobil', y='Harga', alpha=0.4, color='green', edgecolor=None, s=30)
+    sns.regplot(x='UsiaMobil', y='Harga', data=df, scatter=False, color='red', ci=None)
+    plt.title('Harga vs. Usia Mobil (Pola Depresiasi)', fontsize=15); plt.xlabel('Usia Mobil (Tahun)', fontsize=12); plt.ylabel('Harga (Rp)', fontsize=12)
+    plt.ticklabel_format(style='plain', axis='y'); plt.grid(True, linestyle='--', alpha=0.7); simpan('harga_vs_usia')
+
+    # d. Boxplot Harga Berdasarkan Merek
+    plt.figure(figsize=(12, 6)); sns.boxplot(x='Merek', y='Harga', hue='Merek', data=df, palette='Set3', legend=False)
+    plt.title("Distribusi Harga Berdasarkan Merek"); plt.xticks(rotation=45); plt.xlabel("Merek"); plt.ylabel("Harga (Rp)")
+    simpan('harga_per_merek')
+
+    # e. Fitur depresiasi eksplisit: distribusi dan terhadap UsiaMobil
+    for feature_to_plot in [col for col in KOLOM_PLOT_DEPRESIASI if col in df.columns]:
         data_to_plot = df[feature_to_plot].dropna()
-        if pd.api.types.is_numeric_dtype(data_to_plot) and len(data_to_plot) > 1 :
-            sns.histplot(data_to_plot, kde=True, bins=50)
-
-            plt.title(f'Distribusi {feature_to_plot}', fontsize=15)
-            plt.xlabel(f'{feature_to_plot}', fontsize=12)
-            plt.ylabel('Frekuensi', fontsize=12)
-            if 'Harga' in feature_to_plot or 'Absolut' in feature_to_plot : plt.ticklabel_format(style='plain', axis='x')
-            plt.tight_layout()
-            plt.show()
-
-            # Scatter plot terhadap UsiaMobil
-            if 'UsiaMobil' in df.columns:
-                plt.figure(figsize=(12, 7))
-                sns.scatterplot(data=df, x='UsiaMobil', y=feature_to_plot, alpha=0.4, edgecolor=None, s=30)
-                plt.title(f'{feature_to_plot} vs. Usia Mobil', fontsize=15)
-                plt.xlabel('Usia Mobil (Tahun)', fontsize=12)
-                plt.ylabel(f'{feature_to_plot}', fontsize=12)
-                if 'Harga' in feature_to_plot or 'Absolut' in feature_to_plot : plt.ticklabel_format(style='plain', axis='y')
-                plt.grid(True, linestyle='--', alpha=0.7)
-                plt.tight_layout()
-                plt.show()
-        else:
+        if not (pd.api.types.is_numeric_dtype(data_to_plot) and len(data_to_plot) > 1):
             print(f"[INFO] Kolom '{feature_to_plot}' tidak numerik atau kosong, dilewati untuk plot distribusi.")
+            continue
+        format_plain = 'Harga' in feature_to_plot or 'Absolut' in feature_to_plot
+        plt.figure(figsize=(10, 6)); sns.histplot(data_to_plot, kde=True, bins=50)
+        plt.title(f'Distribusi {feature_to_plot}', fontsize=15); plt.xlabel(feature_to_plot, fontsize=12); plt.ylabel('Frekuensi', fontsize=12)
+        if format_plain: plt.ticklabel_format(style='plain', axis='x')
+        simpan(f'distribusi_{feature_to_plot}')
+
+        plt.figure(figsize=(12, 7)); sns.scatterplot(data=df, x='UsiaMobil', y=feature_to_plot, alpha=0.4, edgecolor=None, s=30)
+        plt.title(f'{feature_to_plot} vs. Usia Mobil', fontsize=15); plt.xlabel('Usia Mobil (Tahun)', fontsize=12); plt.ylabel(feature_to_plot, fontsize=12)
+        if format_plain: plt.ticklabel_format(style='plain', axis='y')
+        plt.grid(True, linestyle='--', alpha=0.7); simpan(f'{feature_to_plot}_vs_usia')
+
+    print(f"[INFO] {len(files)} plot laporan disimpan di {laporan_dir}")
+    return files
+
+
+# --- 6. PIPELINE ---
+def jalankan_pipeline(input_csv=INPUT_CSV_FILE, inflasi_xlsx=INFLASI_XLSX_FILE, output_csv=OUTPUT_CSV_FILE,
+                      current_year=CURRENT_YEAR, laporan_dir=None, verbose=False):
+    """Muat -> bersihkan -> gabung inflasi -> fitur depresiasi -> simpan CSV (+ laporan PNG jika laporan_dir).
+
+    output_csv=None: tidak menyimpan; format mengikuti ekstensi (.csv/.parquet/.feather). Mengembalikan DataFrame hasil.
+    """
+    df = muat_data(input_csv)
+    df = bersihkan_data(df, current_year)
+    df = tambah_fitur_depresiasi(gabung_inflasi(df, muat_inflasi(inflasi_xlsx)))
+    if verbose:
+        tampilkan_ringkasan(df)
+    if output_csv:
+        tulis_tabel(df, output_csv)
+        print(f"[INFO] {len(df)} baris dengan fitur depresiasi disimpan ke {output_csv}")
+        simpan_katalog_dropdown(kumpulkan_katalog(df), output_csv)
+        simpan_indeks_pembanding(kumpulkan_indeks(df), output_csv)
+    if laporan_dir:
+        buat_laporan(df, laporan_dir)
+    return df
+
+
+def simpan_katalog_dropdown(kumpulan, output_csv):
+    """Katalog Merek -> Model_Detail dan Lokasi untuk dropdown app.py, di samping output (katalog_mobil.py)."""
+    katalog = simpan_katalog(kumpulan, path_katalog(output_csv))
+    print(f"[INFO] Katalog dropdown ({len(katalog['model_per_merek'])} merek, {len(katalog['lokasi'])} lokasi) "
+          f"disimpan ke {path_katalog(output_csv)}")
+
+
+def simpan_indeks_pembanding(kumpulan, output_csv):
+    """Indeks listing pembanding (memory-mapped) untuk app.py, di samping output (indeks_pembanding.py)."""
+    manifest = simpan_indeks(kumpulan, path_indeks(output_csv))
+    print(f"[INFO] Indeks pembanding ({manifest['jumlah_baris']} listing, "
+          f"{sum(len(v) for v in manifest['partisi'].values())} partisi) disimpan ke {path_indeks(output_csv)}")
+
+
+def _hash_baris(df):
+    """Hash uint64 per baris untuk hapus duplikat lintas chunk/partisi."""
+    # Kolom numerik di-hash sebagai float agar 5 dan 5.0 (tipe bisa beda antar chunk) dianggap sama
+    numerik = {kolom: 'float64' for kolom in df.select_dtypes('number').columns}
+    return pd.util.hash_pandas_object(df.astype(numerik), index=False).to_numpy()
+
+
+def _buang_duplikat_stream(df, hash_terlihat):
+    """Hapus baris yang sudah muncul di chunk sebelumnya atau di chunk ini (kemunculan pertama dipertahankan).
+
+    hash_terlihat: array uint64 terurut berisi hash baris yang sudah ditulis (8 byte per baris unik).
+    """
+    hash_baris = _hash_baris(df)
+    posisi = np.minimum(np.searchsorted(hash_terlihat, hash_baris), max(len(hash_terlihat) - 1, 0))
+    sudah_ada = (hash_terlihat[posisi] == hash_baris) if len(hash_terlihat) else np.zeros(len(df), dtype=bool)
+    baru = ~sudah_ada & ~pd.Series(hash_baris).duplicated().to_numpy()
+    return df[baru], np.union1d(hash_terlihat, hash_baris[baru])
+
+
+def jalankan_pipeline_chunked(input_csv=INPUT_CSV_FILE, inflasi_xlsx=INFLASI_XLSX_FILE, output_csv=OUTPUT_CSV_FILE,
+                              current_year=CURRENT_YEAR, ukuran_chunk=UKURAN_CHUNK):
+    """Seperti jalankan_pipeline, tetapi input CSV dibaca per ukuran_chunk baris dan hasil di-append ke output_csv.
+
+    Memori puncak sebanding dengan ukuran chunk (+ 8 byte hash per baris unik untuk hapus duplikat),
+    bukan dengan ukuran data. Hanya CSV (input dan output). Mengembalikan jumlah baris yang ditulis.
+    """
+    if format_dari_path(input_csv) != 'csv' or format_dari_path(output_csv) != 'csv':
+        raise ValueError("Mode chunk hanya mendukung input dan output CSV.")
+    tabel_inflasi = muat_inflasi(inflasi_xlsx)
+    hash_terlihat = np.empty(0, dtype=np.uint64)
+    katalog, indeks = None, None
+    jumlah_input, jumlah_output = 0, 0
+    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
+        for nomor, chunk in enumerate(pd.read_csv(input_csv, chunksize=ukuran_chunk), 1):
+            jumlah_input += len(chunk)
+            chunk = _bersihkan_baris(chunk, current_year)
+            chunk, hash_terlihat = _buang_duplikat_stream(chunk, hash_terlihat)
+            if len(chunk) == 0:
+                continue
+            chunk = tambah_fitur_depresiasi(gabung_inflasi(chunk, tabel_inflasi))
+            chunk.to_csv(f, index=False, header=(jumlah_output == 0))
+            katalog = kumpulkan_katalog(chunk, katalog)
+            indeks = kumpulkan_indeks(chunk, indeks)
+            jumlah_output += len(chunk)
+            print(f"[INFO] Chunk {nomor}: {jumlah_input} baris input diproses, {jumlah_output} baris ditulis.")
+    if jumlah_output == 0:
+        raise ValueError(f"Tidak ada data tersisa dari {jumlah_input} baris setelah pembersihan.")
+    print(f"[INFO] {jumlah_output} baris dengan fitur depresiasi disimpan ke {output_csv}")
+    simpan_katalog_dropdown(katalog, output_csv)
+    simpan_indeks_pembanding(indeks, output_csv)
+    return jumlah_output
+
+
+def _baca_partisi_mentah(input_csv, ukuran_partisi):
+    """Generator (header, blok bytes) per ukuran_partisi baris CSV, tanpa parsing.
+
+    Batas partisi hanya bergantung pada isi sebelumnya, jadi untuk CSV append-only (mobil_scraper.py)
+    partisi lama tetap byte-identik dan hanya partisi terakhir yang berubah. Blok tidak dipotong
+    di tengah field ber-quote yang memuat newline.
+    """
+    with open(input_csv, 'rb') as f:
+        header = f.readline()
+        while True:
+            baris = list(itertools.islice(f, ukuran_partisi))
+            if not baris:
+                return
+            blok = b''.join(baris)
+            jumlah_quote = blok.count(b'"')
+            while jumlah_quote % 2:
+                lanjutan = f.readline()
+                if not lanjutan:
+                    break
+                blok += lanjutan
+                jumlah_quote += lanjutan.count(b'"')
+            yield header, blok
+
+
+def jalankan_pipeline_inkremental(input_csv=INPUT_CSV_FILE, inflasi_xlsx=INFLASI_XLSX_FILE, output_csv=OUTPUT_CSV_FILE,
+                                  current_year=CURRENT_YEAR, laporan_dir=None, verbose=False,
+                                  cache_dir=CACHE_TAHAP_DIR, ukuran_partisi=UKURAN_PARTISI):
+    """Seperti jalankan_pipeline, tetapi tahap per partisi input di-cache (cache_tahap.py) dan dipakai ulang.
+
+    Tahap 'bersih' (dropna, tipe, filter, UsiaMobil) dikunci hash partisi + CURRENT_YEAR/batas harga;
+    'hash_baris' (untuk hapus duplikat) ikut kunci yang sama; 'fitur' (inflasi + depresiasi) dikunci
+    kunci 'bersih' + isi tabel inflasi + RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI/MAX_RASIO; 'csv' (teks
+    output) dikunci kunci 'fitur' + mask duplikat partisi. Hanya partisi baru/berubah yang di-parse dan
+    dihitung; hapus duplikat global dijalankan atas hash yang tersimpan. Hasil sama dengan jalankan_pipeline.
+    Input harus CSV. Mengembalikan DataFrame hasil.
+    """
+    if format_dari_path(input_csv) != 'csv':
+        raise ValueError("Mode inkremental hanya mendukung input CSV.")
+    tabel_inflasi = muat_inflasi(inflasi_xlsx)
+    cache = CacheTahap(cache_dir, pemakai=('inkremental', os.path.abspath(input_csv)))  # Pruning hanya entri input ini
+    parameter_bersih = (VERSI_TAHAP, current_year, HARGA_MIN, HARGA_MAKS, TIPE_KOLOM_NUMERIK)
+    parameter_fitur = (VERSI_TAHAP, tabel_inflasi.hash_isi(), RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI,
+                       MAX_RASIO_ESTAWAL_VS_HARGADEFLASI)
+
+    daftar_kunci_fitur, daftar_fitur, daftar_hash = [], [], []
+    for header, blok in _baca_partisi_mentah(input_csv, ukuran_partisi):
+        kunci_bersih = kunci_konten('bersih', header, blok, *parameter_bersih)
+        kunci_fitur = kunci_konten('fitur', kunci_bersih, *parameter_fitur)
+        bersih = []  # Dimuat/dihitung hanya jika tahap setelahnya tidak ada di cache
+
+        def ambil_bersih():
+            if not bersih:
+                bersih.append(cache.ambil_atau_hitung(
+                    'bersih', kunci_bersih, lambda: _bersihkan_baris(pd.read_csv(io.BytesIO(header + blok)), current_year)))
+            return bersih[0]
+
+        cache.tandai_terpakai('bersih', kunci_bersih)
+        daftar_hash.append(cache.ambil_atau_hitung('hash_baris', kunci_bersih, lambda: _hash_baris(ambil_bersih())))
+        daftar_fitur.append(cache.ambil_atau_hitung(
+            'fitur', kunci_fitur, lambda: tambah_fitur_depresiasi(gabung_inflasi(ambil_bersih().copy(), tabel_inflasi))))
+        daftar_kunci_fitur.append(kunci_fitur)
+
+    jumlah_bersih = sum(len(h) for h in daftar_hash)
+    if jumlah_bersih == 0:
+        raise ValueError(f"Tidak ada data tersisa dari {input_csv} setelah dropna, filter Harga, dan filter UsiaMobil negatif.")
+    # Hapus duplikat global (kemunculan pertama dipertahankan) tanpa memuat ulang tahap 'bersih'.
+    # Mask partisi lama hanya bergantung pada partisi sebelumnya, jadi tetap sama saat data baru di-append.
+    unik = ~pd.Series(np.concatenate(daftar_hash)).duplicated().to_numpy()
+    batas = np.cumsum([0] + [len(h) for h in daftar_hash])
+    daftar_mask = [unik[awal:akhir] for awal, akhir in zip(batas[:-1], batas[1:])]
+    df = pd.concat([fitur[mask] for fitur, mask in zip(daftar_fitur, daftar_mask)], ignore_index=True)
+
+    if output_csv and format_dari_path(output_csv) == 'csv':
+        # Teks CSV per partisi juga di-cache: memformat float ke teks adalah bagian termahal untuk data besar
+        with open(output_csv, 'w', encoding='utf-8', newline='') as f:
+            f.write(df.head(0).to_csv(index=False))
+            for kunci_fitur, fitur, mask in zip(daftar_kunci_fitur, daftar_fitur, daftar_mask):
+                f.write(cache.ambil_atau_hitung('csv', kunci_konten('csv', kunci_fitur, mask.tobytes()),
+                                                lambda: fitur[mask].to_csv(index=False, header=False)))
+    elif output_csv:
+        tulis_tabel(df, output_csv)
+    print(f"[INFO] {len(daftar_fitur)} partisi ({cache.ringkasan()}). "
+          f"Menghapus {jumlah_bersih - len(df)} baris duplikat. Sisa {len(df)} baris.")
+    print(f"[INFO] {cache.hapus_tidak_terpakai()} entri cache tahap lama dihapus dari {cache_dir}")
+    if output_csv:
+        print(f"[INFO] {len(df)} baris dengan fitur depresiasi disimpan ke {output_csv}")
+        simpan_katalog_dropdown(kumpulkan_katalog(df), output_csv)
+        simpan_indeks_pembanding(kumpulkan_indeks(df), output_csv)
+
+    if verbose:
+        tampilkan_ringkasan(df)
+    if laporan_dir:
+        buat_laporan(df, laporan_dir)
+    return df
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pembersihan data scraping mobil dan pembuatan fitur depresiasi (headless).")
+    parser.add_argument('--input', default=INPUT_CSV_FILE, help="CSV hasil mobil_scraper.py.")
+    parser.add_argument('--inflasi', default=INFLASI_XLSX_FILE, help="Excel inflasi tahunan (kolom Tahun, Inflasi); di-cache sebagai .cache.npz.")
+    parser.add_argument('--output', default=OUTPUT_CSV_FILE, help="Ekstensi .parquet/.feather untuk format kolumnar.")
+    parser.add_argument('--tahun-sekarang', type=int, default=CURRENT_YEAR, help="Tahun acuan UsiaMobil.")
+    parser.add_argument('--laporan', default=None, metavar='DIR',
+                        help="Simpan plot distribusi & depresiasi (PNG) ke DIR.")
+    parser.add_argument('--verbose', action='store_true', help="Tampilkan contoh data dan statistik deskriptif.")
+    parser.add_argument('--chunk', type=int, nargs='?', const=UKURAN_CHUNK, default=None, metavar='BARIS',
+                        help=f"Streaming per BARIS baris input (default {UKURAN_CHUNK}) ke output CSV; memori kecil untuk crawl besar.")
+    parser.add_argument('--inkremental', nargs='?', const=CACHE_TAHAP_DIR, default=None, metavar='CACHE_DIR',
+                        help=f"Cache hasil tahap per partisi input di CACHE_DIR (default {CACHE_TAHAP_DIR}); "
+                             "hanya partisi baru yang dihitung ulang.")
+    parser.add_argument('--partisi', type=int, default=UKURAN_PARTISI, metavar='BARIS',
+                        help="Baris input per partisi untuk --inkremental. Mengubahnya membuat cache lama tidak terpakai.")
+    args = parser.parse_args()
+    if args.chunk and (args.laporan or args.verbose):
+        parser.error("--chunk tidak bisa digabung dengan --laporan/--verbose (data tidak dimuat utuh).")
+    if args.chunk and args.inkremental:
+        parser.error("--chunk tidak bisa digabung dengan --inkremental.")
+
+    print("--- [INFO] Memulai Skrip Pengolahan Data Mobil ---")
+    try:
+        if args.chunk:
+            jalankan_pipeline_chunked(args.input, args.inflasi, args.output, args.tahun_sekarang, args.chunk)
+        elif args.inkremental:
+            jalankan_pipeline_inkremental(args.input, args.inflasi, args.output, args.tahun_sekarang, args.laporan,
+                                          args.verbose, args.inkremental, args.partisi)
+        else:
+            jalankan_pipeline(args.input, args.inflasi, args.output, args.tahun_sekarang, args.laporan, args.verbose)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+
 
-print("--- [INFO] Selesai Visualisasi Fitur Depresiasi (Disesuaikan Inflasi) ---")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# depresiasi.py
+
+from datetime import datetime
+
+import numpy as np
+
+# --- KONFIGURASI DEPRESIASI ---
+CURRENT_YEAR = datetime.now().year
+RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI = 0.10
+MAX_RASIO_ESTAWAL_VS_HARGADEFLASI = 7
+
+KOLOM_DEPRESIASI = [
+    'HargaSekarang_DeflasiKeThnBuat',
+    'EstimasiHargaAwal_PadaThnBuat',
+    'EstimasiHargaAwal_NilaiSaatIni',
+    'DepresiasiRiilAbsolut_PerThn_PadaThnBuat',
+    'DepresiasiRiilNormal_PersenPerThn',
+    'DepresiasiAbsolut_PerThn_NilaiSaatIni'
+]
+KOLOM_DEPRESIASI_NOMINAL = [
+    'DepresiasiNominal_Total',
+    'DepresiasiNominal_Persen',
+    'DepresiasiNominal_PerThn',
+    'DepresiasiNominal_PersenPerThn'
+]
+KOLOM_DEPRESIASI_RIIL = [
+    'FaktorInflasi_Kumulatif',
+    'HargaBeli_NilaiKini',
+    'DepresiasiRiil_Total',
+    'DepresiasiRiil_Persen',
+    'DepresiasiRiil_PerThn',
+    'DepresiasiRiil_PersenPerThn'
+]
+
+
+# --- 1. DEPRESIASI DARI HARGA BELI (ANALISIS app.py, skor_batch.py) ---
+def hitung_depresiasi(harga_prediksi, harga_beli, tahun, tabel_inflasi=None, current_year=CURRENT_YEAR):
+    """Depresiasi nominal (dan riil jika tabel_inflasi ada) dari harga beli baru ke harga sekarang, per elemen array.
+
+    Nominal: usia 0 -> total dibatasi >= 0 dan per tahun = total; usia > 0 -> total (boleh negatif jika harga
+    sekarang >= harga beli) dibagi usia. Riil: harga beli dinaikkan dengan inflasi kumulatif tahun..current_year,
+    hanya untuk usia > 0. Harga beli NaN/<= 0 atau usia negatif -> NaN.
+    Mengembalikan dict KOLOM_DEPRESIASI_NOMINAL (+ KOLOM_DEPRESIASI_RIIL) -> array.
+    """
+    harga_prediksi = np.asarray(harga_prediksi, dtype=np.float64)
+    harga_beli = np.asarray(harga_beli, dtype=np.float64)
+    tahun = np.asarray(tahun, dtype=np.float64)
+    usia = current_year - tahun
+    ada_beli = harga_beli > 0
+    baru, bekas = ada_beli & (usia == 0), ada_beli & (usia > 0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total = np.where(baru, np.maximum(0, harga_beli - harga_prediksi), harga_beli - harga_prediksi)
+        persen = total / harga_beli * 100
+        hasil = dict(zip(KOLOM_DEPRESIASI_NOMINAL, (
+            np.where(baru | bekas, total, np.nan),
+            np.where(baru | bekas, persen, np.nan),
+            np.where(bekas, total / usia, np.where(baru, total, np.nan)),
+            np.where(bekas, persen / usia, np.where(baru, persen, np.nan)),
+        )))
+        if tabel_inflasi is not None:
+            faktor = tabel_inflasi.faktor_kumulatif(np.where(bekas, tahun, current_year).astype(np.int64), current_year)
+            harga_beli_kini = harga_beli * faktor
+            total_riil = harga_beli_kini - harga_prediksi
+            persen_riil = total_riil / harga_beli_kini * 100
+            hasil.update(zip(KOLOM_DEPRESIASI_RIIL, (
+                np.where(bekas, faktor, np.nan),
+                np.where(bekas, harga_beli_kini, np.nan),
+                np.where(bekas, total_riil, np.nan),
+                np.where(bekas, persen_riil, np.nan),
+                np.where(bekas, total_riil / usia, np.nan),
+                np.where(bekas, persen_riil / usia, np.nan),
+            )))
+    return hasil
+
+
+# --- 2. FITUR DEPRESIASI RIIL DATASET (data_prepro.py) ---
+def fitur_depresiasi_riil(harga, usia, inflasi, rata_rata_depresiasi=RATA_RATA_DEPRESIASI_RIIL_TAHUNAN_ASUMSI,
+                          max_rasio=MAX_RASIO_ESTAWAL_VS_HARGADEFLASI):
+    """Fitur depresiasi riil dari harga listing tanpa harga beli: estimasi harga awal dengan asumsi depresiasi
+    riil tahunan, dideflasi dengan inflasi (desimal) tahun pembuatan.
+
+    Mobil usia > 0 dan usia == 0 dipilih per elemen dengan np.where; usia lain dan hasil NaN (mis. inflasi
+    tahun itu tidak ada) bernilai 0. Mengembalikan dict KOLOM_DEPRESIASI -> array.
+    """
+    harga = np.asarray(harga, dtype=np.float64)
+    usia = np.asarray(usia, dtype=np.float64)
+    inflasi = np.asarray(inflasi, dtype=np.float64)
+    bekas, baru = usia > 0, usia == 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 1. Harga sekarang dideflasi ke nilai uang tahun pembuatan (mobil usia 0: dibagi Inflasi, seperti sebelumnya)
+        harga_deflasi = np.where(bekas, harga / (1 + inflasi), harga / inflasi)
+
+        # 2. Estimasi harga awal pada tahun pembuatan, dibatasi [harga_deflasi, harga_deflasi * max_rasio]
+        faktor_dep_riil_kumulatif = np.maximum((1 - rata_rata_depresiasi) ** usia, 1e-9)
+        estimasi_awal = np.minimum(harga_deflasi / faktor_dep_riil_kumulatif, harga_deflasi * max_rasio)
+        estimasi_awal = np.where(bekas, np.maximum(estimasi_awal, harga_deflasi), harga_deflasi)
+
+        # 3. Estimasi harga awal dalam nilai uang SAAT INI
+        estimasi_awal_kini = np.where(bekas, estimasi_awal * (1 + inflasi), harga_deflasi * inflasi)
+
+        # 4-6. Depresiasi riil absolut & persen per tahun, depresiasi absolut per tahun nilai kini (0 untuk usia 0)
+        dep_riil_absolut = np.where(bekas, np.maximum(0, (estimasi_awal - harga_deflasi) / usia), 0.0)
+        dep_riil_persen = np.where(bekas & (estimasi_awal > 1e-9),
+                                   np.clip((dep_riil_absolut / estimasi_awal) * 100, 0, 100), 0.0)
+        dep_absolut_kini = np.where(bekas, np.maximum(0, (estimasi_awal_kini - harga) / usia), 0.0)
+
+    valid = bekas | baru
+    return {kolom: np.where(valid & ~np.isnan(nilai), nilai, 0.0)
+            for kolom, nilai in zip(KOLOM_DEPRESIASI, (harga_deflasi, estimasi_awal, estimasi_awal_kini,
+                                                       dep_riil_absolut, dep_riil_persen, dep_absolut_kini))}
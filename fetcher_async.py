@@ -0,0 +1,224 @@
+# fetcher_async.py
+
+import asyncio
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- KONFIGURASI FETCHER ---
+CONCURRENCY = 8                 # Maksimal request yang berjalan bersamaan
+RATE_PER_DETIK = 2.0            # Token per detik per host (rata-rata request per detik)
+BURST = 2                       # Kapasitas bucket: jumlah request yang boleh langsung dikirim berurutan
+MAX_RETRY = 4
+BACKOFF_DASAR_DETIK = 1.0       # Backoff: BACKOFF_DASAR * 2^percobaan (+ jitter)
+BACKOFF_MAKS_DETIK = 60.0
+TIMEOUT_DETIK = 20
+STATUS_RETRY = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Rate limiter token bucket untuk asyncio: rata-rata `rate` request/detik dengan burst `kapasitas`."""
+
+    def __init__(self, rate, kapasitas=BURST):
+        self.rate = rate
+        self.kapasitas = max(1, kapasitas)
+        self.token = float(self.kapasitas)
+        self.waktu_isi = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def ambil(self):
+        async with self.lock:
+            while True:
+                sekarang = time.monotonic()
+                self.token = min(self.kapasitas, self.token + (sekarang - self.waktu_isi) * self.rate)
+                self.waktu_isi = sekarang
+                if self.token >= 1:
+                    self.token -= 1
+                    return
+                await asyncio.sleep((1 - self.token) / self.rate)
+
+    def tunda(self, detik):
+        """Menahan bucket (mis. karena Retry-After dari server) sehingga request berikutnya ikut menunggu."""
+        self.token = min(self.token, 0.0) - detik * self.rate
+
+
+class AsyncFetcher:
+    """Fetcher halaman HTML berbasis asyncio di atas requests.Session (connection pool dipakai ulang).
+
+    Request blocking dijalankan di thread pool sebesar `concurrency`, dibatasi semaphore dan
+    token bucket per host, dengan retry exponential backoff untuk error jaringan, 429, dan 5xx.
+    """
+
+    def __init__(self, headers, concurrency=CONCURRENCY, rate_per_detik=RATE_PER_DETIK, burst=BURST,
+                 max_retry=MAX_RETRY, backoff_dasar=BACKOFF_DASAR_DETIK, timeout=TIMEOUT_DETIK):
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor_io = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch")
+        self.concurrency = concurrency
+        self.rate_per_detik = rate_per_detik
+        self.burst = burst
+        self.max_retry = max_retry
+        self.backoff_dasar = backoff_dasar
+        self.timeout = timeout
+        self.limiter_per_host = {}
+        self.semaphore = None
+        self.statistik = {'request': 0, 'sukses': 0, 'retry': 0, 'gagal': 0}
+
+    def _limiter(self, url):
+        host = urlparse(url).netloc
+        if host not in self.limiter_per_host:
+            self.limiter_per_host[host] = TokenBucket(self.rate_per_detik, self.burst)
+        return self.limiter_per_host[host]
+
+    def _backoff(self, percobaan, retry_after=None):
+        if retry_after is not None:
+            return min(BACKOFF_MAKS_DETIK, retry_after)
+        return min(BACKOFF_MAKS_DETIK, self.backoff_dasar * (2 ** percobaan)) * random.uniform(0.8, 1.2)
+
+    async def fetch(self, url):
+        """Mengambil HTML dari url. Mengembalikan None jika 4xx (selain 429) atau retry habis."""
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+        limiter = self._limiter(url)
+        for percobaan in range(self.max_retry + 1):
+            await limiter.ambil()
+            retry_after = None
+            async with self.semaphore:
+                self.statistik['request'] += 1
+                try:
+                    response = await loop.run_in_executor(
+                        self.executor_io, lambda: self.session.get(url, timeout=self.timeout))
+                except requests.exceptions.RequestException as e:
+                    logging.warning(f"Error jaringan ({type(e).__name__}) percobaan {percobaan + 1} - URL: {url}")
+                else:
+                    if response.status_code < 400:
+                        self.statistik['sukses'] += 1
+                        return response.text
+                    if response.status_code not in STATUS_RETRY:
+                        logging.error(f"HTTP error {response.status_code} (tidak di-retry) - URL: {url}")
+                        self.statistik['gagal'] += 1
+                        return None
+                    header_retry = response.headers.get('Retry-After', '')
+                    retry_after = float(header_retry) if header_retry.replace('.', '', 1).isdigit() else None
+                    logging.warning(f"HTTP {response.status_code} percobaan {percobaan + 1} - URL: {url}")
+            if percobaan == self.max_retry:
+                break
+            jeda = self._backoff(percobaan, retry_after)
+            if retry_after is not None:
+                limiter.tunda(jeda)
+            self.statistik['retry'] += 1
+            await asyncio.sleep(jeda)
+        logging.error(f"Gagal mengambil {url} setelah {self.max_retry + 1} percobaan.")
+        self.statistik['gagal'] += 1
+        return None
+
+    def tutup(self):
+        self.executor_io.shutdown(wait=False)
+        self.session.close()
+
+
+async def crawl_halaman(fetcher, buat_url, max_halaman, parse, parse_workers=2, daftar_halaman=None, on_halaman=None):
+    """Mengambil halaman 1..max_halaman secara konkuren dan mem-parse-nya sambil menunggu jaringan.
+
+    buat_url(nomor_halaman) -> url; parse(html, url) -> list record. Halaman pertama (>1) yang
+    kosong atau gagal menjadi batas akhir pagination, sama seperti scraper berurutan.
+    daftar_halaman: nomor halaman yang diambil (default 1..max_halaman, mis. sisa dari checkpoint).
+    on_halaman(nomor, records): jika diberikan, hasil tiap halaman (termasuk halaman kosong, atau
+    None jika gagal diambil) diserahkan ke callback dan tidak ditampung. Callback boleh mengembalikan
+    nomor halaman akhir (eksklusif) untuk menghentikan pagination lebih awal; jika tidak, mengembalikan {nomor_halaman: list record}
+    untuk halaman sebelum batas akhir.
+    """
+    loop = asyncio.get_running_loop()
+    executor_parse = ThreadPoolExecutor(max_workers=parse_workers, thread_name_prefix="parse")
+    hasil = {}
+    batas = {'halaman_akhir': max_halaman + 1}
+    halaman_berikut = iter(daftar_halaman if daftar_halaman is not None else range(1, max_halaman + 1))
+
+    async def worker():
+        for nomor in halaman_berikut:
+            if nomor >= batas['halaman_akhir']:
+                return
+            url = buat_url(nomor)
+            html = await fetcher.fetch(url)
+            data = await loop.run_in_executor(executor_parse, parse, html, url) if html else None
+            if nomor >= batas['halaman_akhir']:
+                continue  # Diambil sebelum batas akhir pagination diketahui
+            if on_halaman is not None:
+                halaman_akhir = on_halaman(nomor, data)
+                if halaman_akhir is not None:
+                    batas['halaman_akhir'] = min(batas['halaman_akhir'], halaman_akhir)
+            if not data and nomor > 1:
+                batas['halaman_akhir'] = min(batas['halaman_akhir'], nomor)
+                logging.info(f"Halaman {nomor} kosong/gagal. Pagination berhenti di halaman {nomor - 1}.")
+                continue
+            if on_halaman is None:
+                hasil[nomor] = data or []
+            logging.info(f"Berhasil scrape {len(data or [])} item dari halaman {nomor}.")
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(fetcher.concurrency)))
+    finally:
+        executor_parse.shutdown(wait=True)
+    return {nomor: data for nomor, data in sorted(hasil.items()) if nomor < batas['halaman_akhir']}
+
+
+async def crawl_pipeline(fetcher, buat_url, max_halaman, simpan, parse_file, executor_parse, on_halaman,
+                         daftar_halaman=None, max_antrian_parse=None):
+    """Pipeline tiga tahap: fetch -> simpan HTML mentah ke disk -> parse di executor_parse -> writer.
+
+    simpan(nomor, url, html) -> path dijalankan di thread fetch; parse_file(path, url) -> list record
+    dijalankan di executor_parse (process pool, jadi harus fungsi level modul). Worker parse membaca
+    HTML dari disk sendiri sehingga HTML tidak dikirim antar proses. on_halaman(nomor, records) adalah
+    writer: dipanggil di event loop (satu per satu, tanpa lock) dengan records None jika fetch gagal,
+    dan boleh mengembalikan nomor halaman akhir (eksklusif). Antrian parse dibatasi max_antrian_parse
+    agar fetch tidak berjalan terlalu jauh di depan parse.
+    """
+    loop = asyncio.get_running_loop()
+    batas = {'halaman_akhir': max_halaman + 1}
+    halaman_berikut = iter(daftar_halaman if daftar_halaman is not None else range(1, max_halaman + 1))
+    antrian_parse = asyncio.Semaphore(max_antrian_parse or 2 * getattr(executor_parse, '_max_workers', 2))
+    tugas_parse = []
+
+    def tulis(nomor, records):
+        if nomor >= batas['halaman_akhir']:
+            return  # Diambil sebelum batas akhir pagination diketahui
+        halaman_akhir = on_halaman(nomor, records)
+        if halaman_akhir is not None:
+            batas['halaman_akhir'] = min(batas['halaman_akhir'], halaman_akhir)
+        if not records and nomor > 1:
+            batas['halaman_akhir'] = min(batas['halaman_akhir'], nomor)
+            logging.info(f"Halaman {nomor} kosong/gagal. Pagination berhenti di halaman {nomor - 1}.")
+        else:
+            logging.info(f"Berhasil scrape {len(records or [])} item dari halaman {nomor}.")
+
+    async def parse_dan_tulis(nomor, path, url):
+        try:
+            records = await loop.run_in_executor(executor_parse, parse_file, path, url)
+        finally:
+            antrian_parse.release()
+        tulis(nomor, records)
+
+    async def worker():
+        for nomor in halaman_berikut:
+            if nomor >= batas['halaman_akhir']:
+                return
+            url = buat_url(nomor)
+            html = await fetcher.fetch(url)
+            if html is None:
+                tulis(nomor, None)
+                continue
+            path = await loop.run_in_executor(fetcher.executor_io, simpan, nomor, url, html)
+            await antrian_parse.acquire()
+            tugas_parse.append(asyncio.ensure_future(parse_dan_tulis(nomor, path, url)))
+
+    await asyncio.gather(*(worker() for _ in range(fetcher.concurrency)))
+    await asyncio.gather(*tugas_parse)
@@ -0,0 +1,267 @@
+# indeks_pembanding.py
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from inferensi import bersihkan_model_detail
+from penyimpanan_data import baca_tabel
+
+# --- KONFIGURASI INDEKS PEMBANDING ---
+VERSI_FORMAT_INDEKS = 2
+SUFFIX_INDEKS = ".pembanding"   # Direktori di samping dataset: data_mobil_fitur_depresiasi_inflasi.pembanding/
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+NAMA_FILE_MANIFEST = "manifest.json"
+KOLOM_INDEKS = ['Merek', 'Model_Detail', 'Harga', 'Tahun', 'Kilometer', 'Lokasi']
+ARRAY_INDEKS = {  # nama file .npy -> dtype; baris terurut per partisi lalu (Tahun, Kilometer)
+    'tahun': np.int32,
+    'kilometer': np.float64,
+    'harga': np.float64,
+    'kode_lokasi': np.int32, # Kode ke manifest['lokasi']
+    'baris': np.int64,       # Nomor baris di dataset
+}
+
+JUMLAH_PEMBANDING = 5
+SKALA_KM_PER_TAHUN = 20000     # Selisih 20.000 km dihitung setara selisih 1 tahun
+PENALTI_WILAYAH_SAMA = 1.0     # Lokasi beda tapi satu wilayah (pulau) ~ selisih 1 tahun
+PENALTI_LOKASI_LAIN = 3.0
+UKURAN_SCAN_PENUH = 4096       # Partisi sekecil ini langsung di-scan; lebih besar dicari per Tahun + Kilometer
+
+# Lokasi -> wilayah untuk "lokasi terdekat"; lokasi lain dikenali dari awalan nama (Jawa Barat -> Jawa, dst.)
+WILAYAH_LOKASI = {
+    'DKI Jakarta': 'Jawa', 'Banten': 'Jawa', 'Yogyakarta': 'Jawa', 'DI Yogyakarta': 'Jawa',
+    'Aceh': 'Sumatera', 'Riau': 'Sumatera', 'Kepulauan Riau': 'Sumatera', 'Jambi': 'Sumatera', 'Bengkulu': 'Sumatera',
+    'Lampung': 'Sumatera', 'Bangka Belitung': 'Sumatera', 'Kepulauan Bangka Belitung': 'Sumatera',
+    'Bali': 'Bali & Nusa Tenggara', 'Gorontalo': 'Sulawesi',
+}
+AWALAN_WILAYAH = {'Jawa': 'Jawa', 'Sumatera': 'Sumatera', 'Kalimantan': 'Kalimantan', 'Sulawesi': 'Sulawesi',
+                  'Nusa Tenggara': 'Bali & Nusa Tenggara', 'Maluku': 'Maluku & Papua', 'Papua': 'Maluku & Papua'}
+
+
+def wilayah_lokasi(lokasi):
+    """Wilayah (pulau) untuk lokasi; lokasi yang tidak dikenal menjadi wilayahnya sendiri."""
+    lokasi = str(lokasi)
+    if lokasi in WILAYAH_LOKASI:
+        return WILAYAH_LOKASI[lokasi]
+    for awalan, wilayah in AWALAN_WILAYAH.items():
+        if lokasi.startswith(awalan):
+            return wilayah
+    return lokasi
+
+
+def path_indeks(data_path):
+    """Direktori indeks untuk dataset (sama untuk versi .csv/.parquet/.feather)."""
+    return os.path.splitext(data_path)[0] + SUFFIX_INDEKS
+
+
+# --- 1. BANGUN INDEKS ---
+def kumpulkan_indeks(df, kumpulan=None):
+    """Menambahkan baris df (urutan sama dengan dataset output) ke kumpulan; bisa dipanggil per chunk."""
+    if kumpulan is None:
+        kumpulan = {'partisi': {}, 'lokasi': {}, 'jumlah_baris': 0,
+                    'kode_partisi': [], 'tahun': [], 'kilometer': [], 'harga': [], 'kode_lokasi': [], 'baris': []}
+    valid = df[KOLOM_INDEKS].notna().all(axis=1).to_numpy()
+    data = df[KOLOM_INDEKS][valid]
+    # Kunci partisi: (Merek, Model_Detail asli); 'Ayla D' dan 'Ayla D+' partisi berbeda (alias ternormalisasi di manifest)
+    kunci, unik = pd.factorize(pd.MultiIndex.from_arrays([data['Merek'].astype(str), data['Model_Detail'].astype(str)]))
+    kode_global = np.array([kumpulan['partisi'].setdefault(pasangan, len(kumpulan['partisi'])) for pasangan in unik],
+                           dtype=np.int64)
+    kode_lokasi, lokasi_unik = pd.factorize(data['Lokasi'].astype(str))
+    kode_lokasi_global = np.array([kumpulan['lokasi'].setdefault(l, len(kumpulan['lokasi'])) for l in lokasi_unik], dtype=np.int32)
+
+    kumpulan['kode_partisi'].append(kode_global[kunci])
+    kumpulan['tahun'].append(data['Tahun'].to_numpy(dtype=np.int32))
+    kumpulan['kilometer'].append(data['Kilometer'].to_numpy(dtype=np.float64))
+    kumpulan['harga'].append(data['Harga'].to_numpy(dtype=np.float64))
+    kumpulan['kode_lokasi'].append(kode_lokasi_global[kode_lokasi])
+    kumpulan['baris'].append(kumpulan['jumlah_baris'] + np.flatnonzero(valid))
+    kumpulan['jumlah_baris'] += len(df)
+    return kumpulan
+
+
+def simpan_indeks(kumpulan, indeks_dir):
+    """Menulis array terurut (.npy, bisa di-memory-map) dan manifest. Manifest ditulis terakhir (atomik).
+
+    Mengembalikan manifest.
+    """
+    kode_partisi = np.concatenate(kumpulan['kode_partisi']) if kumpulan['kode_partisi'] else np.empty(0, dtype=np.int64)
+    array = {
+        'tahun': kumpulan['tahun'], 'kilometer': kumpulan['kilometer'], 'harga': kumpulan['harga'],
+        'kode_lokasi': kumpulan['kode_lokasi'], 'baris': kumpulan['baris'],
+    }
+    array = {nama: np.concatenate(nilai).astype(ARRAY_INDEKS[nama]) if nilai else np.empty(0, dtype=ARRAY_INDEKS[nama])
+             for nama, nilai in array.items()}
+    urutan = np.lexsort((array['kilometer'], array['tahun'], kode_partisi))
+    batas = np.searchsorted(kode_partisi[urutan], np.arange(len(kumpulan['partisi']) + 1))
+
+    os.makedirs(indeks_dir, exist_ok=True)
+    for nama, nilai in array.items():
+        path = os.path.join(indeks_dir, nama + ".npy")
+        with open(path + ".tmp", 'wb') as f:
+            np.save(f, np.ascontiguousarray(nilai[urutan]))
+        os.replace(path + ".tmp", path)
+
+    partisi, alias = {}, {}
+    for (merek, model_detail), kode in kumpulan['partisi'].items():
+        partisi.setdefault(merek, {})[model_detail] = [int(batas[kode]), int(batas[kode + 1])]
+        alias.setdefault(merek, {}).setdefault(bersihkan_model_detail(model_detail), []).append(model_detail)
+    lokasi = sorted(kumpulan['lokasi'], key=kumpulan['lokasi'].get)
+    manifest = {
+        'versi_format': VERSI_FORMAT_INDEKS,
+        'jumlah_baris': int(len(urutan)),
+        'lokasi': lokasi,
+        'wilayah': [wilayah_lokasi(l) for l in lokasi],
+        'partisi': partisi,   # Merek -> Model_Detail asli -> [awal, akhir]
+        'alias': alias,       # Merek -> Model_Detail bersih -> [Model_Detail asli] (input teks bebas)
+    }
+    path = os.path.join(indeks_dir, NAMA_FILE_MANIFEST)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path + ".tmp", path)
+    return manifest
+
+
+# --- 2. QUERY ---
+class IndeksPembanding:
+    """Listing pembanding terdekat dari dataset: Merek/Model_Detail sama, Tahun & Kilometer terdekat, lokasi sama/dekat.
+
+    Array dibuka memory-mapped; query hanya menyentuh slice satu partisi (Merek, Model_Detail).
+    Jarak = |selisih Tahun| + |selisih Kilometer| / SKALA_KM_PER_TAHUN + penalti lokasi (0 jika sama).
+    """
+
+    def __init__(self, manifest, array):
+        self.manifest = manifest
+        self.partisi = manifest['partisi']
+        self.alias = manifest['alias']
+        self.nama_lokasi = manifest['lokasi']
+        self.posisi_lokasi = {nama: i for i, nama in enumerate(self.nama_lokasi)}
+        self.wilayah = np.array(manifest['wilayah'], dtype=object)
+        self.tahun, self.kilometer, self.harga = array['tahun'], array['kilometer'], array['harga']
+        self.kode_lokasi, self.baris = array['kode_lokasi'], array['baris']
+
+    @classmethod
+    def muat(cls, indeks_dir):
+        with open(os.path.join(indeks_dir, NAMA_FILE_MANIFEST), encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('versi_format') != VERSI_FORMAT_INDEKS:
+            raise ValueError(f"Versi format indeks {manifest.get('versi_format')} tidak didukung (harus {VERSI_FORMAT_INDEKS}).")
+        # np.asarray: view ndarray biasa di atas mmap (tanpa salinan), slicing tanpa overhead subclass np.memmap
+        array = {nama: np.asarray(np.load(os.path.join(indeks_dir, nama + ".npy"), mmap_mode='r')) for nama in ARRAY_INDEKS}
+        if any(len(nilai) != manifest['jumlah_baris'] for nilai in array.values()):
+            raise ValueError(f"Array indeks di '{indeks_dir}' tidak sesuai manifest (indeks sedang ditulis ulang?).")
+        return cls(manifest, array)
+
+    def _penalti_lokasi(self, lokasi):
+        """Penalti per kode lokasi untuk lokasi query (nol semua jika lokasi kosong)."""
+        penalti = np.zeros(len(self.nama_lokasi), dtype=np.float64)
+        if lokasi:
+            penalti[:] = np.where(self.wilayah == wilayah_lokasi(lokasi), PENALTI_WILAYAH_SAMA, PENALTI_LOKASI_LAIN)
+            if lokasi in self.posisi_lokasi:
+                penalti[self.posisi_lokasi[lokasi]] = 0.0
+        return penalti
+
+    def cari(self, merek, model_detail, tahun, kilometer, lokasi=None, k=JUMLAH_PEMBANDING):
+        """k listing terdekat sebagai list dict (Merek, Model_Detail, Tahun, Kilometer, Lokasi, Harga, Jarak, Baris).
+
+        Model_Detail dicari persis dulu; jika tidak ada, lewat bentuk ternormalisasi (semua varian asli yang
+        cocok, mis. 'ayla d' -> 'Ayla D' dan 'Ayla D+'), dan tiap hasil membawa Model_Detail aslinya.
+        List kosong jika (Merek, Model_Detail) tidak ada di dataset. Hasil eksak, sama dengan scan seluruh partisi
+        (jarak sama diurutkan menurut Tahun lalu Kilometer).
+        """
+        per_merek = self.partisi.get(str(merek), {})
+        if str(model_detail) in per_merek:
+            nama_partisi = [str(model_detail)]
+        else:
+            nama_partisi = self.alias.get(str(merek), {}).get(bersihkan_model_detail(model_detail), [])
+        if not nama_partisi or k <= 0:
+            return []
+        penalti = self._penalti_lokasi(lokasi)
+
+        def jarak(posisi):
+            return (np.abs(self.tahun[posisi] - tahun) + np.abs(self.kilometer[posisi] - kilometer) / SKALA_KM_PER_TAHUN
+                    + penalti[self.kode_lokasi[posisi]])
+
+        semua_posisi, semua_jarak, nama_model = [], [], []
+        for nama in nama_partisi:
+            awal, akhir = per_merek[nama]
+            if akhir - awal <= UKURAN_SCAN_PENUH:
+                posisi, d = np.arange(awal, akhir), jarak(slice(awal, akhir))
+            else:
+                posisi, d = self._kandidat_terdekat(awal, akhir, tahun, kilometer, k, jarak)
+            semua_posisi.append(posisi)
+            semua_jarak.append(d)
+            nama_model.extend([nama] * len(posisi))
+        posisi, d = np.concatenate(semua_posisi), np.concatenate(semua_jarak)
+        terdekat = np.argsort(d, kind='stable')[:k] if len(d) <= 4 * k else np.argpartition(d, k - 1)[:k]
+        terdekat = terdekat[np.lexsort((terdekat, d[terdekat]))]
+        posisi = posisi[terdekat]
+        return [{
+            'Merek': str(merek), 'Model_Detail': nama_model[i], 'Tahun': int(self.tahun[p]), 'Kilometer': float(self.kilometer[p]),
+            'Lokasi': self.nama_lokasi[self.kode_lokasi[p]], 'Harga': float(self.harga[p]), 'Jarak': float(d[i]),
+            'Baris': int(self.baris[p]),
+        } for p, i in zip(posisi.tolist(), terdekat.tolist())]
+
+    def _kandidat_terdekat(self, awal, akhir, tahun, kilometer, k, jarak):
+        """Posisi & jarak listing dalam persegi |selisih Tahun| <= radius, |selisih Kilometer| / SKALA <= radius.
+
+        Per Tahun, baris terurut Kilometer sehingga persegi didapat dengan searchsorted. Listing di luar persegi
+        berjarak > radius, jadi radius digandakan sampai listing ke-k di dalamnya berjarak <= radius (hasil eksak).
+        """
+        tahun_partisi = self.tahun[awal:akhir]
+        tahun_min, tahun_max = int(tahun_partisi[0]), int(tahun_partisi[-1])
+        radius = 1.0
+        while True:
+            blok = []
+            for y in range(max(tahun_min, int(np.ceil(tahun - radius))), min(tahun_max, int(np.floor(tahun + radius))) + 1):
+                lo = awal + int(np.searchsorted(tahun_partisi, y, 'left'))
+                hi = awal + int(np.searchsorted(tahun_partisi, y, 'right'))
+                km = self.kilometer[lo:hi]
+                a = int(np.searchsorted(km, kilometer - radius * SKALA_KM_PER_TAHUN, 'left'))
+                b = int(np.searchsorted(km, kilometer + radius * SKALA_KM_PER_TAHUN, 'right'))
+                if a < b:
+                    blok.append(np.arange(lo + a, lo + b))
+            posisi = np.concatenate(blok) if blok else np.empty(0, dtype=np.int64)
+            if len(posisi) == akhir - awal or len(posisi) >= k:
+                d = jarak(posisi)
+                if len(posisi) == akhir - awal or np.partition(d, k - 1)[k - 1] <= radius:
+                    return posisi, d
+            radius *= 2
+
+
+def _versi_manifest(path_manifest):
+    try:
+        with open(path_manifest, encoding='utf-8') as f:
+            return json.load(f).get('versi_format')
+    except (OSError, ValueError):
+        return None
+
+
+def muat_atau_bangun_indeks(data_path):
+    """Indeks untuk data_path. Dibangun ulang dari dataset jika belum ada, lebih lama dari dataset, atau format lama."""
+    indeks_dir = path_indeks(data_path)
+    path_manifest = os.path.join(indeks_dir, NAMA_FILE_MANIFEST)
+    if (_versi_manifest(path_manifest) != VERSI_FORMAT_INDEKS
+            or (os.path.exists(data_path) and os.path.getmtime(path_manifest) < os.path.getmtime(data_path))):
+        kumpulan = kumpulkan_indeks(baca_tabel(data_path, kolom=KOLOM_INDEKS))
+        try:
+            simpan_indeks(kumpulan, indeks_dir)
+        except OSError as e:  # mis. folder data read-only saat serving
+            print(f"[WARNING] Gagal menyimpan indeks pembanding ke {indeks_dir}: {e}")
+            return None
+    return IndeksPembanding.muat(indeks_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangun indeks listing pembanding (per Merek/Model_Detail, urut Tahun & Kilometer).")
+    parser.add_argument('data_path', nargs='?', default=DATA_PATH, help="CSV/Parquet/Feather hasil data_prepro.py.")
+    args = parser.parse_args()
+    manifest = simpan_indeks(kumpulkan_indeks(baca_tabel(args.data_path, kolom=KOLOM_INDEKS)), path_indeks(args.data_path))
+    print(f"[INFO] Indeks pembanding {manifest['jumlah_baris']} listing, "
+          f"{sum(len(v) for v in manifest['partisi'].values())} partisi Merek/Model_Detail disimpan ke {path_indeks(args.data_path)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,355 @@
+# inferensi.py
+
+import os
+import re
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# --- 1. KONFIGURASI ---
+CURRENT_YEAR = datetime.now().year
+
+# Kunci input yang sama dengan dict yang dibangun UI di app.py
+KOLOM_INPUT = ['Tahun_Input', 'Kilometer_Input', 'Merek_Input', 'Model_Detail_Input', 'Lokasi_Input', 'Owner_Input']
+
+# Nama kolom data scraper / payload API -> kunci input UI
+KOLOM_DATA_KE_INPUT = {
+    'Tahun': 'Tahun_Input',
+    'Kilometer': 'Kilometer_Input',
+    'Merek': 'Merek_Input',
+    'Model_Detail': 'Model_Detail_Input',
+    'Lokasi': 'Lokasi_Input',
+    'owner': 'Owner_Input',
+}
+
+# Proyeksi kurva harga: horizon default dan asumsi pemakaian per tahun (jika kilometer tidak diberikan)
+TAHUN_PROYEKSI = 10
+KM_PER_TAHUN_ASUMSI = 15000
+
+# Nilai placeholder dropdown yang berarti "tidak dipilih"
+PLACEHOLDER_MEREK = "Pilih Merek"
+PLACEHOLDER_LOKASI = "Pilih Lokasi"
+PLACEHOLDER_OWNER = "Pilih Jumlah Pemilik"
+
+# Engine inferensi yang bisa dipilih
+ENGINE_XGBOOST = "xgboost"
+ENGINE_NUMPY = "numpy"
+
+# Prefix kolom one-hot hasil pd.get_dummies di modelling.py
+PREFIX_MEREK = "Merek_"
+PREFIX_LOKASI = "Lokasi_"
+PREFIX_MODEL_DETAIL = "Model_Detail_"
+PREFIX_OWNER = "owner_"
+
+
+# --- 2. FUNGSI HELPER ---
+
+@lru_cache(maxsize=4096)
+def bersihkan_model_detail(model_detail):
+    """Normalisasi teks Model_Detail (huruf kecil, spasi jadi '_', buang karakter lain)."""
+    return re.sub(r'[^-a-zA-Z0-9_]', '', str(model_detail).lower().replace(' ', '_')).strip('_')
+
+
+def bersihkan_owner(owner):
+    """Mengambil kata pertama dari pilihan pemilik (mis. 'Fourth & Above' -> 'Fourth')."""
+    return str(owner).split(' ')[0]
+
+
+def _nilai_kosong(val, placeholder=None):
+    """True jika nilai input kosong/NaN atau masih berupa placeholder dropdown."""
+    if val is None or (isinstance(val, float) and np.isnan(val)):
+        return True
+    return not val or val == placeholder
+
+
+def ke_input_dict(record):
+    """Menerima dict dengan nama kolom data (Tahun, Merek, ...) atau kunci *_Input, mengembalikan kunci *_Input."""
+    return {KOLOM_DATA_KE_INPUT.get(k, k): v for k, v in record.items()}
+
+
+def _records_ke_dataframe(records):
+    """Mengubah list of dict / DataFrame input menjadi DataFrame dengan kolom KOLOM_INPUT."""
+    if isinstance(records, pd.DataFrame):
+        df_input = records
+    elif isinstance(records, dict):
+        df_input = pd.DataFrame([records])
+    else:
+        df_input = pd.DataFrame(list(records))
+    df_input = df_input.rename(columns=KOLOM_DATA_KE_INPUT)
+    return df_input.reindex(columns=KOLOM_INPUT).reset_index(drop=True)
+
+
+# --- 3. FEATURE ENCODER ---
+
+# Kolom kategorikal native -> (kunci input, placeholder, normalisasi nilai)
+KOLOM_KATEGORI_KE_INPUT = {
+    'Merek': ('Merek_Input', PLACEHOLDER_MEREK, None),
+    'Model_Detail': ('Model_Detail_Input', None, bersihkan_model_detail),
+    'Lokasi': ('Lokasi_Input', PLACEHOLDER_LOKASI, None),
+    'owner': ('Owner_Input', PLACEHOLDER_OWNER, bersihkan_owner),
+}
+
+
+class FeatureEncoder:
+    """Memetakan input mobil langsung ke posisi kolom X_COLUMNS_TRAINED (dibangun sekali saat load model)."""
+
+    def __init__(self, feature_names, scaler_obj=None, kategori=None):
+        self.feature_names = list(feature_names)
+        self.n_features = len(self.feature_names)
+        posisi_kolom = {nama: i for i, nama in enumerate(self.feature_names)}
+
+        self.posisi_tahun = posisi_kolom.get('Tahun')
+        self.posisi_usia = posisi_kolom.get('UsiaMobil')
+        self.posisi_kilometer = posisi_kolom.get('Kilometer')
+
+        # Kategori -> posisi kolom. Model_Detail dicari persis dulu ('Ayla D+' dan 'Ayla D' kolom berbeda), lalu
+        # dengan bentuk ternormalisasi agar teks bebas ('avanza g') tetap cocok dengan kolom get_dummies ('Model_Detail_Avanza G').
+        self.posisi_merek = self._index_prefix(PREFIX_MEREK)
+        self.posisi_lokasi = self._index_prefix(PREFIX_LOKASI)
+        self.posisi_model_detail_persis = self._index_prefix(PREFIX_MODEL_DETAIL)
+        self.posisi_model_detail = self._index_prefix(PREFIX_MODEL_DETAIL, bersihkan_model_detail)
+        self.posisi_owner = self._index_prefix(PREFIX_OWNER)
+
+        # Mode kategorikal native (modelling.py --categorical): satu kolom kode integer per kategori.
+        # kategori = {kolom: [nilai kategori urut kode]}; nilai tak dikenal -> kode len(kategori) (bucket unknown,
+        # kode yang sama dengan nilai kosong saat training; bukan missing bagi XGBoost -> ikut cabang "tidak dalam set").
+        # Kamus kode memuat nilai persis dulu, bentuk ternormalisasi hanya mengisi kunci yang belum ada.
+        self.kategori = {}
+        for kolom, daftar_nilai in (kategori or {}).items():
+            if kolom not in posisi_kolom or kolom not in KOLOM_KATEGORI_KE_INPUT:
+                continue
+            kunci_input, placeholder, transform = KOLOM_KATEGORI_KE_INPUT[kolom]
+            kode = {str(nilai): i for i, nilai in enumerate(daftar_nilai)}
+            if transform:
+                for i, nilai in enumerate(daftar_nilai):
+                    kode.setdefault(transform(nilai), i)
+            self.kategori[kolom] = (posisi_kolom[kolom], kunci_input, placeholder, transform, kode, len(daftar_nilai))
+
+        # Parameter RobustScaler sebagai array numpy: x_scaled = (x - center) / scale
+        self.center = None
+        self.scale = None
+        self.kolom_missing_jika_nol = None
+        if scaler_obj is not None:
+            self.center = getattr(scaler_obj, 'center_', None)
+            self.scale = getattr(scaler_obj, 'scale_', None)
+            # Model hasil training sparse (modelling.py --sparse): one-hot bernilai 0 = missing (NaN)
+            self.kolom_missing_jika_nol = getattr(scaler_obj, 'kolom_missing_jika_nol', None)
+        # Baris kosong (nol + kode unknown) yang sudah di-scale, disalin untuk setiap request satu baris
+        baris_kosong = np.zeros((1, self.n_features), dtype=np.float64)
+        for posisi, _, _, _, _, kode_unknown in self.kategori.values():
+            baris_kosong[0, posisi] = kode_unknown
+        self.baris_dasar = self.scale_matrix(baris_kosong)[0]
+
+    def _index_prefix(self, prefix, transform=None):
+        index = {}
+        for i, nama in enumerate(self.feature_names):
+            if nama.startswith(prefix):
+                kunci = nama[len(prefix):]
+                index.setdefault(transform(kunci) if transform else kunci, i)
+        return index
+
+    def posisi_onehot(self, user_input_dict):
+        """Daftar posisi kolom one-hot yang bernilai 1 untuk satu input."""
+        posisi = []
+        merek = user_input_dict.get('Merek_Input')
+        if not _nilai_kosong(merek, PLACEHOLDER_MEREK) and str(merek) in self.posisi_merek:
+            posisi.append(self.posisi_merek[str(merek)])
+        lokasi = user_input_dict.get('Lokasi_Input')
+        if not _nilai_kosong(lokasi, PLACEHOLDER_LOKASI) and str(lokasi) in self.posisi_lokasi:
+            posisi.append(self.posisi_lokasi[str(lokasi)])
+        model_detail = user_input_dict.get('Model_Detail_Input')
+        if not _nilai_kosong(model_detail):
+            posisi_model = self.posisi_model_detail_persis.get(str(model_detail),
+                                                              self.posisi_model_detail.get(bersihkan_model_detail(model_detail)))
+            if posisi_model is not None:
+                posisi.append(posisi_model)
+        owner = user_input_dict.get('Owner_Input')
+        if not _nilai_kosong(owner, PLACEHOLDER_OWNER) and bersihkan_owner(owner) in self.posisi_owner:
+            posisi.append(self.posisi_owner[bersihkan_owner(owner)])
+        return posisi
+
+    def _nilai_kategori(self, user_input_dict):
+        """Daftar (posisi, kode) untuk kolom kategorikal native; nilai kosong/tak dikenal -> kode unknown."""
+        nilai = []
+        for posisi, kunci_input, placeholder, transform, kode, kode_unknown in self.kategori.values():
+            val = user_input_dict.get(kunci_input)
+            if _nilai_kosong(val, placeholder):
+                nilai.append((posisi, kode_unknown))
+            else:
+                kode_val = kode.get(str(val))
+                if kode_val is None and transform:
+                    kode_val = kode.get(transform(val))
+                nilai.append((posisi, kode_unknown if kode_val is None else kode_val))
+        return nilai
+
+    def kunci_kategori(self, user_input_dict):
+        """Posisi one-hot + kode kategorikal yang benar-benar dipakai model untuk input ini (mis. kunci cache)."""
+        return tuple(sorted(self.posisi_onehot(user_input_dict))) + tuple(self._nilai_kategori(user_input_dict))
+
+    def _nilai_numerik(self, user_input_dict):
+        tahun = user_input_dict.get('Tahun_Input', CURRENT_YEAR)
+        kilometer = user_input_dict.get('Kilometer_Input', 0)
+        nilai = []
+        if self.posisi_tahun is not None: nilai.append((self.posisi_tahun, tahun))
+        if self.posisi_usia is not None: nilai.append((self.posisi_usia, max(0, CURRENT_YEAR - tahun)))
+        if self.posisi_kilometer is not None: nilai.append((self.posisi_kilometer, kilometer))
+        return nilai
+
+    def encode_row(self, user_input_dict, sparse=False):
+        """Encode satu input tanpa pandas.
+
+        Dense: vektor 1D yang sudah di-scale (jika scaler ada).
+        Sparse: scipy CSR (1 x n_features) berisi nilai mentah sebelum scaling.
+        """
+        nilai = self._nilai_numerik(user_input_dict) + self._nilai_kategori(user_input_dict) + \
+            [(i, 1.0) for i in self.posisi_onehot(user_input_dict)]
+        if sparse:
+            from scipy.sparse import csr_matrix
+            kolom = np.array([i for i, _ in nilai], dtype=np.int64)
+            data = np.array([v for _, v in nilai], dtype=np.float64)
+            return csr_matrix((data, (np.zeros(len(kolom), dtype=np.int64), kolom)), shape=(1, self.n_features))
+
+        row = self.baris_dasar.copy()
+        for i, v in nilai:
+            row[i] = float(v)
+            if self.center is not None: row[i] -= self.center[i]
+            if self.scale is not None: row[i] /= self.scale[i]
+        return row
+
+    def encode_varian(self, user_input_dict, tahun, kilometer):
+        """Matriks (sudah di-scale) untuk satu mobil dengan banyak nilai Tahun/Kilometer sekaligus.
+
+        Kategori di-encode sekali lalu disalin ke semua baris; hanya kolom Tahun, UsiaMobil, dan Kilometer
+        yang berbeda per baris. tahun dan kilometer di-broadcast ke panjang yang sama.
+        """
+        tahun, kilometer = np.broadcast_arrays(np.asarray(tahun, dtype=np.float64), np.asarray(kilometer, dtype=np.float64))
+        baris = np.zeros(self.n_features, dtype=np.float64)
+        for i, v in self._nilai_kategori(user_input_dict): baris[i] = v
+        baris[self.posisi_onehot(user_input_dict)] = 1
+        matrix = np.tile(baris, (tahun.size, 1))
+        if self.posisi_tahun is not None: matrix[:, self.posisi_tahun] = tahun.ravel()
+        if self.posisi_usia is not None: matrix[:, self.posisi_usia] = np.maximum(0, CURRENT_YEAR - tahun.ravel())
+        if self.posisi_kilometer is not None: matrix[:, self.posisi_kilometer] = kilometer.ravel()
+        return self.scale_matrix(matrix)
+
+    def _posisi_batch(self, values, index, placeholder=None, transform=None, index_persis=None):
+        posisi_unik = {}
+        for val in pd.unique(values):
+            if _nilai_kosong(val, placeholder):
+                posisi_unik[val] = None
+            elif index_persis is not None and str(val) in index_persis:
+                posisi_unik[val] = index_persis[str(val)]
+            else:
+                posisi_unik[val] = index.get(transform(val) if transform else str(val))
+        return values.map(posisi_unik)
+
+    def encode_batch(self, records):
+        """Membangun matriks fitur mentah (belum di-scale) untuk banyak mobil dalam satu pass vectorized."""
+        df_input = _records_ke_dataframe(records)
+        matrix = np.zeros((len(df_input), self.n_features), dtype=np.float64)
+
+        tahun = pd.to_numeric(df_input['Tahun_Input'], errors='coerce').fillna(CURRENT_YEAR).to_numpy(dtype=np.float64)
+        kilometer = pd.to_numeric(df_input['Kilometer_Input'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        if self.posisi_tahun is not None: matrix[:, self.posisi_tahun] = tahun
+        if self.posisi_usia is not None: matrix[:, self.posisi_usia] = np.maximum(0, CURRENT_YEAR - tahun)
+        if self.posisi_kilometer is not None: matrix[:, self.posisi_kilometer] = kilometer
+
+        for posisi in (
+            self._posisi_batch(df_input['Merek_Input'], self.posisi_merek, PLACEHOLDER_MEREK),
+            self._posisi_batch(df_input['Lokasi_Input'], self.posisi_lokasi, PLACEHOLDER_LOKASI),
+            self._posisi_batch(df_input['Model_Detail_Input'], self.posisi_model_detail, transform=bersihkan_model_detail,
+                               index_persis=self.posisi_model_detail_persis),
+            self._posisi_batch(df_input['Owner_Input'], self.posisi_owner, PLACEHOLDER_OWNER, transform=bersihkan_owner),
+        ):
+            mask = posisi.notna().to_numpy()
+            if mask.any():
+                matrix[np.flatnonzero(mask), posisi[mask].to_numpy(dtype=np.int64)] = 1
+
+        for posisi, kunci_input, placeholder, transform, kode, kode_unknown in self.kategori.values():
+            kode_per_baris = self._posisi_batch(df_input[kunci_input], kode, placeholder, transform, index_persis=kode)
+            matrix[:, posisi] = kode_per_baris.astype('float64').fillna(kode_unknown).to_numpy()
+        return matrix
+
+    def scale_matrix(self, matrix):
+        """Menerapkan RobustScaler (center_/scale_) ke matriks mentah, sama seperti scaler.transform."""
+        hasil = matrix
+        if self.center is not None: hasil = hasil - self.center
+        if self.scale is not None: hasil = hasil / self.scale
+        if self.kolom_missing_jika_nol is not None:
+            hasil = np.where((matrix == 0) & self.kolom_missing_jika_nol, np.nan, hasil)
+        return hasil
+
+
+# --- 4. LOAD MODEL ---
+
+def muat_komponen_model(model_path, engine=ENGINE_XGBOOST):
+    """Memuat (model, scaler, kolom training) dan membangun FeatureEncoder.
+
+    model_path boleh berupa file joblib .pkl atau direktori artifact fast-start (lihat artifact_model.py).
+    engine='numpy' mengganti model dengan evaluator tree numpy (tree_numpy.py) yang API predict-nya sama.
+    """
+    if engine not in (ENGINE_XGBOOST, ENGINE_NUMPY):
+        raise ValueError(f"Engine inferensi '{engine}' tidak dikenal (pilih '{ENGINE_XGBOOST}' atau '{ENGINE_NUMPY}').")
+    if os.path.isdir(model_path):
+        from artifact_model import muat_artifact
+        model, scaler, trained_feature_columns, kategori, _ = muat_artifact(model_path)
+    else:
+        import joblib
+        komponen = joblib.load(model_path)
+        # Tuple 3 item (one-hot) atau 4 item (+ kamus kategori untuk mode kategorikal native)
+        model, scaler, trained_feature_columns = komponen[:3]
+        kategori = komponen[3] if len(komponen) > 3 else None
+    if not isinstance(trained_feature_columns, list):
+        trained_feature_columns = trained_feature_columns.tolist()
+
+    if engine == ENGINE_NUMPY:
+        from tree_numpy import NumpyTreeEnsemble
+        if os.path.isdir(model_path) and NumpyTreeEnsemble.tersedia_di(model_path):
+            model = NumpyTreeEnsemble.muat(model_path)
+        else:
+            model = NumpyTreeEnsemble.dari_booster(model.booster if hasattr(model, 'booster_path') else model)
+    return model, scaler, trained_feature_columns, FeatureEncoder(trained_feature_columns, scaler, kategori)
+
+
+# --- 5. PREPROCESSING & PREDIKSI BATCH ---
+
+def preprocess_user_input_batch(records, encoder):
+    """Versi batch dari preprocess_user_input_dynamic: scaling satu kali untuk semua baris."""
+    matrix = encoder.scale_matrix(encoder.encode_batch(records))
+    return pd.DataFrame(matrix, columns=encoder.feature_names)
+
+
+def predict_harga_batch(model, encoder, records):
+    """Memprediksi harga (Rp) banyak mobil dengan satu kali model.predict."""
+    matrix = encoder.scale_matrix(encoder.encode_batch(records))
+    prediction_log = model.predict(matrix)
+    return np.expm1(prediction_log)
+
+
+def proyeksi_harga(model, encoder, user_input_dict, tahun_ke_depan=None, kilometer=None, km_per_tahun=KM_PER_TAHUN_ASUMSI):
+    """Kurva harga satu mobil untuk banyak titik waktu/kilometer dengan satu kali model.predict.
+
+    Mobil n tahun ke depan diwakili mobil yang hari ini n tahun lebih tua (Tahun - n, UsiaMobil + n),
+    sehingga harga dalam nilai uang saat ini (tanpa inflasi ke depan). kilometer None -> Kilometer_Input +
+    n * km_per_tahun. tahun_ke_depan dan kilometer di-broadcast, mis. tahun_ke_depan=0 dengan array kilometer
+    untuk kurva kilometer saja. Mengembalikan DataFrame TahunKeDepan, TahunProyeksi, UsiaMobil, Kilometer, Harga_Prediksi.
+    """
+    if tahun_ke_depan is None:
+        tahun_ke_depan = np.arange(TAHUN_PROYEKSI + 1)
+    tahun_input = user_input_dict.get('Tahun_Input', CURRENT_YEAR)
+    kilometer_input = user_input_dict.get('Kilometer_Input', 0)
+    tahun_ke_depan = np.asarray(tahun_ke_depan, dtype=np.int64)
+    if kilometer is None:
+        kilometer = kilometer_input + tahun_ke_depan * km_per_tahun
+    tahun_ke_depan, kilometer = np.broadcast_arrays(tahun_ke_depan, np.asarray(kilometer, dtype=np.float64))
+    tahun_setara = tahun_input - tahun_ke_depan
+    matrix = encoder.encode_varian(user_input_dict, tahun_setara, kilometer)
+    return pd.DataFrame({
+        'TahunKeDepan': tahun_ke_depan,
+        'TahunProyeksi': CURRENT_YEAR + tahun_ke_depan,
+        'UsiaMobil': np.maximum(0, CURRENT_YEAR - tahun_setara),
+        'Kilometer': kilometer,
+        'Harga_Prediksi': np.expm1(model.predict(matrix)),
+    })
@@ -0,0 +1,81 @@
+# katalog_mobil.py
+
+import argparse
+import json
+import os
+
+from penyimpanan_data import KOLOM_DROPDOWN, baca_tabel
+
+# --- KONFIGURASI KATALOG ---
+SUFFIX_KATALOG = ".katalog.json"   # Disimpan di samping dataset: data_mobil_fitur_depresiasi_inflasi.katalog.json
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+
+
+def path_katalog(data_path):
+    """Path katalog untuk dataset (sama untuk versi .csv/.parquet/.feather)."""
+    return os.path.splitext(data_path)[0] + SUFFIX_KATALOG
+
+
+def kumpulkan_katalog(df, kumpulan=None):
+    """Menambahkan Merek -> {Model_Detail} dan {Lokasi} dari df ke kumpulan (bisa dipanggil per chunk)."""
+    kumpulan = kumpulan if kumpulan is not None else {'model_per_merek': {}, 'lokasi': set()}
+    if {'Merek', 'Model_Detail'}.issubset(df.columns):
+        pasangan = df[['Merek', 'Model_Detail']].dropna().drop_duplicates()
+        for merek, models in pasangan.groupby('Merek', observed=True)['Model_Detail']:
+            kumpulan['model_per_merek'].setdefault(str(merek), set()).update(models.astype(str))
+    elif 'Merek' in df.columns:
+        for merek in df['Merek'].dropna().unique():
+            kumpulan['model_per_merek'].setdefault(str(merek), set())
+    if 'Lokasi' in df.columns:
+        kumpulan['lokasi'].update(df['Lokasi'].dropna().astype(str).unique())
+    return kumpulan
+
+
+def susun_katalog(kumpulan):
+    """Katalog terurut {'model_per_merek': {merek: [model, ...]}, 'lokasi': [...]}, urutan sama dengan dropdown app.py."""
+    return {
+        'model_per_merek': {merek: sorted(models) for merek, models in sorted(kumpulan['model_per_merek'].items())},
+        'lokasi': sorted(kumpulan['lokasi']),
+    }
+
+
+def simpan_katalog(kumpulan, path):
+    """Menulis katalog terurut sebagai JSON (atomik). Mengembalikan katalog."""
+    katalog = susun_katalog(kumpulan)
+    path_tmp = path + ".tmp"
+    with open(path_tmp, 'w', encoding='utf-8') as f:
+        json.dump(katalog, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(path_tmp, path)
+    return katalog
+
+
+def muat_katalog(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def muat_atau_bangun_katalog(data_path):
+    """Katalog untuk data_path. Dibangun ulang dari kolom dropdown dataset jika belum ada atau lebih lama dari dataset."""
+    path = path_katalog(data_path)
+    if os.path.exists(path) and (not os.path.exists(data_path) or os.path.getmtime(path) >= os.path.getmtime(data_path)):
+        return muat_katalog(path)
+    kumpulan = kumpulkan_katalog(baca_tabel(data_path, kolom=KOLOM_DROPDOWN))
+    try:
+        return simpan_katalog(kumpulan, path)
+    except OSError as e:  # mis. folder data read-only saat serving: katalog tetap dipakai dari memori
+        print(f"[WARNING] Gagal menyimpan katalog ke {path}: {e}")
+        return susun_katalog(kumpulan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangun katalog dropdown (Merek -> Model_Detail, Lokasi) dari dataset.")
+    parser.add_argument('data_path', nargs='?', default=DATA_PATH, help="CSV/Parquet/Feather hasil data_prepro.py.")
+    args = parser.parse_args()
+    katalog = simpan_katalog(kumpulkan_katalog(baca_tabel(args.data_path, kolom=KOLOM_DROPDOWN)), path_katalog(args.data_path))
+    print(f"[INFO] Katalog {len(katalog['model_per_merek'])} merek, "
+          f"{sum(len(v) for v in katalog['model_per_merek'].values())} model, {len(katalog['lokasi'])} lokasi "
+          f"disimpan ke {path_katalog(args.data_path)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+# listing_index.py
+
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+# --- KONFIGURASI INDEKS ---
+DB_PATH = os.path.join("data", "indeks_listing.sqlite")
+BATAS_HALAMAN_TIDAK_BERUBAH = 3    # Re-crawl berhenti setelah sekian halaman berurutan tanpa listing baru/berubah
+
+SKEMA = """
+CREATE TABLE IF NOT EXISTS listing (
+    listing_id TEXT PRIMARY KEY,
+    hash_konten TEXT NOT NULL,
+    harga INTEGER,
+    kilometer INTEGER,
+    pertama_dilihat TEXT NOT NULL,
+    terakhir_dilihat TEXT NOT NULL,
+    jumlah_perubahan INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS riwayat_harga (
+    listing_id TEXT NOT NULL,
+    waktu TEXT NOT NULL,
+    harga INTEGER,
+    kilometer INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_riwayat_listing ON riwayat_harga (listing_id);
+"""
+
+
+def kunci_listing(record):
+    """ID listing dari scraper; fallback ke hash identitas mobil jika halaman tidak menyediakan ID/URL."""
+    if record.get('ListingID'):
+        return str(record['ListingID'])
+    identitas = '|'.join(str(record.get(kolom)) for kolom in ('Judul', 'Merek', 'Model_Detail', 'Tahun', 'Lokasi'))
+    return 'hash:' + hashlib.sha1(identitas.encode('utf-8')).hexdigest()
+
+
+def hash_konten(record):
+    """Hash harga + kilometer: berubah jika penjual mengubah harga atau odometer."""
+    return hashlib.sha1(f"{record.get('Harga')}|{record.get('Kilometer')}".encode('utf-8')).hexdigest()
+
+
+def _ke_int(nilai):
+    return int(nilai) if nilai is not None and not pd.isna(nilai) else None
+
+
+class IndeksListing:
+    """Indeks listing persisten (SQLite) untuk re-crawl inkremental dan riwayat perubahan harga per listing."""
+
+    def __init__(self, db_path=DB_PATH):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SKEMA)
+
+    def periksa_dan_catat(self, records, waktu=None):
+        """Membandingkan satu halaman listing dengan indeks dan mencatat yang baru/berubah.
+
+        Perubahan belum di-commit: panggil commit() setelah baris halaman ini tersimpan di CSV, agar
+        crash di antaranya tidak membuat listing tercatat di indeks tetapi hilang dari output.
+        Mengembalikan (records baru atau berubah, jumlah listing yang sudah dikenal dan tidak berubah).
+        """
+        waktu = waktu or datetime.now().isoformat(timespec='seconds')
+        kunci = [kunci_listing(r) for r in records]
+        dikenal = {}
+        if kunci:
+            placeholder = ','.join('?' * len(kunci))
+            dikenal = dict(self.conn.execute(
+                f"SELECT listing_id, hash_konten FROM listing WHERE listing_id IN ({placeholder})", kunci).fetchall())
+
+        baru_atau_berubah, jumlah_tetap = [], 0
+        for k, record in zip(kunci, records):
+            h = hash_konten(record)
+            harga, km = _ke_int(record.get('Harga')), _ke_int(record.get('Kilometer'))
+            if k not in dikenal:
+                self.conn.execute("INSERT OR IGNORE INTO listing VALUES (?, ?, ?, ?, ?, ?, 0)", (k, h, harga, km, waktu, waktu))
+            elif dikenal[k] != h:
+                self.conn.execute("UPDATE listing SET hash_konten=?, harga=?, kilometer=?, terakhir_dilihat=?, "
+                                  "jumlah_perubahan=jumlah_perubahan+1 WHERE listing_id=?", (h, harga, km, waktu, k))
+            else:
+                self.conn.execute("UPDATE listing SET terakhir_dilihat=? WHERE listing_id=?", (waktu, k))
+                jumlah_tetap += 1
+                continue
+            self.conn.execute("INSERT INTO riwayat_harga VALUES (?, ?, ?, ?)", (k, waktu, harga, km))
+            dikenal[k] = h
+            baru_atau_berubah.append(record)
+        return baru_atau_berubah, jumlah_tetap
+
+    def commit(self):
+        self.conn.commit()
+
+    def riwayat_harga(self, listing_id):
+        """Riwayat harga/kilometer satu listing, urut waktu."""
+        return pd.read_sql_query("SELECT waktu, harga, kilometer FROM riwayat_harga WHERE listing_id=? ORDER BY waktu, rowid",
+                                 self.conn, params=(listing_id,))
+
+    def listing_berubah_harga(self):
+        """Listing yang pernah berubah harga/kilometer beserta jumlah perubahannya."""
+        return pd.read_sql_query("SELECT * FROM listing WHERE jumlah_perubahan > 0 ORDER BY jumlah_perubahan DESC", self.conn)
+
+    def jumlah_listing(self):
+        return self.conn.execute("SELECT COUNT(*) FROM listing").fetchone()[0]
+
+    def tutup(self):
+        self.conn.commit()
+        self.conn.close()
+
+
+class PemantauBerhenti:
+    """Menentukan halaman akhir re-crawl: setelah `batas` halaman berurutan yang semua listingnya sudah dikenal
+    dan tidak berubah. Halaman boleh selesai tidak berurutan (mode async); yang dihitung urutan nomor halaman.
+    """
+
+    def __init__(self, batas=BATAS_HALAMAN_TIDAK_BERUBAH):
+        self.batas = batas
+        self.halaman_tidak_berubah = set()
+
+    def catat(self, nomor, jumlah_baru_atau_berubah, jumlah_tetap):
+        """Mengembalikan nomor halaman akhir (eksklusif) jika kondisi berhenti terpenuhi, selain itu None."""
+        if jumlah_baru_atau_berubah == 0 and jumlah_tetap > 0:
+            self.halaman_tidak_berubah.add(nomor)
+        # Cukup periksa jendela `batas` halaman yang memuat halaman baru ini
+        for awal in range(nomor - self.batas + 1, nomor + 1):
+            if all(awal + i in self.halaman_tidak_berubah for i in range(self.batas)):
+                return awal + self.batas
+        return None
@@ -0,0 +1,84 @@
+# load_generator.py
+
+import argparse
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import requests
+
+# --- KONFIGURASI LOAD TEST ---
+SERVICE_URL = "http://127.0.0.1:8000"
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+JUMLAH_REQUEST = 2000
+KONKURENSI = 16
+UKURAN_BATCH = 100        # Jumlah mobil per request pada mode /predict_batch
+
+
+def muat_sampel_mobil(data_path):
+    """Mengambil spesifikasi mobil dari data asli sebagai payload request."""
+    df = pd.read_csv(data_path, usecols=['Merek', 'Model_Detail', 'Tahun', 'Kilometer', 'Lokasi']).dropna()
+    return df.to_dict(orient='records')
+
+
+def jalankan_load_test(url, sampel, jumlah_request, konkurensi, mode, ukuran_batch):
+    """Mengirim request paralel dan mengembalikan daftar latensi (ms) serta durasi total."""
+    lokal = threading.local()
+
+    def kirim(_):
+        if not hasattr(lokal, 'session'):
+            lokal.session = requests.Session()
+        waktu_kirim = time.perf_counter()
+        if mode == 'batch':
+            response = lokal.session.post(f"{url}/predict_batch", json=random.sample(sampel, min(ukuran_batch, len(sampel))))
+        else:
+            response = lokal.session.post(f"{url}/predict", json=random.choice(sampel))
+        return response.status_code, (time.perf_counter() - waktu_kirim) * 1000.0
+
+    waktu_mulai = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=konkurensi) as executor:
+        hasil = list(executor.map(kirim, range(jumlah_request)))
+    durasi = time.perf_counter() - waktu_mulai
+    return hasil, durasi
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator untuk prediksi_service.py (p50/p99 & throughput).")
+    parser.add_argument('--url', default=SERVICE_URL)
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--requests', type=int, default=JUMLAH_REQUEST)
+    parser.add_argument('--concurrency', type=int, default=KONKURENSI)
+    parser.add_argument('--mode', choices=['single', 'batch'], default='single')
+    parser.add_argument('--batch-size', type=int, default=UKURAN_BATCH)
+    args = parser.parse_args()
+
+    sampel = muat_sampel_mobil(args.data_path)
+    print(f"[INFO] {len(sampel)} sampel mobil dimuat. Mengirim {args.requests} request ({args.mode}) dengan konkurensi {args.concurrency}...")
+
+    hasil, durasi = jalankan_load_test(args.url, sampel, args.requests, args.concurrency, args.mode, args.batch_size)
+    latensi = np.array([ms for status, ms in hasil if status == 200])
+    gagal = sum(1 for status, _ in hasil if status != 200)
+    baris_per_request = args.batch_size if args.mode == 'batch' else 1
+
+    print(f"\n📈 Hasil Load Test (sisi klien):")
+    print(f"   Request sukses / gagal: {len(latensi)} / {gagal}")
+    if len(latensi):
+        print(f"   Latensi p50: {np.percentile(latensi, 50):.2f} ms")
+        print(f"   Latensi p99: {np.percentile(latensi, 99):.2f} ms")
+    print(f"   Throughput: {len(latensi) / durasi:,.1f} request/detik ({len(latensi) * baris_per_request / durasi:,.1f} mobil/detik)")
+
+    try:
+        metrics = requests.get(f"{args.url}/metrics", timeout=5).json()
+        print(f"\n📊 Statistik sisi server (/metrics):")
+        for kunci, nilai in metrics.items():
+            print(f"   {kunci}: {nilai}")
+    except requests.exceptions.RequestException as e:
+        print(f"[WARNING] Gagal mengambil /metrics: {e}")
+
+
+if __name__ == '__main__':
+    main()
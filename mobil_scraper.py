@@ -1,5 +1,9 @@
 # mobil_scraper.py
 
+import argparse
+import asyncio
+import functools
+import os
 import requests
 from bs4 import BeautifulSoup
 import pandas as pd
@@ -20,7 +24,13 @@ HEADERS = {'User-Agent': USER_AGENT_STRING}
 
 MAX_PAGES_TO_SCRAPE = 3425     # Batasi jumlah halaman untuk uji coba awal (misal: 3-5 halaman)
 REQUEST_DELAY_SECONDS = 8   # Jeda antar request halaman (detik) untuk etika dan menghindari blokir
-OUTPUT_FILENAME = 'hasil_scrape_mobil123.csv'
+OUTPUT_FILENAME = 'hasil_scrape_mobil123.csv'   # Ditulis bertahap (append) + checkpoint <OUTPUT_FILENAME>.checkpoint.json
+KOLOM_OUTPUT = ['Judul', 'Merek', 'Model_Detail', 'Harga', 'Tahun', 'Kilometer', 'Lokasi', 'SumberURL']
+ASYNC_CONCURRENCY = 8         # Mode async: request bersamaan
+ASYNC_RATE_PER_DETIK = 1.0    # Mode async: rata-rata request per detik per host (token bucket)
+PARSER_BACKEND = 'strainer'    # html.parser | strainer | lxml | lxml-strainer | selectolax (lihat bench_parser.py)
+PARSE_WORKERS = os.cpu_count() or 1   # Mode pipeline: jumlah proses parse
+ARSIP_HALAMAN_DIR = os.path.join("data", "arsip_halaman")   # Mode pipeline: HTML mentah (gzip) per halaman
 
 # --- FUNGSI HELPER ---
 
@@ -80,124 +90,193 @@ def parse_km_to_int(km_text):
     return None
 
 
-def extract_listings_from_soup(soup, source_url):
-    """Mengekstrak semua listing mobil dari objek BeautifulSoup satu halaman."""
+# --- BACKEND PARSER ---
+# Ekstraksi listing memakai adapter kecil agar logika yang sama berjalan di atas pohon BeautifulSoup
+# (html.parser / lxml, penuh atau hanya kartu listing via SoupStrainer) maupun selectolax.
+
+class _AdapterBs4:
+    @staticmethod
+    def kartu(root):
+        return root.find_all('article', class_='listing--card')
+
+    @staticmethod
+    def pertama(node, tag, kelas=None):
+        return node.find(tag, class_=kelas) if kelas else node.find(tag)
+
+    @staticmethod
+    def semua(node, tag, kelas=None):
+        return node.find_all(tag, class_=kelas) if kelas else node.find_all(tag)
+
+    @staticmethod
+    def atribut(node, nama):
+        return node.get(nama)
+
+    @staticmethod
+    def kelas(node):
+        return node.get('class', [])
+
+    @staticmethod
+    def teks(node):
+        return node.text
+
+
+class _AdapterSelectolax:
+    @staticmethod
+    def kartu(root):
+        return root.css('article.listing--card')
+
+    @staticmethod
+    def pertama(node, tag, kelas=None):
+        return node.css_first(f"{tag}.{kelas}" if kelas else tag)
+
+    @staticmethod
+    def semua(node, tag, kelas=None):
+        return node.css(f"{tag}.{kelas}" if kelas else tag)
+
+    @staticmethod
+    def atribut(node, nama):
+        return node.attributes.get(nama)
+
+    @staticmethod
+    def kelas(node):
+        return (node.attributes.get('class') or '').split()
+
+    @staticmethod
+    def teks(node):
+        return node.text(deep=True)
+
+
+def _ekstrak_kartu(item_html, a, source_url):
+    """Satu <article> listing -> dict record (atau None jika judul/harga kosong)."""
+    # --- Ekstraksi Judul ---
+    # Cara 1: Dari data-display-title di <article> (lebih disukai jika ada dan bersih)
+    judul = a.atribut(item_html, 'data-display-title')
+    title_h2 = a.pertama(item_html, 'h2', 'listing__title')
+    title_a = a.pertama(title_h2, 'a') if title_h2 is not None else None
+    if not judul and title_a is not None: # Cara 2: Fallback ke h2 > a
+        judul = a.teks(title_a).strip()
+
+    # --- Ekstraksi Harga ---
+    price_div = a.pertama(item_html, 'div', 'listing__price')
+    harga = parse_price_to_int(a.teks(price_div).strip() if price_div is not None else None)
+    # Jika harga dari div kosong, ambil dari data-title di article (mis. "... (Rp 150.000.000)")
+    if not harga:
+        data_title_price = a.atribut(item_html, 'data-title')
+        if data_title_price:
+            price_match_in_title = re.search(r'\(Rp\s*([\d.,]+)\)', data_title_price)
+            if price_match_in_title:
+                harga = parse_price_to_int(price_match_in_title.group(1))
+
+    # --- Ekstraksi Tahun & Kilometer ---
+    # Dari atribut data-year / data-mileage di <article> (paling akurat)
+    tahun = parse_year_to_int(a.atribut(item_html, 'data-year'))
+    kilometer = parse_km_to_int(a.atribut(item_html, 'data-mileage'))
+
+    # --- Kilometer (fallback) & Lokasi dari listing__specs, satu kali jalan ---
+    lokasi = None
+    specs_div = a.pertama(item_html, 'div', 'listing__specs')
+    if specs_div is not None:
+        for spec_item in a.semua(specs_div, 'div', 'item'):
+            if kilometer is None:
+                # Kilometer dari item yang icon pertamanya icon--meter
+                icon_element = a.pertama(spec_item, 'i', 'icon')
+                if icon_element is not None and 'icon--meter' in a.kelas(icon_element):
+                    kilometer = parse_km_to_int(a.teks(spec_item).strip())
+            if lokasi is None and a.pertama(spec_item, 'i', 'icon--location') is not None:
+                # Icon tidak punya teks, jadi teks di div.item adalah lokasinya (mis. "DKI Jakarta")
+                lokasi = a.teks(spec_item).strip()
+            if lokasi is not None and kilometer is not None:
+                break
+
+    # --- Ekstraksi Merek & Model ---
+    # Dari atribut data-make dan data-model di <article>
+    merek = a.atribut(item_html, 'data-make')
+    model_utama = a.atribut(item_html, 'data-model') # Misal "City"
+    # model_detail bisa dari judul atau data-variant
+    model_variant = a.atribut(item_html, 'data-variant') # Misal "RS Honda Sensing"
+
+    model_detail = model_utama # Default
+    if model_variant:
+        model_detail = f"{model_utama} {model_variant}" if model_utama else model_variant
+    elif judul and merek: # Jika tidak ada data-variant, coba dari judul
+        # Hapus merek dari judul untuk mendapatkan detail model
+        if judul.lower().startswith(merek.lower()):
+            model_detail_from_title = judul[len(merek):].strip()
+            if model_detail_from_title: # Jika ada sisa setelah merek
+                model_detail = model_detail_from_title
+
+    # --- ID Listing (kunci indeks re-crawl; tidak ikut ditulis ke CSV) ---
+    listing_id = a.atribut(item_html, 'data-listing-id') or a.atribut(item_html, 'id')
+    if not listing_id and title_a is not None:
+        href = a.atribut(title_a, 'href')
+        if href and href != '#':
+            listing_id = href
+
+    if not (judul and harga):
+        return None
+    return {
+        'Judul': judul,
+        'Merek': merek,
+        'Model_Detail': model_detail,
+        'Harga': harga,
+        'Tahun': tahun,
+        'Kilometer': kilometer,
+        'Lokasi': lokasi,
+        'SumberURL': source_url,
+        'ListingID': listing_id
+    }
+
+
+def _ekstrak_listing(root, source_url, adapter):
     mobil_data_list = []
-    
-    # Selector utama untuk container listing, ini seharusnya sudah benar
-    listings = soup.find_all('article', class_='listing--card')
-    
+    listings = adapter.kartu(root)
     logging.info(f"Menemukan {len(listings)} listing dengan selector 'article', class_='listing--card'.")
-
-    for item_html in listings: # item_html adalah satu <article>
+    for item_html in listings:
         try:
-            # --- Ekstraksi Judul ---
-            # Cara 1: Dari data-display-title di <article> (lebih disukai jika ada dan bersih)
-            judul = item_html.get('data-display-title')
-            if not judul: # Cara 2: Fallback ke h2 > a
-                title_h2 = item_html.find('h2', class_='listing__title')
-                if title_h2:
-                    title_a = title_h2.find('a')
-                    if title_a:
-                        judul = title_a.text.strip()
-            
-            # --- Ekstraksi Harga ---
-            price_div = item_html.find('div', class_='listing__price')
-            harga_text = price_div.text.strip() if price_div else None
-            harga = parse_price_to_int(harga_text)
-            # Jika harga dari div kosong, bisa coba ambil dari data-title di article (perlu parsing ekstra)
-            if not harga:
-                data_title_price = item_html.get('data-title')
-                if data_title_price:
-                    price_match_in_title = re.search(r'\(Rp\s*([\d.,]+)\)', data_title_price)
-                    if price_match_in_title:
-                        harga = parse_price_to_int(price_match_in_title.group(1))
-
-
-            # --- Ekstraksi Tahun ---
-            # Dari atribut data-year di <article> (paling akurat)
-            tahun_str = item_html.get('data-year')
-            tahun = parse_year_to_int(tahun_str)
-
-            # --- Ekstraksi Kilometer ---
-            # Dari atribut data-mileage di <article> (paling akurat)
-            km_str = item_html.get('data-mileage')
-            kilometer = parse_km_to_int(km_str)
-            
-            # Jika tahun atau km masih kosong dari data-atribut, coba dari listing__specs
-            if tahun is None or kilometer is None:
-                specs_div = item_html.find('div', class_='listing__specs')
-                if specs_div:
-                    items_spec = specs_div.find_all('div', class_='item')
-                    for spec_item in items_spec:
-                        icon_element = spec_item.find('i', class_='icon')
-                        if icon_element:
-                            # Kilometer dari icon--meter
-                            if 'icon--meter' in icon_element.get('class', []) and kilometer is None:
-                                km_text_from_spec = spec_item.text.strip() # Ambil semua teks di div item ini
-                                kilometer = parse_km_to_int(km_text_from_spec) # parse_km_to_int akan membersihkan
-                            # Tahun bisa jadi tidak ada di sini, karena sudah jelas dari data-year
-                            # Lokasi
-                            # if 'icon--location' in icon_element.get('class', []) and lokasi is None:
-                            #     lokasi = spec_item.text.strip().replace(icon_element.text, '').strip() # Ambil teks setelah icon
-
-            # --- Ekstraksi Lokasi ---
-            lokasi = None
-            specs_div_for_loc = item_html.find('div', class_='listing__specs')
-            if specs_div_for_loc:
-                items_spec_for_loc = specs_div_for_loc.find_all('div', class_='item')
-                for spec_item_loc in items_spec_for_loc:
-                    icon_loc = spec_item_loc.find('i', class_='icon--location')
-                    if icon_loc:
-                        # Ambil teks dari parent div.item, lalu hapus teks dari icon jika perlu, atau ambil sibling text
-                        # Cara lebih aman: ambil semua teks dari div.item dan bersihkan
-                        lokasi_text_raw = spec_item_loc.text.strip()
-                        # Hapus teks icon jika ada, atau cari cara lain untuk mendapatkan teks bersihnya
-                        # Untuk kasus ini, icon tidak punya teks, jadi teks di div.item adalah lokasinya.
-                        lokasi = lokasi_text_raw.strip() # Seharusnya "DKI Jakarta"
-                        break # Sudah ketemu lokasi
-
-            # --- Ekstraksi Merek & Model ---
-            # Dari atribut data-make dan data-model di <article>
-            merek = item_html.get('data-make')
-            model_utama = item_html.get('data-model') # Misal "City"
-            # model_detail bisa dari judul atau data-variant
-            model_variant = item_html.get('data-variant') # Misal "RS Honda Sensing"
-            
-            model_detail = model_utama # Default
-            if model_variant:
-                model_detail = f"{model_utama} {model_variant}" if model_utama else model_variant
-            elif judul and merek: # Jika tidak ada data-variant, coba dari judul
-                # Hapus merek dari judul untuk mendapatkan detail model
-                if judul.lower().startswith(merek.lower()):
-                    model_detail_from_title = judul[len(merek):].strip()
-                    if model_detail_from_title: # Jika ada sisa setelah merek
-                         model_detail = model_detail_from_title
-
-
-            if judul and harga:
-                mobil_data_list.append({
-                    'Judul': judul,
-                    'Merek': merek,
-                    'Model_Detail': model_detail,
-                    'Harga': harga,
-                    'Tahun': tahun,
-                    'Kilometer': kilometer,
-                    'Lokasi': lokasi,
-                    'SumberURL': source_url
-                })
-            # else: # Untuk debugging jika item tidak masuk karena judul/harga kosong
-            #     logging.debug(f"Item dilewati: Judul='{judul}', Harga='{harga}', HTML Cuplikan: {str(item_html)[:200]}")
-
+            record = _ekstrak_kartu(item_html, adapter, source_url)
+            if record is not None:
+                mobil_data_list.append(record)
         except AttributeError as e:
-            logging.warning(f"AttributeError saat parsing listing (elemen tidak ditemukan?): {e}. Melewati item ini. Cek selector. HTML Cuplikan:\n{str(item_html)[:500]}")
-            continue
+            logging.warning(f"AttributeError saat parsing listing (elemen tidak ditemukan?): {e}. Melewati item ini. Cek selector.")
         except Exception as e:
             logging.error(f"Terjadi error umum saat parsing listing: {e}. Melewati item ini.")
-            continue
-            
     return mobil_data_list
 
+
+def extract_listings_from_soup(soup, source_url):
+    """Mengekstrak semua listing mobil dari objek BeautifulSoup satu halaman."""
+    return _ekstrak_listing(soup, source_url, _AdapterBs4)
+
+
+def _parse_bs4(html_content, source_url, fitur, hanya_kartu):
+    from bs4 import SoupStrainer
+    # Regex, bukan string: saat strainer dievaluasi atribut class masih berupa string utuh ("listing listing--card")
+    parse_only = SoupStrainer('article', class_=re.compile(r'(^|\s)listing--card(\s|$)')) if hanya_kartu else None
+    return extract_listings_from_soup(BeautifulSoup(html_content, fitur, parse_only=parse_only), source_url)
+
+
+def _parse_selectolax(html_content, source_url):
+    from selectolax.lexbor import LexborHTMLParser
+    return _ekstrak_listing(LexborHTMLParser(html_content), source_url, _AdapterSelectolax)
+
+
+# Nama backend -> fungsi parse(html, url). lxml & selectolax opsional (pip install lxml selectolax).
+BACKEND_PARSER = {
+    'html.parser': lambda html_content, url: _parse_bs4(html_content, url, 'html.parser', False),
+    'strainer': lambda html_content, url: _parse_bs4(html_content, url, 'html.parser', True),
+    'lxml': lambda html_content, url: _parse_bs4(html_content, url, 'lxml', False),
+    'lxml-strainer': lambda html_content, url: _parse_bs4(html_content, url, 'lxml', True),
+    'selectolax': _parse_selectolax,
+}
+MODUL_BACKEND = {'lxml': 'lxml', 'lxml-strainer': 'lxml', 'selectolax': 'selectolax'}
+
+
+def backend_tersedia():
+    """Backend parser yang dependency-nya terpasang."""
+    import importlib.util
+    return [nama for nama in BACKEND_PARSER
+            if nama not in MODUL_BACKEND or importlib.util.find_spec(MODUL_BACKEND[nama]) is not None]
+
 # --- FUNGSI UTAMA SCRAPING (main_scraper) ---
 # Pastikan BASE_URL di main_scraper sudah benar
 # BASE_URL = 'https://www.mobil123.com/mobil-bekas-dijual/indonesia'
@@ -206,75 +285,303 @@ def extract_listings_from_soup(soup, source_url):
 # logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+def buat_url_halaman(base_url, page_num):
+    """URL halaman ke-page_num. Mobil123 menggunakan ?page=N (atau &page=N jika sudah ada query)."""
+    if page_num == 1:
+        return base_url
+    return f"{base_url}&page={page_num}" if '?' in base_url else f"{base_url}?page={page_num}"
+
+
+def parse_halaman(html_content, source_url, backend=PARSER_BACKEND):
+    """Parse HTML satu halaman menjadi list record listing dengan backend parser terpilih."""
+    if backend not in backend_tersedia():
+        raise ValueError(f"Backend parser '{backend}' tidak tersedia. Pilihan terpasang: {backend_tersedia()}")
+    return BACKEND_PARSER[backend](html_content, source_url)
+
+
+def buka_checkpoint(output_filename, resume):
+    """CrawlCheckpoint untuk output_filename. Mengembalikan None jika crawl sebelumnya sudah selesai."""
+    from crawl_checkpoint import CrawlCheckpoint
+    checkpoint = CrawlCheckpoint(output_filename, KOLOM_OUTPUT, resume=resume)
+    if checkpoint.selesai:
+        logging.info(f"Crawl ke {output_filename} sudah selesai sebelumnya ({checkpoint.jumlah_baris} baris). "
+                     f"Gunakan --no-resume untuk crawl ulang dari awal.")
+        return None
+    return checkpoint
+
+
+def proses_halaman(nomor, data, checkpoint, indeks=None, pemantau=None):
+    """Mencatat hasil satu halaman ke checkpoint (dan indeks listing jika mode inkremental).
+
+    Mengembalikan nomor halaman akhir (eksklusif) jika pagination harus berhenti, selain itu None.
+    """
+    if not data and nomor > 1:  # Halaman kosong: akhir pagination
+        checkpoint.tandai_halaman_akhir(nomor)
+        return nomor
+    if indeks is None:
+        checkpoint.tambah_halaman(nomor, data)
+        return None
+    baru_atau_berubah, jumlah_tetap = indeks.periksa_dan_catat(data)
+    checkpoint.tambah_halaman(nomor, baru_atau_berubah)
+    indeks.commit()  # Setelah baris halaman ini tersimpan di CSV
+    logging.info(f"Halaman {nomor}: {len(baru_atau_berubah)} listing baru/berubah, {jumlah_tetap} tidak berubah.")
+    halaman_akhir = pemantau.catat(nomor, len(baru_atau_berubah), jumlah_tetap)
+    if halaman_akhir is not None:
+        logging.info(f"{pemantau.batas} halaman berurutan tanpa perubahan. Re-crawl berhenti sebelum halaman {halaman_akhir}.")
+        checkpoint.tandai_halaman_akhir(halaman_akhir)
+    return halaman_akhir
+
+
+def buka_indeks(indeks_db):
+    """(IndeksListing, PemantauBerhenti) untuk mode inkremental, atau (None, None)."""
+    if not indeks_db:
+        return None, None
+    from listing_index import IndeksListing, PemantauBerhenti
+    indeks = IndeksListing(indeks_db)
+    logging.info(f"Mode inkremental: {indeks.jumlah_listing()} listing sudah dikenal di {indeks_db}.")
+    return indeks, PemantauBerhenti()
+
+
+def ringkas_hasil_csv(checkpoint):
+    """Log ringkasan hasil crawl (data sudah tersimpan bertahap oleh checkpoint)."""
+    if checkpoint.jumlah_baris == 0:
+        logging.info("\nScraping selesai. Tidak ada data yang berhasil di-scrape.")
+        return
+    logging.info(f"\nScraping selesai. Data berhasil disimpan ke {checkpoint.output_csv}")
+    logging.info(f"Total data terkumpul: {checkpoint.jumlah_baris} item.")
+    print("\nContoh 5 data pertama yang berhasil di-scrape:")
+    print(pd.read_csv(checkpoint.output_csv, nrows=5))
+
+
 # --- FUNGSI UTAMA SCRAPING ---
-def main_scraper():
-    """Fungsi utama untuk menjalankan proses scraping."""
-    all_scraped_data = []
-    
+def main_scraper(base_url=BASE_URL, max_pages=MAX_PAGES_TO_SCRAPE, output_filename=OUTPUT_FILENAME,
+                 request_delay=REQUEST_DELAY_SECONDS, resume=True, indeks_db=None, parser_backend=PARSER_BACKEND):
+    """Fungsi utama untuk menjalankan proses scraping.
+
+    indeks_db: path SQLite indeks listing; jika diisi hanya listing baru/berubah yang ditulis (re-crawl inkremental).
+    parser_backend: nama backend di BACKEND_PARSER.
+    """
     # Pastikan User-Agent sudah diisi
     if USER_AGENT_STRING == 'YOUR_USER_AGENT_STRING_HERE' or not USER_AGENT_STRING:
         logging.error("USER_AGENT_STRING belum diatur. Harap isi dengan User-Agent dari browser Anda.")
         return
 
-    logging.info(f"Memulai scraping dari {BASE_URL} untuk maksimal {MAX_PAGES_TO_SCRAPE} halaman.")
+    checkpoint = buka_checkpoint(output_filename, resume)
+    if checkpoint is None:
+        return
+    indeks, pemantau = buka_indeks(indeks_db)
+    logging.info(f"Memulai scraping dari {base_url} untuk maksimal {max_pages} halaman.")
 
-    for page_num in range(1, MAX_PAGES_TO_SCRAPE + 1):
+    selesai = True
+    for page_num in checkpoint.halaman_tersisa(max_pages):
         logging.info(f"--- Memproses Halaman {page_num} ---")
-        
-        if page_num == 1:
-            current_url = BASE_URL
-        else:
-            # Logika URL untuk halaman berikutnya. Mobil123 menggunakan ?page=N
-            # Cek jika BASE_URL sudah punya query parameter (misalnya dari filter)
-            if '?' in BASE_URL:
-                 current_url = f"{BASE_URL}&page={page_num}"
-            else:
-                 current_url = f"{BASE_URL}?page={page_num}"
+        current_url = buat_url_halaman(base_url, page_num)
 
         html_content = fetch_page_content(current_url, HEADERS)
         
         if html_content:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            data_from_page = extract_listings_from_soup(soup, current_url)
+            data_from_page = parse_halaman(html_content, current_url, parser_backend)
             
+            halaman_akhir = proses_halaman(page_num, data_from_page, checkpoint, indeks, pemantau)
             if not data_from_page and page_num > 1 : # Jika tidak ada data di halaman ini (setelah halaman 1)
                 logging.info(f"Tidak ada data lagi ditemukan di halaman {page_num}. Menghentikan pagination.")
                 break # Keluar dari loop jika tidak ada data lagi
+            if halaman_akhir is not None:
+                break
                 
-            all_scraped_data.extend(data_from_page)
             logging.info(f"Berhasil scrape {len(data_from_page)} item dari halaman {page_num}.")
         else:
             logging.warning(f"Gagal mengambil konten halaman {page_num}. Mungkin sudah halaman terakhir atau ada masalah jaringan.")
-            # Jika gagal di halaman > 1, anggap sudah habis atau ada masalah persisten
+            # Halaman ini (termasuk halaman 1) tidak dicatat selesai sehingga diambil ulang saat resume.
+            selesai = False
+            # Jika gagal di halaman > 1, anggap sudah habis atau ada masalah persisten.
             if page_num > 1:
                  break 
             
         # Beri jeda antar request halaman
-        logging.info(f"Menunggu {REQUEST_DELAY_SECONDS} detik sebelum halaman berikutnya...")
-        time.sleep(REQUEST_DELAY_SECONDS)
+        logging.info(f"Menunggu {request_delay} detik sebelum halaman berikutnya...")
+        time.sleep(request_delay)
 
-    # --- Menyimpan Data ke CSV ---
-    if all_scraped_data:
-        df = pd.DataFrame(all_scraped_data)
-        
-        # Urutkan kolom agar lebih rapi (opsional)
-        kolom_urut = ['Judul', 'Merek', 'Model_Detail', 'Harga', 'Tahun', 'Kilometer', 'Lokasi', 'SumberURL']
-        # Hanya ambil kolom yang ada di DataFrame, antisipasi jika ada kolom yang tidak ter-scrape
-        kolom_urut_valid = [kolom for kolom in kolom_urut if kolom in df.columns]
-        df = df[kolom_urut_valid]
-        
-        try:
-            df.to_csv(OUTPUT_FILENAME, index=False, encoding='utf-8')
-            logging.info(f"\nScraping selesai. Data berhasil disimpan ke {OUTPUT_FILENAME}")
-            logging.info(f"Total data terkumpul: {len(df)} item.")
-            print("\nContoh 5 data pertama yang berhasil di-scrape:")
-            print(df.head())
-        except Exception as e:
-            logging.error(f"Gagal menyimpan data ke CSV: {e}")
-            
-    else:
-        logging.info("\nScraping selesai. Tidak ada data yang berhasil di-scrape.")
+    # --- Menutup CSV & checkpoint ---
+    checkpoint.tutup(selesai)
+    if indeks is not None:
+        indeks.tutup()
+    ringkas_hasil_csv(checkpoint)
+
+
+def main_scraper_async(base_url=BASE_URL, max_pages=MAX_PAGES_TO_SCRAPE, output_filename=OUTPUT_FILENAME,
+                       concurrency=ASYNC_CONCURRENCY, rate_per_detik=ASYNC_RATE_PER_DETIK, resume=True, indeks_db=None,
+                       parser_backend=PARSER_BACKEND):
+    """Scraping konkuren (asyncio) dengan rate limit token bucket per host dan retry backoff."""
+    from fetcher_async import AsyncFetcher, crawl_halaman
+
+    if USER_AGENT_STRING == 'YOUR_USER_AGENT_STRING_HERE' or not USER_AGENT_STRING:
+        logging.error("USER_AGENT_STRING belum diatur. Harap isi dengan User-Agent dari browser Anda.")
+        return
+
+    checkpoint = buka_checkpoint(output_filename, resume)
+    if checkpoint is None:
+        return
+    indeks, pemantau = buka_indeks(indeks_db)
+    daftar_halaman = checkpoint.halaman_tersisa(max_pages)
+    logging.info(f"Memulai scraping async dari {base_url}: {len(daftar_halaman)} halaman tersisa dari maksimal {max_pages} "
+                 f"(concurrency={concurrency}, rate={rate_per_detik}/detik).")
+    halaman_gagal = []
+
+    def on_halaman(nomor, records):
+        if records is None:
+            halaman_gagal.append(nomor)  # tidak dicatat selesai, diambil ulang saat resume
+            return None
+        return proses_halaman(nomor, records, checkpoint, indeks, pemantau)
+
+    fetcher = AsyncFetcher(HEADERS, concurrency=concurrency, rate_per_detik=rate_per_detik)
+    waktu_mulai = time.perf_counter()
+    try:
+        asyncio.run(crawl_halaman(fetcher, lambda nomor: buat_url_halaman(base_url, nomor), max_pages,
+                                  functools.partial(parse_halaman, backend=parser_backend),
+                                  daftar_halaman=daftar_halaman, on_halaman=on_halaman))
+    finally:
+        fetcher.tutup()
+        checkpoint.tutup(selesai=not halaman_gagal)
+        if indeks is not None:
+            indeks.tutup()
+    logging.info(f"Crawl selesai dalam {time.perf_counter() - waktu_mulai:.1f} detik. Statistik fetch: {fetcher.statistik}")
+    if halaman_gagal:
+        logging.warning(f"Halaman gagal diambil: {sorted(halaman_gagal)}. Jalankan ulang untuk melanjutkan dari checkpoint.")
+    ringkas_hasil_csv(checkpoint)
+
+
+# --- MODE PIPELINE: FETCH -> ARSIP HTML -> PARSE (PROCESS POOL) -> WRITER ---
+
+def _parse_file_halaman(path, source_url, backend):
+    """Worker tahap parse (proses terpisah): baca HTML dari arsip lalu parse."""
+    from page_store import baca_halaman
+    return parse_halaman(baca_halaman(path), source_url, backend)
+
+
+def buat_pool_parse(parse_workers):
+    """Process pool tahap parse. Dengan fork, semua proses dibuat pada submit pertama, jadi pool
+    dipanaskan di sini sebelum thread fetch berjalan (fork dari proses multi-thread rawan deadlock)."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    konteks = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+    pool = ProcessPoolExecutor(max_workers=max(1, parse_workers), mp_context=konteks)
+    pool.submit(int).result()
+    return pool
+
+
+def main_scraper_pipeline(base_url=BASE_URL, max_pages=MAX_PAGES_TO_SCRAPE, output_filename=OUTPUT_FILENAME,
+                          arsip_dir=ARSIP_HALAMAN_DIR, concurrency=ASYNC_CONCURRENCY, rate_per_detik=ASYNC_RATE_PER_DETIK,
+                          parse_workers=PARSE_WORKERS, resume=True, indeks_db=None, parser_backend=PARSER_BACKEND):
+    """Seperti main_scraper_async, tetapi HTML mentah diarsipkan ke arsip_dir (gzip) dan di-parse di process pool.
+
+    Arsip bisa di-parse ulang tanpa mengakses situs lagi dengan parse_ulang_arsip().
+    """
+    from fetcher_async import AsyncFetcher, crawl_pipeline
+    from page_store import PenyimpanHalaman
+
+    if USER_AGENT_STRING == 'YOUR_USER_AGENT_STRING_HERE' or not USER_AGENT_STRING:
+        logging.error("USER_AGENT_STRING belum diatur. Harap isi dengan User-Agent dari browser Anda.")
+        return
+    if parser_backend not in backend_tersedia():
+        raise ValueError(f"Backend parser '{parser_backend}' tidak tersedia. Pilihan terpasang: {backend_tersedia()}")
+
+    checkpoint = buka_checkpoint(output_filename, resume)
+    if checkpoint is None:
+        return
+    indeks, pemantau = buka_indeks(indeks_db)
+    arsip = PenyimpanHalaman(arsip_dir)
+    daftar_halaman = checkpoint.halaman_tersisa(max_pages)
+    logging.info(f"Memulai scraping pipeline dari {base_url}: {len(daftar_halaman)} halaman tersisa "
+                 f"(concurrency={concurrency}, rate={rate_per_detik}/detik, {parse_workers} proses parse, arsip {arsip_dir}).")
+    halaman_gagal = []
+
+    def on_halaman(nomor, records):
+        if records is None:
+            halaman_gagal.append(nomor)  # tidak dicatat selesai, diambil ulang saat resume
+            return None
+        return proses_halaman(nomor, records, checkpoint, indeks, pemantau)
+
+    pool = buat_pool_parse(parse_workers)
+    fetcher = AsyncFetcher(HEADERS, concurrency=concurrency, rate_per_detik=rate_per_detik)
+    waktu_mulai = time.perf_counter()
+    try:
+        asyncio.run(crawl_pipeline(fetcher, lambda nomor: buat_url_halaman(base_url, nomor), max_pages, arsip.simpan,
+                                   functools.partial(_parse_file_halaman, backend=parser_backend), pool, on_halaman,
+                                   daftar_halaman=daftar_halaman))
+    finally:
+        fetcher.tutup()
+        pool.shutdown()
+        checkpoint.tutup(selesai=not halaman_gagal)
+        if indeks is not None:
+            indeks.tutup()
+    logging.info(f"Crawl selesai dalam {time.perf_counter() - waktu_mulai:.1f} detik. Statistik fetch: {fetcher.statistik}")
+    if halaman_gagal:
+        logging.warning(f"Halaman gagal diambil: {sorted(halaman_gagal)}. Jalankan ulang untuk melanjutkan dari checkpoint.")
+    ringkas_hasil_csv(checkpoint)
+
+
+def parse_ulang_arsip(arsip_dir=ARSIP_HALAMAN_DIR, output_filename=OUTPUT_FILENAME, parse_workers=PARSE_WORKERS,
+                      parser_backend=PARSER_BACKEND):
+    """Parse ulang semua halaman di arsip ke output_filename tanpa request ke situs (mis. setelah selector diperbaiki)."""
+    from page_store import PenyimpanHalaman
+
+    if parser_backend not in backend_tersedia():
+        raise ValueError(f"Backend parser '{parser_backend}' tidak tersedia. Pilihan terpasang: {backend_tersedia()}")
+    arsip = PenyimpanHalaman(arsip_dir)
+    halaman = arsip.daftar()
+    if not halaman:
+        logging.error(f"Arsip halaman di {arsip_dir} kosong.")
+        return
+    logging.info(f"Parse ulang {len(halaman)} halaman dari {arsip_dir} dengan {parse_workers} proses.")
+    checkpoint = buka_checkpoint(output_filename, resume=False)
+    waktu_mulai = time.perf_counter()
+    with buat_pool_parse(parse_workers) as pool:
+        hasil = pool.map(_parse_file_halaman, [arsip.path_halaman(nomor) for nomor in halaman],
+                         [entri['url'] for entri in halaman.values()], [parser_backend] * len(halaman),
+                         chunksize=max(1, len(halaman) // (4 * max(1, parse_workers))))
+        for nomor, records in zip(halaman, hasil):  # map menjaga urutan halaman
+            if proses_halaman(nomor, records, checkpoint) is not None:
+                break
+    checkpoint.tutup()
+    logging.info(f"Parse ulang selesai dalam {time.perf_counter() - waktu_mulai:.1f} detik.")
+    ringkas_hasil_csv(checkpoint)
 
 # Panggil fungsi utama saat skrip dijalankan
 if __name__ == '__main__':
-    main_scraper()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scraper listing mobil bekas Mobil123.")
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES_TO_SCRAPE)
+    parser.add_argument('--output', default=OUTPUT_FILENAME)
+    parser.add_argument('--sequential', action='store_true',
+                        help=f"Mode lama: satu halaman per request dengan jeda {REQUEST_DELAY_SECONDS} detik.")
+    parser.add_argument('--concurrency', type=int, default=ASYNC_CONCURRENCY)
+    parser.add_argument('--rate', type=float, default=ASYNC_RATE_PER_DETIK, help="Request per detik per host (mode async).")
+    parser.add_argument('--no-resume', action='store_true', help="Abaikan checkpoint dan mulai crawl dari halaman 1.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Re-crawl: tulis hanya listing baru/berubah dan berhenti setelah beberapa halaman tanpa perubahan.")
+    parser.add_argument('--indeks-db', default=os.path.join("data", "indeks_listing.sqlite"))
+    parser.add_argument('--pipeline', action='store_true',
+                        help="Arsipkan HTML mentah ke --arsip-dir dan parse di process pool terpisah dari fetch.")
+    parser.add_argument('--parse-ulang', action='store_true',
+                        help="Parse ulang arsip --arsip-dir ke --output tanpa mengakses situs.")
+    parser.add_argument('--arsip-dir', default=ARSIP_HALAMAN_DIR)
+    parser.add_argument('--parse-workers', type=int, default=PARSE_WORKERS)
+    parser.add_argument('--parser', default=PARSER_BACKEND, choices=list(BACKEND_PARSER),
+                        help="Backend parser HTML (lxml/selectolax perlu dipasang terpisah; bandingkan dengan bench_parser.py).")
+    args = parser.parse_args()
+    if args.parser not in backend_tersedia():
+        parser.error(f"backend parser '{args.parser}' tidak terpasang. Tersedia: {', '.join(backend_tersedia())}")
+
+    indeks_db = args.indeks_db if args.incremental else None
+    if args.parse_ulang:
+        parse_ulang_arsip(args.arsip_dir, args.output, args.parse_workers, args.parser)
+    elif args.pipeline:
+        main_scraper_pipeline(args.base_url, args.max_pages, args.output, args.arsip_dir, args.concurrency, args.rate,
+                              args.parse_workers, resume=not args.no_resume, indeks_db=indeks_db, parser_backend=args.parser)
+    elif args.sequential:
+        main_scraper(args.base_url, args.max_pages, args.output, resume=not args.no_resume, indeks_db=indeks_db,
+                     parser_backend=args.parser)
+    else:
+        main_scraper_async(args.base_url, args.max_pages, args.output, args.concurrency, args.rate,
+                           resume=not args.no_resume, indeks_db=indeks_db, parser_backend=args.parser)
@@ -1,3 +1,6 @@
+import argparse
+import os
+import time
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -6,11 +9,84 @@ from sklearn.preprocessing import RobustScaler
 from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error
 from xgboost import XGBRegressor
 import joblib
+from artifact_model import simpan_artifact, ParameterScaler
+from penyimpanan_data import baca_tabel, rapikan_kategori
+from retrain_model import (AMBANG_DEGRADASI_MAPE, POHON_TAMBAHAN, hapus_state_training, hash_baris_data,
+                           simpan_state_training, warm_start)
+from tuning_model import buat_kandidat, cari_hyperparameter, simpan_hasil_tuning
+
+parser = argparse.ArgumentParser(description="Training model XGBoost prediksi harga mobil.")
+parser.add_argument('--data-path', default=os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv"),
+                    help="CSV, Parquet, atau Feather (dari ekstensi file).")
+parser.add_argument('--output-dir', default=".")
+mode_fitur = parser.add_mutually_exclusive_group()
+mode_fitur.add_argument('--sparse', action='store_true',
+                        help="One-hot disimpan sebagai SciPy CSR, hanya kolom numerik yang di-scale, XGBoost dilatih langsung dari CSR.")
+mode_fitur.add_argument('--categorical', action='store_true',
+                        help="Merek/Model_Detail/Lokasi(/owner) sebagai kode integer dengan dukungan kategorikal native XGBoost.")
+parser.add_argument('--tune', action='store_true',
+                    help="Cari hyperparameter dengan k-fold CV paralel (tuning_model.py) sebelum training model final.")
+parser.add_argument('--tune-mode', choices=['grid', 'random'], default='grid')
+parser.add_argument('--tune-iter', type=int, default=20, help="Jumlah kandidat untuk --tune-mode random.")
+parser.add_argument('--k-fold', type=int, default=5)
+parser.add_argument('--n-jobs', type=int, default=None, help="Jumlah proses trial paralel (default semua core).")
+parser.add_argument('--thread-per-trial', type=int, default=None, help="Thread XGBoost per trial (default core // n-jobs).")
+parser.add_argument('--warm-start', action='store_true',
+                    help="Tambah pohon ke model di --output-dir dengan baris baru saja; training penuh jika MAPE holdout beku memburuk.")
+parser.add_argument('--pohon-tambahan', type=int, default=POHON_TAMBAHAN, help="Jumlah pohon yang ditambahkan saat --warm-start.")
+parser.add_argument('--ambang-mape', type=float, default=AMBANG_DEGRADASI_MAPE,
+                    help="Kenaikan MAPE holdout relatif maksimum untuk --warm-start (0.05 = 5%%).")
+args = parser.parse_args()
+if args.warm_start and (args.sparse or args.categorical or args.tune):
+    parser.error("--warm-start hanya untuk mode dense tanpa --tune.")
+os.makedirs(args.output_dir, exist_ok=True)  # Semua mode menyimpan model/state ke sini (bisa folder baru)
+
+
+def one_hot_sparse(df_src, kolom_kategorikal):
+    """Setara pd.get_dummies(drop_first=True) tetapi menghasilkan CSR. Mengembalikan (matriks CSR, nama kolom)."""
+    from scipy import sparse
+    blok, nama_kolom = [], []
+    for kolom in kolom_kategorikal:
+        kategori = pd.Categorical(df_src[kolom])
+        kode = kategori.codes.astype(np.int64) - 1  # drop_first: kategori pertama jadi baseline (tanpa kolom)
+        baris = np.flatnonzero(kode >= 0)
+        blok.append(sparse.csr_matrix((np.ones(len(baris)), (baris, kode[baris])), shape=(len(df_src), len(kategori.categories) - 1)))
+        nama_kolom += [f"{kolom}_{kat}" for kat in kategori.categories[1:]]
+    return sparse.hstack(blok, format='csr'), nama_kolom
+
+
+def gabung_numerik_sparse(numerik, onehot):
+    """Menggabungkan blok numerik (disimpan eksplisit, termasuk nilai 0) dengan blok one-hot CSR."""
+    from scipy import sparse
+    baris, kolom = np.indices(numerik.shape)
+    blok_numerik = sparse.coo_matrix((numerik.ravel(), (baris.ravel(), kolom.ravel())), shape=numerik.shape)
+    return sparse.hstack([blok_numerik, onehot], format='csr')
+
+
+def encode_kategori(df_src, kolom_kategorikal):
+    """Mengganti kolom kategorikal dengan kode integer. Nilai kosong -> kode len(kategori) (bucket unknown)."""
+    kategori = {}
+    for kolom in kolom_kategorikal:
+        daftar_nilai = sorted(df_src[kolom].dropna().astype(str).unique().tolist())
+        kode = {nilai: i for i, nilai in enumerate(daftar_nilai)}
+        df_src[kolom] = df_src[kolom].astype(str).map(kode).fillna(len(daftar_nilai)).astype(np.int64)
+        kategori[kolom] = daftar_nilai
+    return df_src, kategori
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    except ImportError:  # Windows
+        return None
+
 
 print("--- [INFO] Memulai Skrip Training Model (Versi Asli Disederhanakan) ---")
+print(f"[INFO] Mode fitur: {'sparse (CSR)' if args.sparse else ('kategorikal native' if args.categorical else 'dense')}")
 
 # === 1. Load dan Preprocessing Data ===
-df = pd.read_csv("data\data_mobil_fitur_depresiasi_inflasi.csv") 
+df = baca_tabel(args.data_path)
 print(f"[INFO] Data dimuat. Baris awal: {len(df)}, Kolom awal: {len(df.columns)}")
 print("Kolom awal di df:", df.columns.tolist())
 
@@ -23,13 +99,22 @@ if 'Harga' in df.columns and pd.api.types.is_numeric_dtype(df['Harga']):
     lower_bound = Q1 - 1.5 * IQR
     upper_bound = Q3 + 1.5 * IQR
     mask_harga = (df['Harga'] >= lower_bound) & (df['Harga'] <= upper_bound)
-    df = df[mask_harga].copy()
+    df = rapikan_kategori(df[mask_harga].copy())
     print(f"\n[INFO] Baris setelah filter outlier Harga: {len(df)}")
 else:
     print("[WARNING] Kolom 'Harga' tidak valid untuk outlier removal atau tidak ditemukan.")
 
 if len(df) == 0: print("[ERROR] Tidak ada data setelah filter outlier Harga."); exit()
 
+# a2. Warm-start: lanjutkan model yang ada dengan baris baru (fallback ke training penuh di bawah)
+if args.warm_start:
+    print("\n--- [INFO] Mencoba Warm-Start Model ---")
+    if warm_start(df, args.output_dir, args.pohon_tambahan, args.ambang_mape):
+        print("\n--- [SUCCESS] Warm-Start Model Selesai ---")
+        exit()
+    print("[INFO] Fallback ke training penuh.")
+hash_data_training = hash_baris_data(df)
+
 # b. Log Transform Target Variabel 'Harga'
 df['Harga'] = np.log1p(df['Harga'])
 print("[INFO] Kolom 'Harga' di-log transform.")
@@ -38,14 +123,24 @@ print("[INFO] Kolom 'Harga' di-log transform.")
 categorical_cols_to_encode = ['Merek', 'Model_Detail', 'Lokasi']
 categorical_cols_to_encode = [col for col in categorical_cols_to_encode if col in df.columns]
 
-if categorical_cols_to_encode:
+kategori_training = None
+if args.categorical and categorical_cols_to_encode:
+    if 'owner' in df.columns: categorical_cols_to_encode.append('owner')
+    df, kategori_training = encode_kategori(df, categorical_cols_to_encode)
+    print(f"[INFO] Kode kategori native diterapkan pada: " + ", ".join(f"{k} ({len(v)} nilai)" for k, v in kategori_training.items()))
+elif args.sparse and categorical_cols_to_encode:
+    X_onehot_sparse, onehot_columns = one_hot_sparse(df, categorical_cols_to_encode)
+    df = df.drop(columns=categorical_cols_to_encode)
+    print(f"[INFO] One-Hot Encoding (CSR, {X_onehot_sparse.shape[1]} kolom, nnz={X_onehot_sparse.nnz}) diterapkan pada: {categorical_cols_to_encode}")
+elif categorical_cols_to_encode:
     df = pd.get_dummies(df, columns=categorical_cols_to_encode, prefix=categorical_cols_to_encode, drop_first=True)
     print(f"[INFO] One-Hot Encoding diterapkan pada: {categorical_cols_to_encode}")
 else:
     print("[INFO] Tidak ada kolom kategorikal yang di One-Hot Encode dari daftar.")
 
-print("\n[INFO] Kolom DataFrame SETELAH get_dummies:")
-print(df.columns.tolist())
+if not args.sparse and not args.categorical:
+    print("\n[INFO] Kolom DataFrame SETELAH get_dummies:")
+    print(df.columns.tolist())
 
 # d. Definisikan Fitur (X) dan Target (y)
 cols_to_drop_for_X = ['Harga', 'DepresiasiRiilNormal_PersenPerThn', 'Judul',
@@ -56,31 +151,95 @@ X = df.drop(columns=cols_to_drop_existing)
 y = df['Harga']
 
 X_columns_for_model = X.columns.tolist()
+if args.sparse:
+    X_numeric_columns = X_columns_for_model
+    X_columns_for_model = X_numeric_columns + onehot_columns
 print(f"\n[INFO] Fitur (X) yang akan digunakan model ({len(X_columns_for_model)} kolom):")
 print(X_columns_for_model[:5], "...", X_columns_for_model[-5:] if len(X_columns_for_model) > 10 else X_columns_for_model)
 
 
 # e. Train-Test Split
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
+if args.sparse:
+    # Split indeks baris (permutasi sama dengan split DataFrame X pada random_state yang sama)
+    idx_train, idx_test = train_test_split(np.arange(len(X)), test_size=0.3, random_state=42)
+    X_train, X_test = X.iloc[idx_train], X.iloc[idx_test]
+    y_train, y_test = y.iloc[idx_train], y.iloc[idx_test]
+else:
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42)
 print(f"[INFO] Data di-split. Ukuran X_train: {X_train.shape}, Ukuran X_test: {X_test.shape}")
 
 # f. Scaling Fitur
 scaler = RobustScaler()
 X_train_proc = scaler.fit_transform(X_train)
 X_test_proc = scaler.transform(X_test)      
+if args.sparse:
+    # Hanya kolom numerik yang di-scale; blok one-hot tetap CSR (0 tidak disimpan = missing bagi XGBoost)
+    X_train_proc = gabung_numerik_sparse(X_train_proc, X_onehot_sparse[idx_train])
+    X_test_proc = gabung_numerik_sparse(X_test_proc, X_onehot_sparse[idx_test])
+    n_onehot = len(onehot_columns)
+    scaler = ParameterScaler(
+        np.concatenate([scaler.center_, np.zeros(n_onehot)]),
+        np.concatenate([scaler.scale_, np.ones(n_onehot)]),
+        np.concatenate([np.zeros(len(X_numeric_columns), dtype=bool), np.ones(n_onehot, dtype=bool)]),
+    )
+if args.categorical:
+    # Kode kategori tidak di-scale (center 0, scale 1) agar kode tetap integer bagi XGBoost
+    kolom_numerik = [kolom for kolom in X_columns_for_model if kolom not in kategori_training]
+    idx_numerik = [X_columns_for_model.index(kolom) for kolom in kolom_numerik]
+    scaler_numerik = RobustScaler().fit(X_train[kolom_numerik])
+    center, scale = np.zeros(len(X_columns_for_model)), np.ones(len(X_columns_for_model))
+    center[idx_numerik], scale[idx_numerik] = scaler_numerik.center_, scaler_numerik.scale_
+    scaler = ParameterScaler(center, scale)
+    X_train_proc = scaler.transform(X_train.to_numpy(dtype=np.float64))
+    X_test_proc = scaler.transform(X_test.to_numpy(dtype=np.float64))
 print("[INFO] Scaling diterapkan pada X_train dan X_test.")
 
 # === 2. Melatih Model XGBoost ===
+params_tetap = {}
+if args.categorical:
+    tipe_fitur = ['c' if kolom in kategori_training else 'q' for kolom in X_columns_for_model]
+    params_tetap = dict(enable_categorical=True, tree_method='hist', feature_types=tipe_fitur)
+params_model = dict(n_estimators=100, learning_rate=0.1, max_depth=6)
+
+if args.tune:
+    # CV hanya pada data train; data test tetap untuk evaluasi akhir
+    print("\n--- [INFO] Memulai Pencarian Hyperparameter ---")
+    waktu_mulai_tuning = time.perf_counter()
+    leaderboard = cari_hyperparameter(X_train_proc, y_train.to_numpy(), buat_kandidat(mode=args.tune_mode, n_iter=args.tune_iter),
+                                      params_tetap, k_fold=args.k_fold, n_jobs=args.n_jobs, thread_per_trial=args.thread_per_trial)
+    params_model = simpan_hasil_tuning(leaderboard, args.output_dir)
+    print(f"[INFO] Waktu tuning: {time.perf_counter() - waktu_mulai_tuning:.2f} detik")
+    print(f"[INFO] Parameter terbaik (MAPE CV {leaderboard.iloc[0]['mape_mean']:.2f}%): {params_model}")
+    print(f"[INFO] Leaderboard disimpan ke '{os.path.join(args.output_dir, 'leaderboard_tuning.csv')}'")
+
 print("\n--- [INFO] Memulai Pelatihan Model XGBoost ---")
-model = XGBRegressor(n_estimators=100, learning_rate=0.1, max_depth=6, random_state=42)
+model = XGBRegressor(**params_model, random_state=42, **params_tetap)
+waktu_mulai_training = time.perf_counter()
 model.fit(X_train_proc, y_train)
-print("--- [INFO] Pelatihan Model XGBoost Selesai ---")
+waktu_training = time.perf_counter() - waktu_mulai_training
+print(f"--- [INFO] Pelatihan Model XGBoost Selesai ({waktu_training:.2f} detik) ---")
 
 # === 3. Simpan Model dan Komponennya ===
-MODEL_SAVE_PATH = "xgboost_mobil_model_v3.pkl"
-joblib.dump((model, scaler, X_columns_for_model), MODEL_SAVE_PATH)
+MODEL_SAVE_PATH = os.path.join(args.output_dir, "xgboost_mobil_model_v3.pkl")
+if kategori_training is not None:
+    # Mode kategorikal: item ke-4 berisi kamus kategori untuk encoder saat serving
+    joblib.dump((model, scaler, X_columns_for_model, kategori_training), MODEL_SAVE_PATH)
+else:
+    joblib.dump((model, scaler, X_columns_for_model), MODEL_SAVE_PATH)
 print(f"\n[INFO] Model, scaler, dan X.columns (sebelum scaling) berhasil disimpan ke '{MODEL_SAVE_PATH}'")
 
+# Artifact fast-start (booster UBJSON + center_/scale_ .npy + manifest) untuk worker serving
+ARTIFACT_SAVE_DIR = os.path.join(args.output_dir, "xgboost_mobil_model_v3")
+simpan_artifact(model, scaler, X_columns_for_model, ARTIFACT_SAVE_DIR, kategori_training)
+print(f"[INFO] Artifact fast-start berhasil disimpan ke direktori '{ARTIFACT_SAVE_DIR}'")
+
+# Holdout beku + hash baris training untuk --warm-start berikutnya (hanya mode dense)
+if args.sparse or args.categorical:
+    hapus_state_training(args.output_dir)
+else:
+    simpan_state_training(X_test, y_test, hash_data_training, args.output_dir)
+    print("[INFO] Holdout beku dan hash baris training disimpan untuk --warm-start.")
+
 # === 4. Prediksi dan Evaluasi pada Data Test ===
 print("\n--- [INFO] Melakukan Prediksi pada Data Test ---")
 y_pred_log = model.predict(X_test_proc)
@@ -93,6 +252,9 @@ mape = mean_absolute_percentage_error(y_test_inv, y_pred_inv) * 100
 print(f"\n📉 Evaluasi Model pada Data Test:")
 print(f"   MAE (Rp): {mae:,.0f}")
 print(f"   MAPE: {mape:.2f}%")
+print(f"[INFO] Waktu training: {waktu_training:.2f} detik")
+if peak_rss_mb() is not None:
+    print(f"[INFO] Peak RSS: {peak_rss_mb():.1f} MB")
 
 # === 5. Visualisasi Prediksi vs Aktual ===
 print("\n--- [INFO] Membuat Visualisasi Prediksi vs Aktual ---")
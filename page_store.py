@@ -0,0 +1,64 @@
+# page_store.py
+
+import gzip
+import json
+import os
+from datetime import datetime
+
+# --- KONFIGURASI PAGE STORE ---
+PAGE_STORE_DIR = os.path.join("data", "arsip_halaman")
+LEVEL_KOMPRESI = 6                 # gzip 1-9; HTML listing terkompresi ~8-10x pada level 6
+POLA_FILE_HALAMAN = "halaman_{:06d}.html.gz"
+NAMA_FILE_MANIFEST = "manifest.jsonl"
+
+
+class PenyimpanHalaman:
+    """Arsip HTML mentah hasil crawl: satu file gzip per halaman + manifest.jsonl (nomor, url, waktu, ukuran).
+
+    Tahap fetch menulis ke sini dan tahap parse membaca dari sini, sehingga crawl yang sudah diarsipkan
+    bisa di-parse ulang (mis. setelah selector diperbaiki) tanpa mengakses situs lagi. Halaman yang
+    diambil ulang menimpa file lama; entri manifest terakhir yang berlaku.
+    """
+
+    def __init__(self, store_dir=PAGE_STORE_DIR, level_kompresi=LEVEL_KOMPRESI):
+        self.store_dir = store_dir
+        self.level_kompresi = level_kompresi
+        self.path_manifest = os.path.join(store_dir, NAMA_FILE_MANIFEST)
+        os.makedirs(store_dir, exist_ok=True)
+
+    def path_halaman(self, nomor):
+        return os.path.join(self.store_dir, POLA_FILE_HALAMAN.format(nomor))
+
+    def simpan(self, nomor, url, html_content):
+        """Menulis HTML halaman (atomik) lalu mencatatnya di manifest. Mengembalikan path file."""
+        path = self.path_halaman(nomor)
+        data = html_content.encode('utf-8')
+        with open(path + ".tmp", 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=self.level_kompresi, mtime=0))
+        os.replace(path + ".tmp", path)
+        entri = {'nomor': nomor, 'url': url, 'waktu': datetime.now().isoformat(timespec='seconds'),
+                 'ukuran': len(data), 'ukuran_gzip': os.path.getsize(path)}
+        with open(self.path_manifest, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entri) + '\n')
+        return path
+
+    def daftar(self):
+        """{nomor: entri manifest terakhir} untuk halaman yang filenya ada, terurut nomor halaman."""
+        if not os.path.exists(self.path_manifest):
+            return {}
+        entri_per_halaman = {}
+        with open(self.path_manifest, encoding='utf-8') as f:
+            for baris in f:
+                try:
+                    entri = json.loads(baris)
+                except json.JSONDecodeError:  # baris terakhir terpotong karena crash saat append
+                    continue
+                entri_per_halaman[entri['nomor']] = entri
+        return {nomor: entri for nomor, entri in sorted(entri_per_halaman.items())
+                if os.path.exists(self.path_halaman(nomor))}
+
+
+def baca_halaman(path):
+    """HTML satu halaman dari file arsip (dipanggil di proses worker parse)."""
+    with open(path, 'rb') as f:
+        return gzip.decompress(f.read()).decode('utf-8')
@@ -0,0 +1,136 @@
+# penyimpanan_data.py
+
+import os
+
+import pandas as pd
+
+# --- KONFIGURASI FORMAT DATA ---
+EKSTENSI_FORMAT = {'.csv': 'csv', '.parquet': 'parquet', '.feather': 'feather'}
+KOLOM_KATEGORI = ['Merek', 'Model_Detail', 'Lokasi']   # Disimpan sebagai dictionary/category di Parquet/Feather
+KOMPRESI_PARQUET = 'zstd'
+KOLOM_DROPDOWN = ['Merek', 'Model_Detail', 'Lokasi']   # Kolom yang dibutuhkan app.py untuk opsi dropdown
+
+
+def format_dari_path(path):
+    """'csv' | 'parquet' | 'feather' berdasarkan ekstensi file."""
+    ekstensi = os.path.splitext(path)[1].lower()
+    if ekstensi not in EKSTENSI_FORMAT:
+        raise ValueError(f"Format file '{path}' tidak dikenali. Gunakan salah satu: {', '.join(EKSTENSI_FORMAT)}")
+    return EKSTENSI_FORMAT[ekstensi]
+
+
+def ganti_format(path, format_data):
+    """Path yang sama dengan ekstensi format_data (mis. data.csv -> data.parquet)."""
+    ekstensi = {format_data: ekstensi for ekstensi, format_data in EKSTENSI_FORMAT.items()}[format_data]
+    return os.path.splitext(path)[0] + ekstensi
+
+
+def baca_tabel(path, kolom=None):
+    """Membaca CSV/Parquet/Feather. kolom: hanya kolom ini yang dibaca (Parquet/Feather tidak mem-parse sisanya).
+
+    Dari Parquet/Feather, KOLOM_KATEGORI dikembalikan sebagai dtype category.
+    """
+    format_data = format_dari_path(path)
+    if format_data == 'parquet':
+        return pd.read_parquet(path, columns=kolom)
+    if format_data == 'feather':
+        return pd.read_feather(path, columns=kolom)
+    return pd.read_csv(path, usecols=kolom)
+
+
+def tulis_tabel(df, path):
+    """Menulis df sesuai ekstensi path. Parquet/Feather: KOLOM_KATEGORI disimpan sebagai category (dictionary encoded)."""
+    format_data = format_dari_path(path)
+    if format_data == 'csv':
+        df.to_csv(path, index=False, encoding='utf-8')
+        return
+    df = df.reset_index(drop=True)
+    for kolom in KOLOM_KATEGORI:
+        if kolom in df.columns and not isinstance(df[kolom].dtype, pd.CategoricalDtype):
+            df[kolom] = df[kolom].astype('category')
+    if format_data == 'parquet':
+        df.to_parquet(path, index=False, compression=KOMPRESI_PARQUET)
+    else:
+        df.to_feather(path)
+
+
+def rapikan_kategori(df):
+    """Buang kategori yang tidak lagi muncul setelah filter baris, agar get_dummies/Categorical menghasilkan
+    kolom yang sama dengan data dari CSV."""
+    for kolom in df.columns:
+        if isinstance(df[kolom].dtype, pd.CategoricalDtype):
+            df[kolom] = df[kolom].cat.remove_unused_categories()
+    return df
+
+
+def cari_file_data(path):
+    """Versi Parquet/Feather dari path jika ada dan tidak lebih lama dari path; selain itu path itu sendiri."""
+    for format_data in ('parquet', 'feather'):
+        kandidat = ganti_format(path, format_data)
+        if kandidat != path and os.path.exists(kandidat) and \
+                (not os.path.exists(path) or os.path.getmtime(kandidat) >= os.path.getmtime(path)):
+            return kandidat
+    return path
+
+
+def baca_tabel_per_chunk(path, ukuran_chunk, kolom=None):
+    """Generator DataFrame per maks. ukuran_chunk baris dari CSV/Parquet/Feather, tanpa memuat seluruh file."""
+    format_data = format_dari_path(path)
+    if format_data == 'csv':
+        yield from pd.read_csv(path, usecols=kolom, chunksize=ukuran_chunk)
+        return
+    if format_data == 'parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=ukuran_chunk, columns=kolom):
+            yield batch.to_pandas()
+        return
+    import pyarrow.ipc
+    with pyarrow.ipc.open_file(path) as reader:  # Feather v2 = Arrow IPC; record batch ditulis per 64K baris
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if kolom is not None:
+                batch = batch.select(kolom)
+            for awal in range(0, batch.num_rows, ukuran_chunk):
+                yield batch.slice(awal, ukuran_chunk).to_pandas()
+
+
+class PenulisTabelBertahap:
+    """Menulis DataFrame per chunk ke satu file CSV/Parquet/Feather (append), memori sebatas satu chunk.
+
+    Skema Parquet/Feather diambil dari chunk pertama; chunk berikutnya di-cast ke skema tersebut.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.format_data = format_dari_path(path)
+        self.jumlah_baris = 0
+        self._writer = None
+        self._skema = None
+
+    def tulis(self, df):
+        if self.format_data == 'csv':
+            df.to_csv(self.path, mode='w' if self.jumlah_baris == 0 else 'a', header=(self.jumlah_baris == 0),
+                      index=False, encoding='utf-8')
+        else:
+            import pyarrow as pa
+            tabel = pa.Table.from_pandas(df, schema=self._skema, preserve_index=False)
+            if self._writer is None:
+                self._skema = tabel.schema
+                if self.format_data == 'parquet':
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.path, self._skema, compression=KOMPRESI_PARQUET)
+                else:
+                    self._writer = pa.ipc.new_file(self.path, self._skema)
+            self._writer.write_table(tabel)
+        self.jumlah_baris += len(df)
+
+    def tutup(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.tutup()
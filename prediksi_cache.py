@@ -0,0 +1,165 @@
+# prediksi_cache.py
+
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from inferensi import muat_komponen_model, bersihkan_owner, PLACEHOLDER_MEREK, PLACEHOLDER_LOKASI, PLACEHOLDER_OWNER
+
+# --- KONFIGURASI CACHE ---
+CACHE_MAX_ENTRI = 10000
+CACHE_TTL_SECONDS = 3600
+KILOMETER_GRANULARITAS = 1000  # Kilometer dibulatkan ke bawah per 1.000 km untuk kunci cache
+MODEL_PATH = os.path.join("model", "xgboost_mobil_model_v3.pkl")
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+
+_hash_artifact_cache = {}
+
+
+def hash_artifact(path):
+    """SHA-256 file artifact model; dihitung ulang hanya jika mtime/ukuran file berubah."""
+    if os.path.isdir(path):
+        # Artifact fast-start: manifest.json sudah memuat hash setiap file di dalamnya
+        path = os.path.join(path, 'manifest.json')
+    stat = os.stat(path)
+    tanda = (stat.st_mtime_ns, stat.st_size)
+    tersimpan = _hash_artifact_cache.get(path)
+    if tersimpan and tersimpan[0] == tanda:
+        return tersimpan[1]
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            sha.update(blok)
+    _hash_artifact_cache[path] = (tanda, sha.hexdigest())
+    return sha.hexdigest()
+
+
+def _teks_atau_none(val, placeholder=None):
+    if val is None or val == placeholder:
+        return None
+    teks = str(val).strip()
+    return teks or None
+
+
+class PrediksiCache:
+    """Cache LRU ber-TTL untuk hasil prediksi, dikunci dengan spesifikasi mobil yang dinormalisasi."""
+
+    def __init__(self, max_entri=CACHE_MAX_ENTRI, ttl_seconds=CACHE_TTL_SECONDS, km_granularitas=KILOMETER_GRANULARITAS):
+        self.max_entri = max_entri
+        self.ttl_seconds = ttl_seconds
+        self.km_granularitas = max(1, int(km_granularitas))
+        self.model_hash = None
+        self.lock = threading.Lock()
+        self.entri = OrderedDict()  # kunci -> (waktu_simpan, harga)
+        self.hit = 0
+        self.miss = 0
+        self.eviction = 0
+        self.expired = 0
+        self.invalidasi = 0
+
+    def buat_kunci(self, user_input_dict, encoder=None):
+        """Kunci cache dari input UI: (Tahun, bucket Kilometer, kategori).
+
+        Dengan encoder, kategori = posisi kolom/kode yang di-resolve FeatureEncoder, sehingga kunci sama jika
+        dan hanya jika model melihat kategori yang sama. Tanpa encoder: Merek, Model_Detail asli apa adanya
+        ('Ayla D' dan 'Ayla D+' bisa beda kolom), Lokasi, owner.
+        """
+        kilometer = int(user_input_dict.get('Kilometer_Input') or 0)
+        numerik = (int(user_input_dict.get('Tahun_Input') or 0), kilometer // self.km_granularitas)
+        if encoder is not None:
+            return numerik + (encoder.kunci_kategori(user_input_dict),)
+        owner = _teks_atau_none(user_input_dict.get('Owner_Input'), PLACEHOLDER_OWNER)
+        model_detail = user_input_dict.get('Model_Detail_Input')
+        return numerik + (
+            _teks_atau_none(user_input_dict.get('Merek_Input'), PLACEHOLDER_MEREK),
+            str(model_detail) if model_detail else None,
+            _teks_atau_none(user_input_dict.get('Lokasi_Input'), PLACEHOLDER_LOKASI),
+            bersihkan_owner(owner) if owner else None,
+        )
+
+    def sinkronkan_model(self, model_hash):
+        """Mengosongkan cache jika hash artifact model berubah sejak terakhir dicek."""
+        with self.lock:
+            if self.model_hash != model_hash:
+                if self.model_hash is not None:
+                    self.invalidasi += 1
+                self.entri.clear()
+                self.model_hash = model_hash
+
+    def get(self, kunci):
+        """Mengembalikan harga tersimpan atau None (miss / kedaluwarsa)."""
+        with self.lock:
+            tersimpan = self.entri.get(kunci)
+            if tersimpan is None:
+                self.miss += 1
+                return None
+            waktu_simpan, harga = tersimpan
+            if time.monotonic() - waktu_simpan > self.ttl_seconds:
+                del self.entri[kunci]
+                self.expired += 1
+                self.miss += 1
+                return None
+            self.entri.move_to_end(kunci)
+            self.hit += 1
+            return harga
+
+    def put(self, kunci, harga):
+        with self.lock:
+            self.entri[kunci] = (time.monotonic(), harga)
+            self.entri.move_to_end(kunci)
+            while len(self.entri) > self.max_entri:
+                self.entri.popitem(last=False)
+                self.eviction += 1
+
+    def statistik(self):
+        with self.lock:
+            total = self.hit + self.miss
+            return {
+                'entri': len(self.entri),
+                'max_entri': self.max_entri,
+                'hit': self.hit,
+                'miss': self.miss,
+                'hit_rate': self.hit / total if total else 0.0,
+                'eviction': self.eviction,
+                'expired': self.expired,
+                'invalidasi_model': self.invalidasi,
+            }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cek kunci cache: kunci sama hanya jika baris fitur model sama.")
+    parser.add_argument('--model-path', default=MODEL_PATH)
+    parser.add_argument('--data-path', default=DATA_PATH)
+    args = parser.parse_args()
+
+    _, _, _, encoder = muat_komponen_model(args.model_path)
+    cache = PrediksiCache()
+    mobil = pd.read_csv(args.data_path, usecols=['Merek', 'Model_Detail', 'Lokasi']).drop_duplicates()
+    contoh = [{'Tahun_Input': 2018, 'Kilometer_Input': 50000, 'Merek_Input': r.Merek, 'Model_Detail_Input': m,
+               'Lokasi_Input': r.Lokasi, 'Owner_Input': 'First'}
+              for r in mobil.itertuples() for m in (r.Model_Detail, r.Model_Detail.lower())]
+    contoh += [dict(contoh[0], Merek_Input='Daihatsu', Model_Detail_Input=m) for m in ('Ayla D', 'Ayla D+')]
+
+    # Kunci sama <-> baris fitur sama (dengan encoder); tanpa encoder kunci boleh lebih rinci, tidak boleh lebih kasar
+    baris_per_kunci, kunci_per_baris, beda = {}, {}, 0
+    for d in contoh:
+        baris = encoder.encode_row(d).tobytes()
+        beda += baris_per_kunci.setdefault(cache.buat_kunci(d, encoder), baris) != baris
+        beda += kunci_per_baris.setdefault(baris, cache.buat_kunci(d, encoder)) != cache.buat_kunci(d, encoder)
+        beda += baris_per_kunci.setdefault(('tanpa_encoder',) + cache.buat_kunci(d), baris) != baris
+    ayla_d, ayla_d_plus = contoh[-2:]
+    for enc in (encoder, None):
+        beda += cache.buat_kunci(ayla_d, enc) == cache.buat_kunci(ayla_d_plus, enc)
+    print(f"[{'INFO' if beda == 0 else 'ERROR'}] {len(contoh)} input, {beda} kunci cache tidak konsisten dengan encoder.")
+    if beda:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
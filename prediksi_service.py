@@ -0,0 +1,307 @@
+# prediksi_service.py
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from inferensi import (muat_komponen_model, predict_harga_batch, proyeksi_harga, ke_input_dict, ENGINE_XGBOOST, ENGINE_NUMPY,
+                       KM_PER_TAHUN_ASUMSI, KOLOM_INPUT, TAHUN_PROYEKSI)
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# --- KONFIGURASI SERVICE ---
+MODEL_PATH = os.path.join("model", "xgboost_mobil_model_v3.pkl")
+HOST = "127.0.0.1"
+PORT = 8000
+MAX_BATCH_SIZE = 64       # Maksimal request tunggal yang digabung dalam satu model.predict
+MAX_WAIT_MS = 5.0         # Jendela tunggu (ms) untuk mengumpulkan request sebelum batch diproses
+REQUEST_TIMEOUT_SECONDS = 30
+JUMLAH_SAMPEL_LATENSI = 10000
+MAX_TITIK_PROYEKSI = 1000  # Batas titik kurva per request /proyeksi
+
+
+# --- STATISTIK LATENSI ---
+
+class StatistikLatensi:
+    """Mencatat latensi per request (jendela geser) dan throughput sejak service berjalan."""
+
+    def __init__(self, maxlen=JUMLAH_SAMPEL_LATENSI):
+        self.lock = threading.Lock()
+        self.latensi_ms = deque(maxlen=maxlen)
+        self.waktu_mulai = time.perf_counter()
+        self.total_request = 0
+        self.total_baris = 0
+        self.total_batch_model = 0
+
+    def catat_request(self, latensi_ms, jumlah_baris):
+        with self.lock:
+            self.latensi_ms.append(latensi_ms)
+            self.total_request += 1
+            self.total_baris += jumlah_baris
+
+    def catat_batch_model(self):
+        with self.lock:
+            self.total_batch_model += 1
+
+    def snapshot(self):
+        with self.lock:
+            sampel = np.array(self.latensi_ms, dtype=np.float64)
+            durasi = time.perf_counter() - self.waktu_mulai
+            return {
+                'total_request': self.total_request,
+                'total_baris': self.total_baris,
+                'total_batch_model': self.total_batch_model,
+                'rata_baris_per_batch': (self.total_baris / self.total_batch_model) if self.total_batch_model else 0.0,
+                'p50_ms': float(np.percentile(sampel, 50)) if len(sampel) else None,
+                'p99_ms': float(np.percentile(sampel, 99)) if len(sampel) else None,
+                'throughput_request_per_detik': self.total_request / durasi if durasi > 0 else 0.0,
+                'throughput_baris_per_detik': self.total_baris / durasi if durasi > 0 else 0.0,
+                'uptime_detik': durasi,
+            }
+
+
+# --- VALIDASI INPUT ---
+
+KOLOM_NUMERIK_INPUT = {'Tahun_Input', 'Kilometer_Input'}
+
+
+def validasi_record(record):
+    """Pesan error jika record bukan objek mobil dengan nilai skalar bertipe benar, None jika valid."""
+    if not isinstance(record, dict):
+        return f"Setiap mobil harus berupa objek JSON, bukan {type(record).__name__}."
+    for kunci, nilai in ke_input_dict(record).items():
+        if kunci not in KOLOM_INPUT or nilai is None:
+            continue
+        if kunci in KOLOM_NUMERIK_INPUT:
+            if isinstance(nilai, bool) or not isinstance(nilai, (int, float)):
+                return f"Nilai '{kunci.replace('_Input', '')}' harus berupa angka."
+        elif not isinstance(nilai, str):
+            return f"Nilai '{kunci.replace('_Input', '')}' harus berupa teks."
+    return None
+
+
+def validasi_array_proyeksi(nilai, nama):
+    """(array float 0/1 dimensi, None) untuk tahun_ke_depan/kilometer /proyeksi, atau (None, pesan error)."""
+    try:
+        array = np.asarray(nilai, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None, f"'{nama}' harus berupa angka atau list angka."
+    if array.ndim > 1 or not np.isfinite(array).all():
+        return None, f"'{nama}' harus berupa angka atau list angka (1 dimensi)."
+    return array, None
+
+
+# --- MICRO-BATCHER ---
+
+class MicroBatcher:
+    """Mengumpulkan request /predict yang datang bersamaan menjadi satu panggilan model.predict."""
+
+    def __init__(self, model, encoder, statistik, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.model = model
+        self.encoder = encoder
+        self.statistik = statistik
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self.antrian = queue.Queue()
+        self.worker = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self.worker.start()
+
+    def submit(self, record):
+        """Memasukkan satu input ke antrian; hasil (harga Rp) didapat dari Future.result()."""
+        future = Future()
+        self.antrian.put((record, future))
+        return future
+
+    def _ambil_batch(self):
+        batch = [self.antrian.get()]
+        deadline = time.perf_counter() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            sisa_waktu = deadline - time.perf_counter()
+            if sisa_waktu <= 0:
+                break
+            try:
+                batch.append(self.antrian.get(timeout=sisa_waktu))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._ambil_batch()
+            try:
+                harga = predict_harga_batch(self.model, self.encoder, [record for record, _ in batch])
+                self.statistik.catat_batch_model()
+                for (_, future), harga_rp in zip(batch, harga):
+                    future.set_result(float(harga_rp))
+            except Exception as e:
+                logging.error(f"Gagal memproses batch berisi {len(batch)} request: {e}; diulang per request.")
+                # Skor satu per satu agar hanya request yang bermasalah yang menerima error
+                for record, future in batch:
+                    try:
+                        future.set_result(float(predict_harga_batch(self.model, self.encoder, [record])[0]))
+                    except Exception as e_record:
+                        future.set_exception(e_record)
+
+
+# --- HTTP HANDLER ---
+
+def buat_handler(model, encoder, batcher, statistik):
+    """Membuat kelas handler HTTP yang terikat ke model dan micro-batcher yang sudah dimuat."""
+
+    class PrediksiHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _kirim_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _baca_json(self):
+            panjang = int(self.headers.get('Content-Length', 0))
+            return json.loads(self.rfile.read(panjang) or b'null')
+
+        def do_GET(self):
+            if self.path == '/metrics':
+                self._kirim_json(200, statistik.snapshot())
+            elif self.path == '/health':
+                self._kirim_json(200, {'status': 'ok', 'jumlah_fitur': encoder.n_features})
+            else:
+                self._kirim_json(404, {'error': f"Path '{self.path}' tidak dikenal."})
+
+        def do_POST(self):
+            waktu_mulai = time.perf_counter()
+            try:
+                payload = self._baca_json()
+            except (ValueError, json.JSONDecodeError) as e:
+                self._kirim_json(400, {'error': f"Body bukan JSON yang valid: {e}"})
+                return
+
+            try:
+                if self.path == '/predict':
+                    if not isinstance(payload, dict):
+                        self._kirim_json(400, {'error': "Body /predict harus berupa objek JSON satu mobil."})
+                        return
+                    error = validasi_record(payload)
+                    if error:
+                        self._kirim_json(400, {'error': error})
+                        return
+                    harga_rp = batcher.submit(ke_input_dict(payload)).result(timeout=REQUEST_TIMEOUT_SECONDS)
+                    self._kirim_json(200, {'harga_prediksi': harga_rp})
+                    jumlah_baris = 1
+                elif self.path == '/predict_batch':
+                    records = payload.get('data') if isinstance(payload, dict) else payload
+                    if not isinstance(records, list):
+                        self._kirim_json(400, {'error': "Body /predict_batch harus berupa list mobil atau {'data': [...]}."})
+                        return
+                    for i, record in enumerate(records):
+                        error = validasi_record(record)
+                        if error:
+                            self._kirim_json(400, {'error': f"Mobil ke-{i}: {error}"})
+                            return
+                    # Satu request batch sudah vectorized, langsung ke model tanpa antrian micro-batcher
+                    harga = predict_harga_batch(model, encoder, [ke_input_dict(r) for r in records]) if records else []
+                    statistik.catat_batch_model()
+                    self._kirim_json(200, {'harga_prediksi': [float(h) for h in harga]})
+                    jumlah_baris = len(records)
+                elif self.path == '/proyeksi':
+                    if not isinstance(payload, dict):
+                        self._kirim_json(400, {'error': "Body /proyeksi harus berupa objek JSON satu mobil."})
+                        return
+                    payload = dict(payload)
+                    tahun_ke_depan = payload.pop('tahun_ke_depan', None)
+                    kilometer = payload.pop('kilometer', None)
+                    km_per_tahun = payload.pop('km_per_tahun', None)
+                    error = validasi_record(payload)
+                    if error is None and km_per_tahun is not None and (
+                            isinstance(km_per_tahun, bool) or not isinstance(km_per_tahun, (int, float))
+                            or not 0 <= km_per_tahun < float('inf')):
+                        error = "'km_per_tahun' harus berupa angka >= 0."
+                    if error:
+                        self._kirim_json(400, {'error': error})
+                        return
+                    if km_per_tahun is None:
+                        km_per_tahun = KM_PER_TAHUN_ASUMSI
+                    if tahun_ke_depan is None:  # Default sama dengan proyeksi_harga, agar cek ukuran di bawah berlaku
+                        tahun_ke_depan = TAHUN_PROYEKSI
+                    if isinstance(tahun_ke_depan, int) and not isinstance(tahun_ke_depan, bool):  # N -> 0..N tahun
+                        if not 0 <= tahun_ke_depan < MAX_TITIK_PROYEKSI:
+                            self._kirim_json(400, {'error': f"tahun_ke_depan harus 0..{MAX_TITIK_PROYEKSI - 1}."})
+                            return
+                        tahun_ke_depan = list(range(tahun_ke_depan + 1))
+                    tahun_ke_depan, error = validasi_array_proyeksi(tahun_ke_depan, 'tahun_ke_depan')
+                    if error is None and kilometer is not None:
+                        kilometer, error = validasi_array_proyeksi(kilometer, 'kilometer')
+                    if error:
+                        self._kirim_json(400, {'error': error})
+                        return
+                    try:
+                        jumlah_baris = int(np.broadcast(tahun_ke_depan, kilometer if kilometer is not None else 0).size)
+                    except ValueError as e:
+                        self._kirim_json(400, {'error': f"tahun_ke_depan dan kilometer tidak bisa di-broadcast: {e}"})
+                        return
+                    if jumlah_baris > MAX_TITIK_PROYEKSI:
+                        self._kirim_json(400, {'error': f"Maksimal {MAX_TITIK_PROYEKSI} titik per /proyeksi."})
+                        return
+                    kurva = proyeksi_harga(model, encoder, ke_input_dict(payload), tahun_ke_depan, kilometer, km_per_tahun)
+                    statistik.catat_batch_model()
+                    self._kirim_json(200, {'kurva': {kolom: nilai.tolist() for kolom, nilai in kurva.items()}})
+                    jumlah_baris = len(kurva)
+                else:
+                    self._kirim_json(404, {'error': f"Path '{self.path}' tidak dikenal."})
+                    return
+            except Exception as e:
+                logging.error(f"Error saat prediksi di {self.path}: {e}")
+                self._kirim_json(500, {'error': str(e)})
+                return
+
+            statistik.catat_request((time.perf_counter() - waktu_mulai) * 1000.0, jumlah_baris)
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return PrediksiHandler
+
+
+# --- FUNGSI UTAMA ---
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP/JSON service prediksi harga mobil dengan micro-batching.")
+    parser.add_argument('--model-path', default=MODEL_PATH)
+    parser.add_argument('--engine', choices=[ENGINE_XGBOOST, ENGINE_NUMPY], default=ENGINE_XGBOOST)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--max-batch-size', type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    model, scaler, trained_feature_columns, encoder = muat_komponen_model(args.model_path, args.engine)
+    logging.info(f"Model ({args.engine}) dan {len(trained_feature_columns)} kolom training dimuat dari {args.model_path}.")
+
+    statistik = StatistikLatensi()
+    batcher = MicroBatcher(model, encoder, statistik, args.max_batch_size, args.max_wait_ms)
+    server = ThreadingHTTPServer((args.host, args.port), buat_handler(model, encoder, batcher, statistik))
+    logging.info(f"Service prediksi berjalan di http://{args.host}:{args.port} "
+                 f"(max_batch_size={args.max_batch_size}, max_wait_ms={args.max_wait_ms}).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Service dihentikan.")
+    finally:
+        server.server_close()
+        logging.info(f"Statistik akhir: {statistik.snapshot()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+# retrain_model.py
+
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_percentage_error
+
+from artifact_model import ParameterScaler, simpan_artifact
+from penyimpanan_data import baca_tabel, tulis_tabel
+
+# --- KONFIGURASI WARM-START ---
+NAMA_FILE_MODEL = "xgboost_mobil_model_v3.pkl"
+NAMA_DIR_ARTIFACT = "xgboost_mobil_model_v3"
+NAMA_FILE_HOLDOUT = "holdout_beku.parquet"          # X_test (sebelum scaling) + target log, dari training penuh terakhir
+NAMA_FILE_HASH_TRAINING = "hash_baris_training.npy"  # Hash baris data yang sudah dilihat model (uint64 terurut)
+NAMA_FILE_REKONSILIASI = "rekonsiliasi_kolom.json"
+KOLOM_TARGET_HOLDOUT = "__Harga_log"
+KOLOM_KATEGORIKAL = ['Merek', 'Model_Detail', 'Lokasi']
+# Kolom hasil scrape yang mengidentifikasi listing; kolom turunan (Inflasi, fitur depresiasi) tidak ikut di-hash
+KOLOM_IDENTITAS_BARIS = ['Judul', 'Merek', 'Model_Detail', 'Tahun', 'Kilometer', 'Lokasi', 'Harga']
+POHON_TAMBAHAN = 50
+AMBANG_DEGRADASI_MAPE = 0.05   # MAPE holdout boleh naik maks 5% (relatif) sebelum fallback ke training penuh
+
+
+def hash_baris_data(df):
+    """Hash uint64 per baris dari KOLOM_IDENTITAS_BARIS, untuk mengenali baris baru.
+
+    Kolom turunan tidak ikut, sehingga tahun inflasi baru atau float yang bolak-balik lewat CSV tidak membuat
+    baris lama terlihat baru. Numerik sebagai float (5 dan 5.0 sama), teks/kategori sebagai str.
+    """
+    identitas = df[[kolom for kolom in KOLOM_IDENTITAS_BARIS if kolom in df.columns]]
+    tipe = {kolom: 'float64' if pd.api.types.is_numeric_dtype(identitas[kolom]) else str for kolom in identitas.columns}
+    return pd.util.hash_pandas_object(identitas.astype(tipe), index=False).to_numpy()
+
+
+def simpan_state_training(X_test, y_test, hash_data, output_dir):
+    """Dipanggil training penuh (mode dense): bekukan holdout dan simpan hash baris yang sudah dilihat model."""
+    holdout = X_test.reset_index(drop=True).copy()
+    holdout[KOLOM_TARGET_HOLDOUT] = np.asarray(y_test, dtype=np.float64)
+    tulis_tabel(holdout, os.path.join(output_dir, NAMA_FILE_HOLDOUT))
+    np.save(os.path.join(output_dir, NAMA_FILE_HASH_TRAINING), np.unique(hash_data))
+
+
+def hapus_state_training(output_dir):
+    """Mode sparse/kategorikal tidak mendukung warm-start: buang state lama agar tidak dipakai dengan model baru."""
+    for nama in (NAMA_FILE_HOLDOUT, NAMA_FILE_HASH_TRAINING):
+        path = os.path.join(output_dir, nama)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def rekonsiliasi_kolom(df, kolom_lama):
+    """One-hot (tanpa drop_first) baris df lalu disusun ke kolom_lama. Mengembalikan (X, laporan).
+
+    Kategori yang tidak punya kolom di model lama dipetakan eksplisit ke baseline (semua one-hot 0),
+    sama seperti nilai tak dikenal saat serving; kategori baseline drop_first model lama (juga tanpa kolom)
+    ikut tercantum di laporan dengan pemetaan yang sama.
+    laporan: kategori_tanpa_kolom_ke_baseline {kolom: {nilai: jumlah baris}} dan kolom_hilang (kolom numerik
+    model lama yang tidak ada di data; warm-start tidak bisa dilakukan).
+    """
+    kolom_kategori = [kolom for kolom in KOLOM_KATEGORIKAL if kolom in df.columns]
+    X = pd.get_dummies(df, columns=kolom_kategori, prefix=kolom_kategori)
+    kolom_lama_set = set(kolom_lama)
+    kategori_baru = {}
+    for kolom in kolom_kategori:
+        nilai = df[kolom].astype(str)
+        tanpa_kolom = ~(kolom + '_' + nilai).isin(kolom_lama_set)
+        if tanpa_kolom.any():
+            jumlah = nilai[tanpa_kolom].value_counts()
+            kategori_baru[kolom] = {k: int(v) for k, v in jumlah.items()}
+    prefix = tuple(kolom + '_' for kolom in kolom_kategori)
+    kolom_hilang = [kolom for kolom in kolom_lama if kolom not in X.columns and not kolom.startswith(prefix)]
+    laporan = {'kategori_tanpa_kolom_ke_baseline': kategori_baru, 'kolom_hilang': kolom_hilang}
+    return X.reindex(columns=kolom_lama, fill_value=0).astype(np.float64), laporan
+
+
+def _mape_holdout(model, X, y_log):
+    return mean_absolute_percentage_error(np.expm1(y_log), np.expm1(model.predict(X))) * 100
+
+
+def warm_start(df, output_dir, pohon_tambahan=POHON_TAMBAHAN, ambang_mape=AMBANG_DEGRADASI_MAPE):
+    """Menambah pohon ke model di output_dir dengan baris df yang belum pernah dilihat (continued training XGBoost).
+
+    df: data setelah filter outlier, Harga belum di-log. Scaler dan kolom model lama dipakai apa adanya.
+    Model baru disimpan hanya jika MAPE holdout beku tidak memburuk lebih dari ambang_mape (relatif).
+    Mengembalikan True jika model sudah mutakhir, False jika perlu training penuh.
+    """
+    path_model = os.path.join(output_dir, NAMA_FILE_MODEL)
+    path_holdout = os.path.join(output_dir, NAMA_FILE_HOLDOUT)
+    path_hash = os.path.join(output_dir, NAMA_FILE_HASH_TRAINING)
+    for path in (path_model, path_holdout, path_hash):
+        if not os.path.exists(path):
+            print(f"[WARNING] Warm-start butuh '{path}' dari training penuh (mode dense) sebelumnya.")
+            return False
+    komponen = joblib.load(path_model)
+    if len(komponen) > 3 or isinstance(komponen[1], ParameterScaler):
+        print("[WARNING] Warm-start hanya mendukung model mode dense (bukan --sparse/--categorical).")
+        return False
+    model_lama, scaler, kolom_lama = komponen
+    kolom_lama = list(kolom_lama)
+
+    hash_data = hash_baris_data(df)
+    hash_lama = np.load(path_hash)
+    baru = ~np.isin(hash_data, hash_lama)
+    print(f"[INFO] Warm-start: {int(baru.sum())} baris baru dari {len(df)} baris (model lama: {len(hash_lama)} baris).")
+    if not baru.any():
+        print("[INFO] Tidak ada baris baru; model tidak diubah.")
+        return True
+
+    df_baru = df[baru]
+    X_baru, laporan = rekonsiliasi_kolom(df_baru, kolom_lama)
+    if laporan['kolom_hilang']:
+        print(f"[WARNING] Kolom model lama tidak ada di data: {laporan['kolom_hilang']}")
+        return False
+    for kolom, nilai in laporan['kategori_tanpa_kolom_ke_baseline'].items():
+        print(f"[INFO] {kolom}: {len(nilai)} kategori tanpa kolom di model lama ({sum(nilai.values())} baris) -> baseline.")
+    y_baru = np.log1p(df_baru['Harga'].to_numpy(dtype=np.float64))
+
+    holdout = baca_tabel(path_holdout)
+    y_holdout = holdout.pop(KOLOM_TARGET_HOLDOUT).to_numpy()
+    X_holdout = scaler.transform(holdout[kolom_lama].astype(np.float64))
+    mape_lama = _mape_holdout(model_lama, X_holdout, y_holdout)
+
+    params = dict(model_lama.get_params(), n_estimators=pohon_tambahan)
+    model_baru = model_lama.__class__(**params)
+    waktu_mulai = time.perf_counter()
+    model_baru.fit(scaler.transform(X_baru), y_baru, xgb_model=model_lama.get_booster())
+    waktu_training = time.perf_counter() - waktu_mulai
+    mape_baru = _mape_holdout(model_baru, X_holdout, y_holdout)
+    print(f"[INFO] Warm-start +{pohon_tambahan} pohon ({waktu_training:.2f} detik). "
+          f"MAPE holdout beku: {mape_lama:.2f}% -> {mape_baru:.2f}%")
+    if mape_baru > mape_lama * (1 + ambang_mape):
+        print(f"[WARNING] MAPE holdout memburuk lebih dari {ambang_mape:.0%}; model warm-start tidak disimpan.")
+        return False
+
+    joblib.dump((model_baru, scaler, kolom_lama), path_model)
+    simpan_artifact(model_baru, scaler, kolom_lama, os.path.join(output_dir, NAMA_DIR_ARTIFACT))
+    np.save(path_hash, np.union1d(hash_lama, hash_data))
+    laporan.update(baris_baru=int(baru.sum()), pohon_tambahan=pohon_tambahan,
+                   mape_holdout_lama=round(mape_lama, 4), mape_holdout_baru=round(mape_baru, 4))
+    with open(os.path.join(output_dir, NAMA_FILE_REKONSILIASI), 'w', encoding='utf-8') as f:
+        json.dump(laporan, f, ensure_ascii=False, indent=2)
+    print(f"[INFO] Model warm-start ({model_baru.get_booster().num_boosted_rounds()} pohon) disimpan ke '{path_model}' "
+          f"dan artifact '{NAMA_DIR_ARTIFACT}'.")
+    return True
@@ -0,0 +1,129 @@
+# skor_batch.py
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import numpy as np
+
+from depresiasi import hitung_depresiasi
+from inferensi import CURRENT_YEAR, ENGINE_NUMPY, ENGINE_XGBOOST, muat_komponen_model
+from penyimpanan_data import PenulisTabelBertahap, baca_tabel_per_chunk
+from tabel_inflasi import INFLASI_XLSX_FILE, muat_tabel_inflasi
+
+# --- KONFIGURASI BATCH SCORING ---
+MODEL_PATH = os.path.join("model", "xgboost_mobil_model_v3")   # Artifact fast-start (atau file .pkl)
+UKURAN_CHUNK = 20000
+WORKERS = 1
+KOLOM_HARGA_BELI = "Harga_Beli"   # Opsional di input: harga beli baru dulu (Rp) untuk metrik depresiasi
+
+
+# --- 1. SKOR PER CHUNK ---
+_STATE_WORKER = {}
+
+
+def muat_state(model_path, engine=ENGINE_XGBOOST, inflasi_xlsx=INFLASI_XLSX_FILE):
+    """(model, encoder, tabel_inflasi) untuk skor_chunk. Tabel inflasi None jika file tidak ada."""
+    model, _, _, encoder = muat_komponen_model(model_path, engine)
+    tabel_inflasi = None
+    if inflasi_xlsx and os.path.exists(inflasi_xlsx):
+        tabel_inflasi = muat_tabel_inflasi(inflasi_xlsx)
+    else:
+        print(f"[WARNING] File inflasi '{inflasi_xlsx}' tidak ada; metrik depresiasi riil tidak dihitung.")
+    return model, encoder, tabel_inflasi
+
+
+def _inisialisasi_worker(model_path, engine, inflasi_xlsx):
+    _STATE_WORKER['state'] = muat_state(model_path, engine, inflasi_xlsx)
+
+
+def skor_chunk(df, state=None, kolom_harga_beli=KOLOM_HARGA_BELI):
+    """Menambahkan UsiaMobil, Harga_Prediksi, dan metrik depresiasi ke df (satu encode + satu predict per chunk).
+
+    Baris dengan Tahun kosong atau di masa depan tidak diprediksi (NaN).
+    """
+    model, encoder, tabel_inflasi = state or _STATE_WORKER['state']
+    df = df.reset_index(drop=True)
+    tahun = df['Tahun'].to_numpy(dtype=np.float64) if 'Tahun' in df.columns else np.full(len(df), np.nan)
+    usia = CURRENT_YEAR - tahun
+    valid = usia >= 0
+    harga_prediksi = np.full(len(df), np.nan)
+    if valid.any():
+        data_valid = df[valid]
+        matrix = encoder.scale_matrix(encoder.encode_batch(data_valid))
+        harga_prediksi[valid] = np.expm1(model.predict(matrix))
+    df['UsiaMobil'] = usia
+    df['Harga_Prediksi'] = harga_prediksi
+    if kolom_harga_beli in df.columns:
+        harga_beli = df[kolom_harga_beli].to_numpy(dtype=np.float64)
+        for kolom, nilai in hitung_depresiasi(harga_prediksi, harga_beli, tahun, tabel_inflasi).items():
+            df[kolom] = nilai
+    return df
+
+
+def _skor_chunk_worker(df, kolom_harga_beli):
+    return skor_chunk(df, kolom_harga_beli=kolom_harga_beli)
+
+
+# --- 2. PIPELINE STREAMING ---
+def skor_file(input_path, output_path, model_path=MODEL_PATH, ukuran_chunk=UKURAN_CHUNK, workers=WORKERS,
+              engine=ENGINE_XGBOOST, inflasi_xlsx=INFLASI_XLSX_FILE, kolom_harga_beli=KOLOM_HARGA_BELI):
+    """Membaca input per chunk, men-skor (inline atau di process pool), dan menulis hasil berurutan ke output.
+
+    Dengan workers > 1, maks. 2 * workers chunk sedang diproses sehingga memori tetap terbatas.
+    Mengembalikan (jumlah baris, durasi detik).
+    """
+    waktu_mulai = time.perf_counter()
+    chunks = baca_tabel_per_chunk(input_path, ukuran_chunk)
+    with PenulisTabelBertahap(output_path) as penulis:
+        if workers <= 1:
+            state = muat_state(model_path, engine, inflasi_xlsx)
+            for chunk in chunks:
+                penulis.tulis(skor_chunk(chunk, state, kolom_harga_beli))
+                print(f"[INFO] {penulis.jumlah_baris} baris di-skor.")
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            konteks = multiprocessing.get_context('fork') if 'fork' in multiprocessing.get_all_start_methods() else None
+            with ProcessPoolExecutor(max_workers=workers, mp_context=konteks, initializer=_inisialisasi_worker,
+                                     initargs=(model_path, engine, inflasi_xlsx)) as pool:
+                antrian = deque()
+                for chunk in chunks:
+                    antrian.append(pool.submit(_skor_chunk_worker, chunk, kolom_harga_beli))
+                    if len(antrian) >= 2 * workers:
+                        penulis.tulis(antrian.popleft().result())
+                        print(f"[INFO] {penulis.jumlah_baris} baris di-skor.")
+                while antrian:
+                    penulis.tulis(antrian.popleft().result())
+                    print(f"[INFO] {penulis.jumlah_baris} baris di-skor.")
+        jumlah_baris = penulis.jumlah_baris
+    return jumlah_baris, time.perf_counter() - waktu_mulai
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch scoring stok mobil (CSV/Parquet/Feather) dengan model harga.")
+    parser.add_argument('input', help="File dengan kolom Merek, Model_Detail, Tahun, Kilometer, Lokasi (+ owner, Harga_Beli opsional).")
+    parser.add_argument('output', help="File hasil (.csv/.parquet/.feather): kolom input + UsiaMobil, Harga_Prediksi, metrik depresiasi.")
+    parser.add_argument('--model-path', default=MODEL_PATH, help="Direktori artifact fast-start atau file .pkl.")
+    parser.add_argument('--chunk', type=int, default=UKURAN_CHUNK, help="Baris per chunk.")
+    parser.add_argument('--workers', type=int, default=WORKERS, help="Jumlah proses scoring (1 = tanpa process pool).")
+    parser.add_argument('--engine', choices=[ENGINE_XGBOOST, ENGINE_NUMPY], default=ENGINE_XGBOOST)
+    parser.add_argument('--inflasi', default=INFLASI_XLSX_FILE, help="Excel inflasi untuk metrik depresiasi riil.")
+    parser.add_argument('--kolom-harga-beli', default=KOLOM_HARGA_BELI,
+                        help="Kolom harga beli baru (Rp); jika ada, metrik depresiasi ikut dihitung.")
+    args = parser.parse_args()
+
+    try:
+        jumlah_baris, durasi = skor_file(args.input, args.output, args.model_path, args.chunk, args.workers,
+                                         args.engine, args.inflasi, args.kolom_harga_beli)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    print(f"[INFO] {jumlah_baris} baris di-skor dalam {durasi:.2f} detik ({jumlah_baris / max(durasi, 1e-9):,.0f} baris/detik). "
+          f"Hasil: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+# stub_server_scraper.py
+
+import argparse
+import html
+import logging
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# --- KONFIGURASI STUB ---
+HOST = "127.0.0.1"
+PORT = 8010
+DATA_PATH = os.path.join("data", "data_mobil_fitur_depresiasi_inflasi.csv")
+LISTING_PER_HALAMAN = 25
+POLA_FILE_HALAMAN = "halaman_{}.html"
+
+
+def render_halaman(df_halaman):
+    """HTML satu halaman hasil pencarian dengan markup listing--card seperti Mobil123."""
+    kartu = []
+    for _, r in df_halaman.iterrows():
+        judul = html.escape(f"{r['Merek']} {r['Model_Detail']}")
+        kartu.append(
+            f'<article class="listing listing--card" data-listing-id="{r.name}" data-display-title="{judul}" data-year="{int(r["Tahun"])}" '
+            f'data-mileage="{int(r["Kilometer"])}" data-make="{html.escape(str(r["Merek"]))}" '
+            f'data-model="{html.escape(str(r["Model_Detail"]))}">'
+            f'<h2 class="listing__title"><a href="#">{judul}</a></h2>'
+            f'<div class="listing__price">Rp {int(r["Harga"]):,}</div>'
+            f'<div class="listing__specs"><div class="item"><i class="icon icon--meter"></i>{int(r["Kilometer"])} km</div>'
+            f'<div class="item"><i class="icon icon--location"></i>{html.escape(str(r["Lokasi"]))}</div></div>'
+            f'</article>')
+    return f"<html><body><div class=\"listings\">{''.join(kartu)}</div></body></html>"
+
+
+def generate_halaman(data_path, output_dir, jumlah_halaman, listing_per_halaman=LISTING_PER_HALAMAN):
+    """Membuat halaman HTML sintetis dari dataset (disimpan sebagai halaman_<N>.html)."""
+    df = pd.read_csv(data_path, usecols=['Merek', 'Model_Detail', 'Harga', 'Tahun', 'Kilometer', 'Lokasi']).dropna()
+    os.makedirs(output_dir, exist_ok=True)
+    for nomor in range(1, jumlah_halaman + 1):
+        awal = ((nomor - 1) * listing_per_halaman) % len(df)
+        with open(os.path.join(output_dir, POLA_FILE_HALAMAN.format(nomor)), 'w', encoding='utf-8') as f:
+            f.write(render_halaman(df.iloc[awal:awal + listing_per_halaman]))
+
+
+def buat_handler(halaman_dir, delay_ms, rasio_429):
+    """Handler: GET /?page=N menyajikan halaman_<N>.html; halaman tidak ada -> halaman tanpa listing."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _kirim(self, status, body, header_tambahan=None):
+            body = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            for nama, nilai in (header_tambahan or {}).items():
+                self.send_header(nama, nilai)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            time.sleep(delay_ms / 1000.0)  # Simulasi latensi jaringan/server
+            if rasio_429 and random.random() < rasio_429:
+                self._kirim(429, "Too Many Requests", {'Retry-After': '0.2'})
+                return
+            nomor = int(parse_qs(urlparse(self.path).query).get('page', ['1'])[0])
+            path = os.path.join(halaman_dir, POLA_FILE_HALAMAN.format(nomor))
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    self._kirim(200, f.read())
+            else:
+                self._kirim(200, "<html><body><div class=\"listings\"></div></body></html>")
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return StubHandler
+
+
+def jalankan_stub_di_thread(halaman_dir, host=HOST, port=0, delay_ms=0.0, rasio_429=0.0):
+    """Menjalankan stub di thread latar. Mengembalikan (server, base_url); hentikan dengan server.shutdown()."""
+    server = ThreadingHTTPServer((host, port), buat_handler(halaman_dir, delay_ms, rasio_429))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub HTTP server offline untuk menguji mobil_scraper dari halaman tersimpan.")
+    parser.add_argument('--halaman-dir', default=os.path.join("data", "halaman_stub"))
+    parser.add_argument('--generate', type=int, default=0, metavar='N',
+                        help="Buat N halaman sintetis dari dataset ke --halaman-dir sebelum server berjalan.")
+    parser.add_argument('--data-path', default=DATA_PATH)
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--delay-ms', type=float, default=200.0, help="Latensi buatan per request.")
+    parser.add_argument('--rasio-429', type=float, default=0.0, help="Porsi request yang dijawab 429 (uji retry).")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_halaman(args.data_path, args.halaman_dir, args.generate)
+        logging.info(f"{args.generate} halaman sintetis dibuat di '{args.halaman_dir}'.")
+    server = ThreadingHTTPServer((args.host, args.port), buat_handler(args.halaman_dir, args.delay_ms, args.rasio_429))
+    logging.info(f"Stub server berjalan di http://{args.host}:{args.port}/ (delay {args.delay_ms} ms, rasio 429 {args.rasio_429}).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Stub server dihentikan.")
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# tabel_inflasi.py
+
+import hashlib
+import os
+
+import numpy as np
+
+# --- KONFIGURASI TABEL INFLASI ---
+INFLASI_XLSX_FILE = os.path.join("data", "inflasi indonesia.xlsx")
+SUFFIX_CACHE = ".cache.npz"      # Cache disimpan di samping file Excel: "inflasi indonesia.cache.npz"
+
+
+def _sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+class TabelInflasi:
+    """Inflasi tahunan (persen) sebagai array terindeks tahun: inflasi_persen[tahun - tahun_min].
+
+    Tahun tanpa data bernilai NaN. Lookup vektor O(1) per elemen, tanpa merge DataFrame.
+    """
+
+    def __init__(self, tahun_min, inflasi_persen):
+        self.tahun_min = int(tahun_min)
+        self.inflasi_persen = np.asarray(inflasi_persen, dtype=np.float64)
+        # kumulatif[i] = nilai uang awal tahun_min+i relatif terhadap awal tahun_min (tahun tanpa data dianggap 0%)
+        self.kumulatif = np.concatenate([[1.0], np.cumprod(1 + np.nan_to_num(self.inflasi_persen) / 100)])
+
+    @property
+    def tahun_max(self):
+        return self.tahun_min + len(self.inflasi_persen) - 1
+
+    @classmethod
+    def dari_dataframe(cls, df_inflasi):
+        """Dari tabel dengan kolom Tahun dan Inflasi (persen), mis. hasil pd.read_excel."""
+        tahun = df_inflasi['Tahun'].to_numpy(dtype=np.int64)
+        inflasi_persen = np.full(tahun.max() - tahun.min() + 1, np.nan)
+        inflasi_persen[tahun - tahun.min()] = df_inflasi['Inflasi'].to_numpy(dtype=np.float64)
+        return cls(tahun.min(), inflasi_persen)
+
+    def hash_isi(self):
+        """SHA-256 isi tabel (tahun_min + nilai inflasi); untuk kunci cache hasil yang bergantung pada tabel ini."""
+        h = hashlib.sha256(str(self.tahun_min).encode('ascii'))
+        h.update(self.inflasi_persen.tobytes())
+        return h.hexdigest()
+
+    def lookup(self, tahun):
+        """Inflasi (persen) untuk array tahun; NaN untuk tahun di luar tabel. Setara merge kiri pada Tahun."""
+        tahun = np.asarray(tahun, dtype=np.float64)
+        indeks = np.nan_to_num(tahun, nan=self.tahun_min - 1).astype(np.int64) - self.tahun_min
+        valid = (indeks >= 0) & (indeks < len(self.inflasi_persen)) & (tahun == np.floor(tahun))
+        hasil = np.full(indeks.shape, np.nan)
+        hasil[valid] = self.inflasi_persen[indeks[valid]]
+        return hasil
+
+    def faktor_kumulatif(self, tahun_awal, tahun_akhir):
+        """Faktor kenaikan harga dari awal tahun_awal ke awal tahun_akhir (perkalian 1 + inflasi tahun di antaranya).
+
+        Vektor; tahun di luar tabel tidak menambah inflasi. Rp X pada tahun_awal setara Rp X * faktor pada tahun_akhir.
+        """
+        batas = len(self.kumulatif) - 1
+        awal = np.clip(np.asarray(tahun_awal, dtype=np.int64) - self.tahun_min, 0, batas)
+        akhir = np.clip(np.asarray(tahun_akhir, dtype=np.int64) - self.tahun_min, 0, batas)
+        return self.kumulatif[akhir] / self.kumulatif[awal]
+
+
+def _simpan_cache(tabel, cache_path, sumber_mtime, sumber_sha256):
+    path_tmp = cache_path + ".tmp"
+    try:
+        with open(path_tmp, 'wb') as f:
+            np.savez(f, tahun_min=tabel.tahun_min, inflasi_persen=tabel.inflasi_persen,
+                     sumber_mtime=sumber_mtime, sumber_sha256=sumber_sha256)
+        os.replace(path_tmp, cache_path)
+    except OSError as e:  # mis. folder data read-only saat serving: tabel tetap dipakai, hanya tanpa cache
+        print(f"[WARNING] Gagal menyimpan cache tabel inflasi ke {cache_path}: {e}")
+
+
+def muat_tabel_inflasi(xlsx_path=INFLASI_XLSX_FILE, cache_path=None):
+    """TabelInflasi dari cache .npz; Excel hanya dibaca ulang jika mtime dan hash file sumber berubah.
+
+    Jika hanya mtime yang berubah (isi sama), cache dipakai dan mtime-nya diperbarui.
+    """
+    cache_path = cache_path or os.path.splitext(xlsx_path)[0] + SUFFIX_CACHE
+    mtime = os.path.getmtime(xlsx_path)
+    sha256 = None
+    if os.path.exists(cache_path):
+        with np.load(cache_path) as cache:
+            tabel = TabelInflasi(cache['tahun_min'], cache['inflasi_persen'])
+            if float(cache['sumber_mtime']) == mtime:
+                return tabel
+            sha256 = _sha256_file(xlsx_path)
+            if str(cache['sumber_sha256']) == sha256:
+                _simpan_cache(tabel, cache_path, mtime, sha256)
+                return tabel
+
+    import pandas as pd  # read_excel (openpyxl) hanya saat cache dibangun ulang
+    tabel = TabelInflasi.dari_dataframe(pd.read_excel(xlsx_path))
+    _simpan_cache(tabel, cache_path, mtime, sha256 or _sha256_file(xlsx_path))
+    print(f"[INFO] Cache tabel inflasi dibangun: {cache_path} (tahun {tabel.tahun_min}-{tabel.tahun_max})")
+    return tabel
@@ -0,0 +1,156 @@
+# tree_numpy.py
+
+import json
+import os
+
+import numpy as np
+
+# --- KONFIGURASI ---
+UKURAN_CHUNK_BARIS = 8192   # Baris per chunk saat traversal agar matriks indeks node tetap kecil
+OBJEKTIF_IDENTITAS = ('reg:squarederror', 'reg:squaredlogerror', 'reg:absoluteerror', 'reg:pseudohubererror', 'reg:quantileerror')
+
+NAMA_FILE_TABEL_NODE = {
+    'fitur': "tree_fitur.npy",
+    'threshold': "tree_threshold.npy",
+    'kiri': "tree_kiri.npy",
+    'kanan': "tree_kanan.npy",
+    'default_kiri': "tree_default_kiri.npy",
+    'nilai': "tree_nilai.npy",
+    'akar': "tree_akar.npy",
+}
+NAMA_FILE_META_TREE = "tree_meta.json"
+
+
+class NumpyTreeEnsemble:
+    """Evaluator ensemble tree XGBoost berbasis tabel node datar (tanpa xgboost saat scoring).
+
+    Semua tree digabung ke array global; node daun menunjuk ke dirinya sendiri sehingga
+    traversal cukup diulang sebanyak kedalaman maksimum untuk semua baris & tree sekaligus.
+    """
+
+    def __init__(self, fitur, threshold, kiri, kanan, default_kiri, nilai, akar, base_score, kedalaman_maks):
+        self.fitur = fitur
+        self.threshold = threshold
+        self.kiri = kiri
+        self.kanan = kanan
+        self.default_kiri = default_kiri
+        self.nilai = nilai
+        self.akar = akar
+        self.base_score = np.float32(base_score)
+        self.kedalaman_maks = int(kedalaman_maks)
+        # Salinan indeks bertipe intp agar np.take tidak perlu konversi di setiap panggilan
+        self._fitur_idx = np.asarray(fitur, dtype=np.intp)
+        self._kiri_idx = np.asarray(kiri, dtype=np.intp)
+        self._kanan_idx = np.asarray(kanan, dtype=np.intp)
+        self._akar_idx = np.asarray(akar, dtype=np.intp)
+
+    @classmethod
+    def dari_booster(cls, model):
+        """Membangun tabel node dari XGBRegressor / xgboost.Booster (lewat dump JSON model)."""
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        learner = json.loads(booster.save_raw('json'))['learner']
+        objektif = learner['objective']['name']
+        if objektif not in OBJEKTIF_IDENTITAS:
+            raise ValueError(f"Objektif '{objektif}' tidak didukung evaluator numpy (hanya regresi dengan link identitas).")
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError(f"Booster '{learner['gradient_booster']['name']}' tidak didukung (hanya gbtree).")
+        base_score = float(learner['learner_model_param']['base_score'].strip('[]'))
+
+        fitur, threshold, kiri, kanan, default_kiri, nilai, akar = [], [], [], [], [], [], []
+        kedalaman_maks = 0
+        offset = 0
+        for tree in learner['gradient_booster']['model']['trees']:
+            if any(tipe != 0 for tipe in tree.get('split_type', [])):
+                raise ValueError("Split kategorikal belum didukung evaluator numpy.")
+            anak_kiri = np.asarray(tree['left_children'], dtype=np.int64)
+            anak_kanan = np.asarray(tree['right_children'], dtype=np.int64)
+            n_node = len(anak_kiri)
+            indeks = np.arange(n_node, dtype=np.int64)
+            daun = anak_kiri == -1
+
+            fitur.append(np.where(daun, 0, np.asarray(tree['split_indices'], dtype=np.int64)))
+            # Pada dump JSON, split_conditions di node daun berisi nilai daun (sudah dikali learning rate)
+            kondisi = np.asarray(tree['split_conditions'], dtype=np.float32)
+            threshold.append(np.where(daun, np.float32(0), kondisi))
+            nilai.append(np.where(daun, kondisi, np.float32(0)))
+            kiri.append(np.where(daun, indeks, anak_kiri) + offset)
+            kanan.append(np.where(daun, indeks, anak_kanan) + offset)
+            default_kiri.append(np.asarray(tree['default_left'], dtype=bool))
+            akar.append(offset)
+
+            # Kedalaman tree (DFS dari akar) menentukan jumlah iterasi traversal
+            tumpukan = [(0, 0)]
+            while tumpukan:
+                node, kedalaman = tumpukan.pop()
+                kedalaman_maks = max(kedalaman_maks, kedalaman)
+                if not daun[node]:
+                    tumpukan.append((anak_kiri[node], kedalaman + 1))
+                    tumpukan.append((anak_kanan[node], kedalaman + 1))
+            offset += n_node
+
+        return cls(
+            np.concatenate(fitur).astype(np.int32), np.concatenate(threshold).astype(np.float32),
+            np.concatenate(kiri).astype(np.int32), np.concatenate(kanan).astype(np.int32),
+            np.concatenate(default_kiri), np.concatenate(nilai).astype(np.float32),
+            np.asarray(akar, dtype=np.int32), base_score, kedalaman_maks,
+        )
+
+    def simpan(self, direktori):
+        """Menyimpan tabel node sebagai .npy (bisa di-memory-map) + metadata JSON. Mengembalikan daftar file."""
+        os.makedirs(direktori, exist_ok=True)
+        for atribut, nama_file in NAMA_FILE_TABEL_NODE.items():
+            np.save(os.path.join(direktori, nama_file), getattr(self, atribut))
+        with open(os.path.join(direktori, NAMA_FILE_META_TREE), 'w', encoding='utf-8') as f:
+            json.dump({'base_score': float(self.base_score), 'kedalaman_maks': self.kedalaman_maks,
+                       'jumlah_tree': len(self.akar), 'jumlah_node': len(self.fitur)}, f, indent=2)
+        return list(NAMA_FILE_TABEL_NODE.values()) + [NAMA_FILE_META_TREE]
+
+    @classmethod
+    def muat(cls, direktori):
+        """Memuat tabel node dari direktori (memory-mapped)."""
+        with open(os.path.join(direktori, NAMA_FILE_META_TREE), encoding='utf-8') as f:
+            meta = json.load(f)
+        tabel = {atribut: np.load(os.path.join(direktori, nama_file), mmap_mode='r')
+                 for atribut, nama_file in NAMA_FILE_TABEL_NODE.items()}
+        return cls(base_score=meta['base_score'], kedalaman_maks=meta['kedalaman_maks'], **tabel)
+
+    @staticmethod
+    def tersedia_di(direktori):
+        return os.path.exists(os.path.join(direktori, NAMA_FILE_META_TREE))
+
+    def _predict_chunk(self, X):
+        n_baris, n_fitur = X.shape
+        n_tree = len(self._akar_idx)
+        # Indeks datar (baris x tree): node aktif dan offset baris di X.ravel()
+        x_datar = X.ravel()
+        offset_baris = np.repeat(np.arange(n_baris, dtype=np.intp) * n_fitur, n_tree)
+        node = np.tile(self._akar_idx, n_baris)
+        ada_nan = np.isnan(x_datar).any()
+        for _ in range(self.kedalaman_maks):
+            nilai_fitur = x_datar.take(offset_baris + self._fitur_idx.take(node))
+            ke_kiri = nilai_fitur < self.threshold.take(node)
+            if ada_nan:
+                ke_kiri = np.where(np.isnan(nilai_fitur), self.default_kiri.take(node), ke_kiri)
+            node = np.where(ke_kiri, self._kiri_idx.take(node), self._kanan_idx.take(node))
+        # Akumulasi float32 berurutan (base_score lalu tree 1..T) seperti predictor CPU XGBoost
+        nilai_daun = self.nilai.take(node).reshape(n_baris, n_tree)
+        nilai_daun = np.concatenate([np.full((n_baris, 1), self.base_score, dtype=np.float32), nilai_daun], axis=1)
+        return np.cumsum(nilai_daun, axis=1, dtype=np.float32)[:, -1]
+
+    def predict(self, X):
+        """Prediksi (skala log, sama seperti XGBRegressor.predict) untuk matriks fitur yang sudah di-scale."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[0] <= UKURAN_CHUNK_BARIS:
+            return self._predict_chunk(X)
+        return np.concatenate([self._predict_chunk(X[i:i + UKURAN_CHUNK_BARIS])
+                               for i in range(0, X.shape[0], UKURAN_CHUNK_BARIS)])
+
+
+def periksa_kesesuaian(numpy_model, xgb_model, X, atol=1e-4):
+    """Membandingkan prediksi evaluator numpy dengan XGBoost. Mengembalikan (cocok, selisih_maks)."""
+    pred_numpy = numpy_model.predict(X)
+    pred_xgb = xgb_model.predict(X)
+    selisih_maks = float(np.max(np.abs(pred_numpy.astype(np.float64) - pred_xgb.astype(np.float64)))) if len(pred_numpy) else 0.0
+    return selisih_maks <= atol, selisih_maks
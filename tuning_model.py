@@ -0,0 +1,125 @@
+# tuning_model.py
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error
+from sklearn.model_selection import KFold, ParameterGrid, ParameterSampler, train_test_split
+
+# --- KONFIGURASI PENCARIAN ---
+RUANG_PARAMETER_DEFAULT = {
+    'max_depth': [4, 6, 8],
+    'learning_rate': [0.05, 0.1, 0.2],
+    'min_child_weight': [1, 5],
+    'subsample': [0.8, 1.0],
+    'colsample_bytree': [0.8, 1.0],
+}
+K_FOLD = 5
+N_ESTIMATORS_MAKS = 1000        # Batas atas; jumlah tree sebenarnya ditentukan early stopping
+EARLY_STOPPING_ROUNDS = 30
+PORSI_EARLY_STOPPING = 0.1      # Porsi data train tiap fold yang disisihkan untuk early stopping
+NAMA_FILE_LEADERBOARD = "leaderboard_tuning.csv"
+NAMA_FILE_PARAMETER_TERBAIK = "hyperparameter_terbaik.json"
+
+# Data training per proses worker (diisi sekali oleh initializer, tidak dikirim ulang per trial)
+_DATA_WORKER = {}
+
+
+def buat_kandidat(ruang_parameter=None, mode='grid', n_iter=20, seed=42):
+    """Daftar kombinasi parameter: semua kombinasi (grid) atau n_iter sampel acak (random)."""
+    ruang_parameter = ruang_parameter or RUANG_PARAMETER_DEFAULT
+    if mode == 'random':
+        return list(ParameterSampler(ruang_parameter, n_iter=n_iter, random_state=seed))
+    return list(ParameterGrid(ruang_parameter))
+
+
+def _init_worker(X, y, params_tetap, k_fold, seed):
+    _DATA_WORKER.update(X=X, y=y, params_tetap=params_tetap, k_fold=k_fold, seed=seed)
+
+
+def _evaluasi_trial(id_trial, params, n_thread):
+    """K-fold CV satu kombinasi parameter. MAE/MAPE dihitung dalam Rupiah (setelah expm1)."""
+    from xgboost import XGBRegressor
+    X, y = _DATA_WORKER['X'], _DATA_WORKER['y']
+    waktu_mulai = time.perf_counter()
+    mae_fold, mape_fold, iterasi_fold = [], [], []
+    for idx_train, idx_val in KFold(_DATA_WORKER['k_fold'], shuffle=True, random_state=_DATA_WORKER['seed']).split(X):
+        idx_fit, idx_es = train_test_split(idx_train, test_size=PORSI_EARLY_STOPPING, random_state=_DATA_WORKER['seed'])
+        model = XGBRegressor(n_estimators=N_ESTIMATORS_MAKS, early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                             random_state=_DATA_WORKER['seed'], n_jobs=n_thread, **_DATA_WORKER['params_tetap'], **params)
+        model.fit(X[idx_fit], y[idx_fit], eval_set=[(X[idx_es], y[idx_es])], verbose=False)
+        y_val_rp = np.expm1(y[idx_val])
+        y_pred_rp = np.expm1(model.predict(X[idx_val], iteration_range=(0, model.best_iteration + 1)))
+        mae_fold.append(mean_absolute_error(y_val_rp, y_pred_rp))
+        mape_fold.append(mean_absolute_percentage_error(y_val_rp, y_pred_rp) * 100)
+        iterasi_fold.append(model.best_iteration + 1)
+    return {
+        'trial': id_trial,
+        **params,
+        'mae_rp_mean': float(np.mean(mae_fold)),
+        'mae_rp_std': float(np.std(mae_fold)),
+        'mape_mean': float(np.mean(mape_fold)),
+        'mape_std': float(np.std(mape_fold)),
+        'n_estimators': int(np.median(iterasi_fold)),
+        'waktu_detik': time.perf_counter() - waktu_mulai,
+    }
+
+
+def cari_hyperparameter(X, y, kandidat, params_tetap=None, k_fold=K_FOLD, n_jobs=None, thread_per_trial=None, seed=42):
+    """Menjalankan semua kandidat di process pool. Mengembalikan leaderboard (DataFrame, terurut MAPE naik).
+
+    n_jobs: jumlah proses paralel (default semua core). thread_per_trial: nthread XGBoost per trial
+    (default core // n_jobs) sehingga n_jobs * thread_per_trial tidak melebihi jumlah core.
+    """
+    jumlah_core = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs or jumlah_core, len(kandidat)))
+    thread_per_trial = thread_per_trial or max(1, jumlah_core // n_jobs)
+    print(f"[INFO] Tuning: {len(kandidat)} kandidat x {k_fold} fold, {n_jobs} proses x {thread_per_trial} thread.")
+
+    y = np.asarray(y, dtype=np.float64)
+    initargs = (X, y, params_tetap or {}, k_fold, seed)
+    if 'fork' in multiprocessing.get_all_start_methods():
+        executor = ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context('fork'),
+                                       initializer=_init_worker, initargs=initargs)
+    else:
+        # Tanpa fork (Windows), proses spawn akan menjalankan ulang skrip pemanggil (modelling.py).
+        # XGBoost melepas GIL saat training, jadi thread pool tetap berjalan paralel.
+        _init_worker(*initargs)
+        executor = ThreadPoolExecutor(max_workers=n_jobs)
+    hasil = []
+    with executor:
+        futures = [executor.submit(_evaluasi_trial, i, params, thread_per_trial) for i, params in enumerate(kandidat)]
+        for future in as_completed(futures):
+            trial = future.result()
+            hasil.append(trial)
+            print(f"[INFO] Trial {trial['trial']:>3} selesai ({len(hasil)}/{len(kandidat)}): "
+                  f"MAPE {trial['mape_mean']:.2f}% | MAE Rp {trial['mae_rp_mean']:,.0f} | {trial['waktu_detik']:.1f} detik")
+    return pd.DataFrame(hasil).sort_values(['mape_mean', 'mae_rp_mean']).reset_index(drop=True)
+
+
+def parameter_terbaik(leaderboard):
+    """Parameter XGBRegressor dari baris teratas leaderboard (termasuk n_estimators hasil early stopping)."""
+    kolom_metrik = {'trial', 'mae_rp_mean', 'mae_rp_std', 'mape_mean', 'mape_std', 'waktu_detik'}
+    baris = leaderboard.head(1).to_dict('records')[0]  # per kolom, agar int tidak ikut menjadi float
+    return {kolom: nilai for kolom, nilai in baris.items() if kolom not in kolom_metrik}
+
+
+def simpan_hasil_tuning(leaderboard, output_dir):
+    """Menulis leaderboard CSV dan parameter terbaik (JSON) ke output_dir. Mengembalikan parameter terbaik."""
+    os.makedirs(output_dir, exist_ok=True)
+    leaderboard.to_csv(os.path.join(output_dir, NAMA_FILE_LEADERBOARD), index=False)
+    terbaik = parameter_terbaik(leaderboard)
+    with open(os.path.join(output_dir, NAMA_FILE_PARAMETER_TERBAIK), 'w', encoding='utf-8') as f:
+        json.dump({'parameter': terbaik, 'mape_cv': float(leaderboard.iloc[0]['mape_mean']),
+                   'mae_rp_cv': float(leaderboard.iloc[0]['mae_rp_mean'])}, f, indent=2)
+    return terbaik
+
+
+def muat_parameter_terbaik(output_dir):
+    with open(os.path.join(output_dir, NAMA_FILE_PARAMETER_TERBAIK), encoding='utf-8') as f:
+        return json.load(f)['parameter']